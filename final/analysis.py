@@ -0,0 +1,150 @@
+"""Analyse the structure of a logic network.
+
+Used in the Logic Simulator project to report the shape of a netlist before
+it is simulated, and to work out how many passes over the devices the
+network needs to settle.
+
+Classes
+-------
+NetlistAnalysis - counts the devices, depth, fanout and loops of a network.
+
+Functions
+---------
+get_gate_depths - returns the combinational depth of every logic gate.
+"""
+import collections
+
+from netlist_graph import find_strongly_connected, find_loops
+
+
+def get_load_ids(devices, network, device_id):
+    """Return the IDs of the devices driven by the outputs of a device."""
+    load_ids = []
+    for output_id in devices.get_device(device_id).outputs:
+        for load_id, input_id in network.fanout.get((device_id, output_id),
+                                                    []):
+            load_ids.append(load_id)
+    return load_ids
+
+
+def get_gate_depths(devices, network):
+    """Return {device_id: depth} for every logic gate in the network.
+
+    Switches, clocks and D-types start combinational paths at depth 0, and
+    a gate is one deeper than the deepest device driving it. The gates of a
+    combinational loop all get the depth of the deepest device driving the
+    loop plus the length of the loop. The gates are visited once, in
+    topological order of their strongly connected components.
+    """
+    gate_ids = [device.device_id for device in devices.devices_list
+                if device.device_kind in devices.gate_types]
+
+    def successors(device_id):
+        return get_load_ids(devices, network, device_id)
+
+    depths = {}
+    # Components come after the components they drive, so visit them in
+    # reverse to see every driver before its loads
+    for component in reversed(find_strongly_connected(gate_ids,
+                                                      successors)):
+        members = set(component)
+        base = 0
+        for device_id in component:
+            for connected_output in \
+                    devices.get_device(device_id).inputs.values():
+                if connected_output is None:
+                    continue
+                driver_id = connected_output[0]
+                if driver_id in depths and driver_id not in members:
+                    base = max(base, depths[driver_id])
+        for device_id in component:
+            depths[device_id] = base + len(component)
+    return depths
+
+
+class NetlistAnalysis:
+    """Count the devices, depth, fanout and loops of a network.
+
+    The analysis visits every device, port and connection a fixed number of
+    times, so it takes time linear in the size of the netlist.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+
+    Public methods
+    --------------
+    get_report(self): Returns the analysis as a list of lines of text.
+    """
+
+    def __init__(self, devices, network):
+        """Analyse the network."""
+        self.devices = devices
+        self.network = network
+        names = devices.names
+
+        # device_counts dictionary stores {device kind name: count}
+        self.device_counts = collections.OrderedDict()
+        for device_kind in devices.gate_types + devices.device_types:
+            self.device_counts[names.get_name_string(device_kind)] = 0
+        for device in devices.devices_list:
+            kind_name = names.get_name_string(device.device_kind)
+            self.device_counts[kind_name] += 1
+        self.sequential_count = len(devices.find_devices(devices.D_TYPE))
+
+        self.gate_depths = get_gate_depths(devices, network)
+        self.logic_depth = max(self.gate_depths.values(), default=0)
+
+        # fanout_histogram dictionary stores {number of loads: number of
+        # outputs with that many loads}
+        self.fanout_histogram = collections.Counter()
+        # unconnected_inputs list stores signal names
+        self.unconnected_inputs = []
+        for device in devices.devices_list:
+            for output_id in device.outputs:
+                self.fanout_histogram[len(network.fanout.get(
+                    (device.device_id, output_id), []))] += 1
+            for input_id, connected_output in device.inputs.items():
+                if connected_output is None:
+                    self.unconnected_inputs.append(
+                        devices.get_signal_name(device.device_id, input_id))
+
+        # Loops through any device, and loops through logic gates only,
+        # which are not broken by a D-type
+        device_ids = devices.find_devices()
+        gate_ids = set(self.gate_depths)
+
+        def successors(device_id):
+            return get_load_ids(devices, network, device_id)
+
+        def gate_successors(device_id):
+            return [load_id for load_id in successors(device_id)
+                    if load_id in gate_ids]
+
+        self.feedback_loops = find_loops(device_ids, successors)
+        self.combinational_loops = find_loops(
+            [device_id for device_id in device_ids if device_id in gate_ids],
+            gate_successors)
+
+    def get_report(self):
+        """Return the analysis as a list of lines of text."""
+        lines = ["Devices: " + str(len(self.devices.devices_list))]
+        for kind_name, count in self.device_counts.items():
+            if count:
+                lines.append("".join(["  ", kind_name, ": ", str(count)]))
+        lines.append("Sequential elements: " + str(self.sequential_count))
+        lines.append("Maximum combinational depth: "
+                     + str(self.logic_depth))
+        lines.append("Fanout histogram (loads: outputs):")
+        for loads in sorted(self.fanout_histogram):
+            lines.append("".join(["  ", str(loads), ": ",
+                                  str(self.fanout_histogram[loads])]))
+        lines.append("Feedback loops: " + str(len(self.feedback_loops)))
+        lines.append("Combinational loops: "
+                     + str(len(self.combinational_loops)))
+        lines.append("Unconnected inputs: "
+                     + str(len(self.unconnected_inputs)))
+        for signal_name in self.unconnected_inputs:
+            lines.append("  " + signal_name)
+        return lines
@@ -0,0 +1,55 @@
+"""Time cycles of a wide datapath, gate by gate and on bitplanes.
+
+Run from the final directory with:
+    python benchmarks/bench_bitsliced_engine.py [width] [stages] [cycles]
+
+The datapath has stages rows of width gates, see circuits.build_datapath,
+so every row is one level of gates of the same kind. The first row reads
+64 switches, one of which is toggled before every cycle. The network is
+run on its own and by the bit-sliced engine, with constant folding off so
+that every gate is executed in every pass, and the signals are compared.
+"""
+import sys
+import time
+
+from circuits import build_datapath
+from bitsliced_engine import BitslicedEngine
+
+
+def run_cycles(bitsliced, width, stages, cycles):
+    """Return (run time, signals after each cycle)."""
+    [names, devices, network, monitors] = build_datapath(width, stages)
+    network.fold_constants = False
+    execute_network = network.execute_network
+    if bitsliced:
+        execute_network = BitslicedEngine(network).execute_network
+    execute_network()
+    trace = []
+    start = time.perf_counter()
+    for cycle in range(cycles):
+        switch_id = devices.devices_list[cycle % 64].device_id
+        devices.set_switch(switch_id, 1 - devices.get_device(
+            switch_id).switch_state)
+        execute_network()
+        trace.append(bytes(devices.net_table.signals))
+    return (time.perf_counter() - start, trace)
+
+
+def main():
+    """Print the run times."""
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    stages = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    cycles = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    [elapsed, reference] = run_cycles(False, width, stages, cycles)
+    print("".join([str(cycles), " cycles of ", str(width * stages),
+                   " gates, gate by gate: ", "{:.3f}".format(elapsed),
+                   " s"]))
+    [elapsed, trace] = run_cycles(True, width, stages, cycles)
+    print("".join([str(cycles), " cycles of ", str(width * stages),
+                   " gates, bit-sliced: ", "{:.3f}".format(elapsed),
+                   " s, signals ", "match" if trace == reference
+                   else "differ"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Time cycles of a circuit of decoders, with and without block caches.
+
+Run from the final directory with:
+    python benchmarks/bench_block_memo.py [blocks] [cycles]
+
+Each block is a tree of 127 two-input gates whose leaves read four clocks
+of half periods 1, 2, 4 and 8, so the inputs of every block repeat every
+16 cycles. The network is executed directly, with constant folding off so
+that every gate left in the plan is executed in every cycle.
+"""
+import random
+import sys
+import time
+
+from circuits import Names, Devices, Network, Monitors
+
+
+def build_blocks(blocks, seed=0):
+    """Return (devices, network, monitors) for a circuit of gate trees."""
+    generator = random.Random(seed)
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    clock_ids = names.lookup(["clk1", "clk2", "clk4", "clk8"])
+    for half_period, clock_id in zip([1, 2, 4, 8], clock_ids):
+        devices.make_device(clock_id, devices.CLOCK, half_period)
+    [I1, I2] = names.lookup(["I1", "I2"])
+    gate_kinds = [devices.AND, devices.OR, devices.NAND, devices.NOR,
+                  devices.XOR]
+    number = 0
+    for block in range(blocks):
+        level = [generator.choice(clock_ids) for leaf in range(128)]
+        while len(level) > 1:
+            next_level = []
+            for first, second in zip(level[::2], level[1::2]):
+                [gate_id] = names.lookup(["".join(["g", str(number)])])
+                number += 1
+                device_kind = generator.choice(gate_kinds)
+                if device_kind == devices.XOR:
+                    devices.make_device(gate_id, device_kind)
+                else:
+                    devices.make_device(gate_id, device_kind, 2)
+                network.make_connection(first, None, gate_id, I1)
+                network.make_connection(second, None, gate_id, I2)
+                next_level.append(gate_id)
+            level = next_level
+    return (devices, network, monitors)
+
+
+def main():
+    """Print the run times."""
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    for memo_size in [None, 64]:
+        [devices, network, monitors] = build_blocks(blocks)
+        network.fold_constants = False
+        if memo_size is not None:
+            monitors.memoise_blocks(memo_size)
+        plan = network.get_execution_plan()
+        start = time.perf_counter()
+        for cycle in range(cycles):
+            network.execute_network()
+        elapsed = time.perf_counter() - start
+        [hits, misses] = network.get_memo_counts()
+        print("".join([str(cycles), " cycles, ",
+                       str(len(plan.gate_devices)), " gates and ",
+                       str(len(plan.memo_blocks)), " blocks: ",
+                       "{:.3f}".format(elapsed), " s (", str(hits),
+                       " hits, ", str(misses), " misses)"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Time many slow clocks with the clock calendar and with a walk per cycle.
+
+Run from the final directory with:
+    python benchmarks/bench_clock_calendar.py [clocks] [cycles]
+
+Clocks with half periods from 100 to 1000 cycles are monitored for a number
+of cycles. The simulator only visits the clocks that change, and skips the
+cycles in which none do. The previous update_clocks, which walked every
+clock in every cycle, is timed on its own for comparison.
+"""
+import random
+import sys
+import time
+
+from circuits import Names, Devices, Network, Monitors
+from simulator import Simulator
+
+
+def build_clocks(clocks, seed=0):
+    """Return (devices, network, monitors) for a network of clocks."""
+    generator = random.Random(seed)
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    for number in range(clocks):
+        [clock_id] = names.lookup(["".join(["clk", str(number)])])
+        devices.make_clock(clock_id, generator.randint(100, 1000))
+        if number < 10:
+            monitors.make_monitor(clock_id, None)
+    return (devices, network, monitors)
+
+
+def legacy_update_clocks(devices, clocks, counters):
+    """Walk every clock as update_clocks did before the calendar."""
+    signals = devices.net_table.signals
+    for position, (device, net_id) in enumerate(clocks):
+        if counters[position] == device.clock_half_period:
+            counters[position] = 0
+            if signals[net_id] == devices.HIGH:
+                signals[net_id] = devices.FALLING
+            elif signals[net_id] == devices.LOW:
+                signals[net_id] = devices.RISING
+        counters[position] += 1
+
+
+def main():
+    """Print the run times."""
+    clocks = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    [devices, network, monitors] = build_clocks(clocks)
+    plan_clocks = network.get_execution_plan().clock_devices
+    counters = [device.clock_counter for device, net_id in plan_clocks]
+    start = time.perf_counter()
+    for cycle in range(cycles):
+        legacy_update_clocks(devices, plan_clocks, counters)
+    elapsed = time.perf_counter() - start
+    print("".join([str(clocks), " clocks, ", str(cycles),
+                   " cycles, clock walk only: ",
+                   "{:.3f}".format(elapsed), " s"]))
+
+    [devices, network, monitors] = build_clocks(clocks)
+    start = time.perf_counter()
+    Simulator(network, monitors).run(cycles)
+    elapsed = time.perf_counter() - start
+    print("".join([str(clocks), " clocks, ", str(cycles),
+                   " cycles, full simulation with calendar: ",
+                   "{:.3f}".format(elapsed), " s"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Time cycles of a large circuit with and without cone pruning.
+
+Run from the final directory with:
+    python benchmarks/bench_cone_pruning.py [gates] [cycles]
+
+Only a few gates near the inputs of a random circuit are monitored, so most
+of the circuit drives nothing that is monitored. The network is executed
+directly, as the simulator would skip the cycles of a settled circuit.
+"""
+import sys
+import time
+
+from circuits import build_random_circuit
+
+
+def main():
+    """Print the run times."""
+    gates = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    for prune in [False, True]:
+        [names, devices, network, monitors] = build_random_circuit(
+            gates=gates)
+        for number in range(0, 50, 10):
+            [gate_id] = names.lookup(["".join(["g", str(number)])])
+            monitors.make_monitor(gate_id, None)
+        if prune:
+            monitors.prune_network()
+        executed = len(network.get_execution_plan().gate_devices)
+        start = time.perf_counter()
+        for cycle in range(cycles):
+            network.execute_network()
+        elapsed = time.perf_counter() - start
+        label = "with" if prune else "without"
+        print("".join([str(cycles), " cycles ", label, " pruning, ",
+                       str(executed), " of ", str(gates),
+                       " gates executed: ", "{:.3f}".format(elapsed),
+                       " s"]))
+
+
+if __name__ == "__main__":
+    main()
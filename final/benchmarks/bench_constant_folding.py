@@ -0,0 +1,53 @@
+"""Time a clocked circuit with and without folding the switch constants.
+
+Run from the final directory with:
+    python benchmarks/bench_constant_folding.py [gates] [cycles]
+
+A clock that changes every cycle drives a D-type sampling the last gate of
+a random circuit, so no cycle can be skipped. Every gate only depends on
+the switches, so with folding the gates are left out of the cycles once
+the network has settled.
+"""
+import sys
+import time
+
+from circuits import build_random_circuit
+from simulator import Simulator
+
+
+def build_clocked_circuit(gates):
+    """Return (network, monitors) for a random circuit and a clock."""
+    [names, devices, network, monitors] = build_random_circuit(gates=gates)
+    [SW0, CLK, DTYPE, LAST] = names.lookup(
+        ["sw0", "clk", "dtype", "".join(["g", str(gates - 1)])])
+    devices.set_switch(SW0, devices.LOW)
+    devices.make_device(CLK, devices.CLOCK, 1)
+    devices.make_device(DTYPE, devices.D_TYPE)
+    network.make_connection(CLK, None, DTYPE, devices.CLK_ID)
+    network.make_connection(LAST, None, DTYPE, devices.DATA_ID)
+    network.make_connection(SW0, None, DTYPE, devices.SET_ID)
+    network.make_connection(SW0, None, DTYPE, devices.CLEAR_ID)
+    monitors.make_monitor(DTYPE, devices.Q_ID)
+    return (network, monitors)
+
+
+def main():
+    """Print the run times."""
+    gates = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    for fold_constants in [False, True]:
+        [network, monitors] = build_clocked_circuit(gates)
+        network.fold_constants = fold_constants
+        start = time.perf_counter()
+        Simulator(network, monitors).run(cycles)
+        elapsed = time.perf_counter() - start
+        label = "with" if fold_constants else "without"
+        print("".join([str(cycles), " cycles of ", str(gates), " gates ",
+                       label, " constant folding: ",
+                       "{:.3f}".format(elapsed), " s, ",
+                       str(len(network.get_gate_schedule())),
+                       " gates left"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Measure the memory used per device with tracemalloc.
+
+Run from the final directory with:
+    python benchmarks/bench_device_memory.py [devices]
+
+Builds the same number of 2-input gates with the current Devices class and
+with a copy of the original Device class, which kept its ports in
+dictionaries on a plain object, and reports the bytes allocated per device.
+"""
+import sys
+import tracemalloc
+
+import circuits  # noqa: F401, sets up the import path
+from names import Names
+from devices import Devices
+
+
+class DictDevice:
+    """Store device properties as the original Device class did."""
+
+    def __init__(self, device_id):
+        """Initialise device properties."""
+        self.device_id = device_id
+        self.inputs = {}
+        self.outputs = {}
+        self.device_kind = None
+        self.clock_half_period = None
+        self.clock_counter = None
+        self.switch_state = None
+        self.dtype_memory = None
+
+
+def measure(build, count):
+    """Return the bytes allocated per device by build(count)."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build(count)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del kept
+    return size / count
+
+
+def build_dict_devices(count):
+    """Build count 2-input gates as dictionary devices."""
+    names = Names()
+    [AND, I1, I2] = names.lookup(["AND", "I1", "I2"])
+    device_ids = names.lookup(["".join(["g", str(number)])
+                               for number in range(count)])
+    devices_list = []
+    devices_dictionary = {}
+    for device_id in device_ids:
+        device = DictDevice(device_id)
+        device.device_kind = AND
+        device.outputs[None] = 0
+        device.inputs[I1] = None
+        device.inputs[I2] = None
+        devices_list.append(device)
+        devices_dictionary[device_id] = device
+    return (names, devices_list, devices_dictionary)
+
+
+def build_slotted_devices(count):
+    """Build count 2-input gates with the Devices class."""
+    names = Names()
+    devices = Devices(names)
+    device_ids = names.lookup(["".join(["g", str(number)])
+                               for number in range(count)])
+    for device_id in device_ids:
+        devices.make_gate(device_id, devices.AND, 2)
+    return (names, devices)
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    dict_bytes = measure(build_dict_devices, count)
+    slotted_bytes = measure(build_slotted_devices, count)
+    print("{0} devices: dictionary devices {1:.0f} bytes each, slotted "
+          "devices {2:.0f} bytes each ({3:.2f}x smaller)".format(
+              count, dict_bytes, slotted_bytes, dict_bytes / slotted_bytes))
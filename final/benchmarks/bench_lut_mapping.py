@@ -0,0 +1,77 @@
+"""Time cycles of a circuit of small cones, with and without lookup tables.
+
+Run from the final directory with:
+    python benchmarks/bench_lut_mapping.py [cones] [cycles]
+
+Each cone is a tree of seven two-input gates reading eight switches,
+and only the root of each tree is read from outside. The network is
+executed directly, with constant folding off so that every gate left in
+the plan is executed in every cycle.
+"""
+import random
+import sys
+import time
+
+from circuits import Names, Devices, Network, Monitors
+
+
+def build_cones(cones, switches=32, seed=0):
+    """Return (devices, network, monitors) for a circuit of gate trees."""
+    generator = random.Random(seed)
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    switch_ids = names.lookup(["".join(["sw", str(number)])
+                               for number in range(switches)])
+    for switch_id in switch_ids:
+        devices.make_device(switch_id, devices.SWITCH,
+                            generator.choice([devices.LOW, devices.HIGH]))
+    [I1, I2] = names.lookup(["I1", "I2"])
+    gate_kinds = [devices.AND, devices.OR, devices.NAND, devices.NOR,
+                  devices.XOR]
+    number = 0
+    for cone in range(cones):
+        level = generator.sample(switch_ids, 8)
+        while len(level) > 1:
+            next_level = []
+            for first, second in zip(level[::2], level[1::2]):
+                [gate_id] = names.lookup(["".join(["g", str(number)])])
+                number += 1
+                device_kind = generator.choice(gate_kinds)
+                if device_kind == devices.XOR:
+                    devices.make_device(gate_id, device_kind)
+                else:
+                    devices.make_device(gate_id, device_kind, 2)
+                network.make_connection(first, None, gate_id, I1)
+                network.make_connection(second, None, gate_id, I2)
+                next_level.append(gate_id)
+            level = next_level
+    return (devices, network, monitors)
+
+
+def main():
+    """Print the run times."""
+    cones = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    for max_inputs in [None, 8]:
+        [devices, network, monitors] = build_cones(cones)
+        network.fold_constants = False
+        start = time.perf_counter()
+        if max_inputs is not None:
+            monitors.map_lookup_tables(max_inputs)
+        plan = network.get_execution_plan()
+        prepared = time.perf_counter() - start
+        start = time.perf_counter()
+        for cycle in range(cycles):
+            network.execute_network()
+        elapsed = time.perf_counter() - start
+        print("".join([str(cycles), " cycles, ",
+                       str(len(plan.gate_devices)), " gates and ",
+                       str(len(plan.lookup_tables)), " lookup tables: ",
+                       "{:.3f}".format(elapsed), " s (plan ",
+                       "{:.3f}".format(prepared), " s)"]))
+
+
+if __name__ == "__main__":
+    main()
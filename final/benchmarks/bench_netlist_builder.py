@@ -0,0 +1,80 @@
+"""Time building a generated netlist in bulk and one device at a time.
+
+Run from the final directory with:
+    python benchmarks/bench_netlist_builder.py [gates]
+
+A random netlist of 2-input gates driven by switches and earlier gates is
+built with NetlistBuilder.build, and again with make_device and
+make_connection calls.
+"""
+import random
+import sys
+import time
+
+import circuits  # noqa: F401, sets the import path
+from names import Names
+from devices import Devices
+from network import Network
+from netlist_builder import NetlistBuilder
+
+
+def make_specs(gates, switches=64, seed=0):
+    """Return (device_specs, connection_specs) for a random netlist."""
+    generator = random.Random(seed)
+    device_specs = []
+    connection_specs = []
+    sources = []
+    for number in range(switches):
+        name = "".join(["sw", str(number)])
+        device_specs.append((name, "SWITCH", generator.randint(0, 1)))
+        sources.append(name)
+    kinds = ["AND", "OR", "NAND", "NOR"]
+    for number in range(gates):
+        name = "".join(["g", str(number)])
+        device_specs.append((name, generator.choice(kinds), 2))
+        for port in ["I1", "I2"]:
+            connection_specs.append((generator.choice(sources), None,
+                                     name, port))
+        sources.append(name)
+    return (device_specs, connection_specs)
+
+
+def build_bulk(device_specs, connection_specs):
+    """Build the netlist with NetlistBuilder."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    builder = NetlistBuilder(names, devices, network)
+    assert builder.build(device_specs, connection_specs)
+
+
+def build_one_at_a_time(device_specs, connection_specs):
+    """Build the netlist with make_device and make_connection."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    for name, kind, device_property in device_specs:
+        [device_id, device_kind] = names.lookup([name, kind])
+        devices.make_device(device_id, device_kind, device_property)
+    for first_name, first_port, second_name, second_port \
+            in connection_specs:
+        [first_id, second_id, second_port_id] = names.lookup(
+            [first_name, second_name, second_port])
+        network.make_connection(first_id, None, second_id, second_port_id)
+
+
+def main():
+    """Print the build times."""
+    gates = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    [device_specs, connection_specs] = make_specs(gates)
+    for label, build in [("bulk", build_bulk),
+                         ("one at a time", build_one_at_a_time)]:
+        start = time.perf_counter()
+        build(device_specs, connection_specs)
+        elapsed = time.perf_counter() - start
+        print("".join([str(gates), " gates, ", label, ": ",
+                       "{:.2f}".format(elapsed), " s"]))
+
+
+if __name__ == "__main__":
+    main()
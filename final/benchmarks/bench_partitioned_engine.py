@@ -0,0 +1,76 @@
+"""Time cycles of a large circuit executed by one or several processes.
+
+Run from the final directory with:
+    python benchmarks/bench_partitioned_engine.py [gates] [cycles] [processes]
+
+The circuit is a random acyclic circuit of gates, and a switch is toggled
+before every cycle so that the gates have work to do. The network is run
+by the partitioned engine with 1, 2, 4 and so on processes, up to the
+given number, with constant folding off so that every gate is executed in
+every pass. The signals are checked against the network executed on its
+own, and the number of nets copied to and from the worker processes in
+each pass is printed with the number of nets read across partitions.
+"""
+import sys
+import time
+
+from circuits import build_random_circuit
+from partitioned_engine import PartitionedEngine
+
+
+def run_cycles(processes, gates, cycles):
+    """Return (run time, boundary nets, exchanged nets, signals per cycle)."""
+    [names, devices, network, monitors] = build_random_circuit(
+        gates=gates, max_inputs=3)
+    network.fold_constants = False
+    switch_ids = [device.device_id for device in devices.devices_list
+                  if device.device_kind == devices.SWITCH]
+    engine = None
+    execute_network = network.execute_network
+    boundary_nets = 0
+    exchanged_nets = 0
+    if processes is not None:
+        engine = PartitionedEngine(network, processes)
+        execute_network = engine.execute_network
+        execute_network()
+        boundary_nets = engine.boundary_nets
+        exchanged_nets = len(engine.exchange_nets)
+    trace = []
+    start = time.perf_counter()
+    for cycle in range(cycles):
+        switch_id = switch_ids[cycle % len(switch_ids)]
+        devices.set_switch(switch_id, 1 - devices.get_device(
+            switch_id).switch_state)
+        execute_network()
+        trace.append(bytes(devices.net_table.signals))
+    elapsed = time.perf_counter() - start
+    if engine is not None:
+        engine.close()
+    return (elapsed, boundary_nets, exchanged_nets, trace)
+
+
+def main():
+    """Print the run times."""
+    gates = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    most_processes = int(sys.argv[3]) if len(sys.argv) > 3 else 8
+    [elapsed, boundary_nets, exchanged_nets, reference] = run_cycles(
+        None, gates, cycles)
+    print("".join([str(cycles), " cycles of ", str(gates),
+                   " gates, network alone: ", "{:.3f}".format(elapsed),
+                   " s"]))
+    processes = 1
+    while processes <= most_processes:
+        [elapsed, boundary_nets, exchanged_nets, trace] = run_cycles(
+            processes, gates, cycles)
+        print("".join([str(processes), " processes: ",
+                       "{:.3f}".format(elapsed), " s, ",
+                       str(boundary_nets), " boundary nets, ",
+                       str(exchanged_nets), " nets exchanged per pass, ",
+                       "signals ",
+                       "match" if trace == reference else "differ"]))
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
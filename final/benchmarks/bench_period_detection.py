@@ -0,0 +1,55 @@
+"""Time a long run of a periodic circuit with and without period detection.
+
+Run from the final directory with:
+    python benchmarks/bench_period_detection.py [cycles]
+
+Three clocks with half periods of 3, 5 and 7 cycles drive a random circuit
+of gates through D-types, so the circuit repeats itself every few hundred
+cycles.
+"""
+import sys
+import time
+
+from circuits import build_random_circuit
+from simulator import Simulator
+
+
+def build_periodic_circuit():
+    """Return (network, monitors) for a circuit driven by three clocks."""
+    [names, devices, network, monitors] = build_random_circuit(gates=500)
+    [SW0] = names.lookup(["sw0"])
+    devices.set_switch(SW0, devices.LOW)
+    for number, half_period in enumerate([3, 5, 7]):
+        [clock_id, dtype_id, gate_id] = names.lookup(
+            ["".join(["clk", str(number)]), "".join(["dtype", str(number)]),
+             "".join(["g", str(499 - number)])])
+        devices.make_device(clock_id, devices.CLOCK, half_period)
+        devices.make_device(dtype_id, devices.D_TYPE)
+        network.make_connection(clock_id, None, dtype_id, devices.CLK_ID)
+        network.make_connection(gate_id, None, dtype_id, devices.DATA_ID)
+        network.make_connection(SW0, None, dtype_id, devices.SET_ID)
+        network.make_connection(SW0, None, dtype_id, devices.CLEAR_ID)
+        monitors.make_monitor(dtype_id, devices.Q_ID)
+        monitors.make_monitor(clock_id, None)
+    return (network, monitors)
+
+
+def main():
+    """Print the run times."""
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 7
+    for detect_period, run_cycles in [(False, min(cycles, 10000)),
+                                      (True, cycles)]:
+        [network, monitors] = build_periodic_circuit()
+        simulator = Simulator(network, monitors,
+                              detect_period=detect_period)
+        start = time.perf_counter()
+        simulator.run(run_cycles)
+        elapsed = time.perf_counter() - start
+        label = "with" if detect_period else "without"
+        print("".join([str(run_cycles), " cycles ", label,
+                       " period detection: ", "{:.3f}".format(elapsed),
+                       " s, period ", str(simulator.period)]))
+
+
+if __name__ == "__main__":
+    main()
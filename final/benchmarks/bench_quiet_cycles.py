@@ -0,0 +1,61 @@
+"""Time a slow-clocked circuit with and without skipping quiet cycles.
+
+Run from the final directory with:
+    python benchmarks/bench_quiet_cycles.py [cycles]
+
+A random circuit of gates is driven by a clock with a half period of 1000
+cycles through a D-type. It is run by executing every cycle, and again with
+Simulator.run, which skips the cycles between clock edges.
+"""
+import sys
+import time
+
+from circuits import build_random_circuit
+from simulator import Simulator
+
+
+def build_clocked_circuit():
+    """Return (devices, network, monitors) for a slow-clocked circuit."""
+    [names, devices, network, monitors] = build_random_circuit(gates=2000)
+    [CLK, DTYPE, GATE] = names.lookup(["clk", "dtype", "g1999"])
+    devices.make_device(CLK, devices.CLOCK, 1000)
+    devices.make_device(DTYPE, devices.D_TYPE)
+    network.make_connection(CLK, None, DTYPE, devices.CLK_ID)
+    network.make_connection(DTYPE, devices.QBAR_ID, DTYPE, devices.DATA_ID)
+    [SW0, SW1] = names.lookup(["sw0", "sw1"])
+    devices.set_switch(SW0, devices.LOW)
+    network.make_connection(SW0, None, DTYPE, devices.SET_ID)
+    network.make_connection(SW0, None, DTYPE, devices.CLEAR_ID)
+    monitors.make_monitor(CLK, None)
+    monitors.make_monitor(DTYPE, devices.Q_ID)
+    monitors.make_monitor(GATE, None)
+    return (devices, network, monitors)
+
+
+def run_every_cycle(network, monitors, cycles):
+    """Execute and record every cycle."""
+    for cycle in range(cycles):
+        network.execute_network()
+        monitors.record_signals()
+
+
+def run_skipping_quiet_cycles(network, monitors, cycles):
+    """Run with Simulator.run."""
+    Simulator(network, monitors).run(cycles)
+
+
+def main():
+    """Print the run times."""
+    cycles = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    for label, run in [("every cycle", run_every_cycle),
+                       ("skipping quiet cycles", run_skipping_quiet_cycles)]:
+        [devices, network, monitors] = build_clocked_circuit()
+        start = time.perf_counter()
+        run(network, monitors, cycles)
+        elapsed = time.perf_counter() - start
+        print("".join([str(cycles), " cycles, ", label, ": ",
+                       "{:.3f}".format(elapsed), " s"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Compare table-driven signal updates with the previous if/elif code.
+
+Run from the final directory with:
+    python benchmarks/bench_signal_tables.py
+
+The first benchmark evaluates gates on random inputs. The second runs a
+random circuit for a number of cycles with the tables and again with the
+previous update_signal and invert_signal methods patched in.
+"""
+import random
+import timeit
+
+from circuits import build_random_circuit
+from signal_tables import LOW, HIGH, RISING, FALLING, UPDATE, GATE_FOLDS
+
+
+def legacy_update_signal(network, signal, target):
+    """Update the signal as the network did before the tables."""
+    devices = network.devices
+    if signal in [devices.LOW, devices.FALLING]:
+        if target == devices.LOW:
+            new_signal = devices.LOW
+        else:
+            new_signal = devices.RISING
+    elif signal in [devices.HIGH, devices.RISING]:
+        if target == devices.LOW:
+            new_signal = devices.FALLING
+        else:
+            new_signal = devices.HIGH
+    else:
+        return None
+    if signal != new_signal:
+        network.steady_state = False
+    return new_signal
+
+
+def legacy_invert_signal(network, signal):
+    """Invert the signal as the network did before the tables."""
+    if signal == HIGH:
+        return LOW
+    elif signal == LOW:
+        return HIGH
+    return None
+
+
+def legacy_gate(input_signals, x, y):
+    """Evaluate an AND-like gate with the previous list tests."""
+    for input_signal in input_signals:
+        if input_signal != x:
+            output_signal = legacy_invert_signal(None, y)
+            break
+        output_signal = y
+    return output_signal
+
+
+def table_gate(input_signals, x, y):
+    """Evaluate an AND-like gate by folding through its table."""
+    (output_signal, table, final_signal) = GATE_FOLDS[(x, y)]
+    for input_signal in input_signals:
+        output_signal = table[output_signal][input_signal]
+        if output_signal == final_signal:
+            break
+    return output_signal
+
+
+def bench_gates(samples=100000):
+    """Time gate evaluation and signal updates on random inputs."""
+    generator = random.Random(0)
+    cases = [([generator.choice([LOW, HIGH, RISING, FALLING])
+               for _ in range(generator.randint(1, 4))],
+              generator.choice([LOW, HIGH]))
+             for _ in range(samples)]
+
+    def run_legacy():
+        for inputs, signal in cases:
+            target = legacy_gate(inputs, HIGH, HIGH)
+            if signal in [LOW, FALLING]:
+                signal = LOW if target == LOW else RISING
+            else:
+                signal = FALLING if target == LOW else HIGH
+
+    def run_tables():
+        for inputs, signal in cases:
+            target = table_gate(inputs, HIGH, HIGH)
+            signal = UPDATE[signal][target]
+
+    legacy = min(timeit.repeat(run_legacy, number=1, repeat=5))
+    tables = min(timeit.repeat(run_tables, number=1, repeat=5))
+    print("Gate evaluation, {0} gates: if/elif {1:.3f}s, tables {2:.3f}s "
+          "({3:.2f}x)".format(samples, legacy, tables, legacy / tables))
+
+
+def bench_network(cycles=200):
+    """Time a random circuit with the tables and with the previous code."""
+    (names, devices, network, monitors) = build_random_circuit()
+    network_class = type(network)
+
+    def run():
+        for _ in range(cycles):
+            network.execute_network()
+
+    tables = min(timeit.repeat(run, number=1, repeat=3))
+    saved = (network_class.update_signal, network_class.invert_signal)
+    network_class.update_signal = legacy_update_signal
+    network_class.invert_signal = legacy_invert_signal
+    try:
+        legacy = min(timeit.repeat(run, number=1, repeat=3))
+    finally:
+        (network_class.update_signal, network_class.invert_signal) = saved
+    text = "Network, {0} devices x {1} cycles: if/elif {2:.3f}s, tables " \
+        "{3:.3f}s ({4:.2f}x)"
+    print(text.format(len(devices.devices_list), cycles, legacy, tables,
+                      legacy / tables))
+
+
+if __name__ == "__main__":
+    bench_gates()
+    bench_network()
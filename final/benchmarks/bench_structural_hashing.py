@@ -0,0 +1,63 @@
+"""Time cycles of a circuit with duplicate gates, merged and unmerged.
+
+Run from the final directory with:
+    python benchmarks/bench_structural_hashing.py [gates] [cycles]
+
+Every gate of a random circuit is copied, with its inputs in a different
+order, so half the gates duplicate the other half. The network is executed
+directly, with constant folding off so that every gate left in the plan is
+executed in every cycle.
+"""
+import random
+import sys
+import time
+
+from circuits import build_random_circuit
+
+
+def build_duplicated_circuit(gates, seed=0):
+    """Return (names, devices, network) with a copy of every gate."""
+    generator = random.Random(seed)
+    [names, devices, network, monitors] = build_random_circuit(gates=gates)
+    for number in range(gates):
+        [gate_id, copy_id] = names.lookup(["".join(["g", str(number)]),
+                                           "".join(["copy", str(number)])])
+        gate = devices.get_device(gate_id)
+        inputs = list(gate.inputs.values())
+        generator.shuffle(inputs)
+        if gate.device_kind in [devices.XOR, devices.NOT]:
+            devices.make_device(copy_id, gate.device_kind)
+        else:
+            devices.make_device(copy_id, gate.device_kind, len(inputs))
+        for input_id, (output_device_id, output_id) in zip(
+                devices.get_device(copy_id).inputs, inputs):
+            network.make_connection(output_device_id, output_id, copy_id,
+                                    input_id)
+    return (names, devices, network)
+
+
+def main():
+    """Print the run times."""
+    gates = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    cycles = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    for merge in [False, True]:
+        [names, devices, network] = build_duplicated_circuit(gates)
+        network.fold_constants = False
+        merged = 0
+        start = time.perf_counter()
+        if merge:
+            merged = network.merge_duplicate_gates()
+        network.get_execution_plan()
+        prepared = time.perf_counter() - start
+        start = time.perf_counter()
+        for cycle in range(cycles):
+            network.execute_network()
+        elapsed = time.perf_counter() - start
+        print("".join([str(cycles), " cycles of ", str(2 * gates),
+                       " gates, ", str(merged), " merged: ",
+                       "{:.3f}".format(elapsed), " s (plan ",
+                       "{:.3f}".format(prepared), " s)"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Time a sweep over every combination of a few switches.
+
+Run from the final directory with:
+    python benchmarks/bench_sweep.py [switches] [gates] [cycles] [processes]
+
+The circuit is a random acyclic circuit of gates with its last 8 gates
+monitored. Every combination of the first switches is run, first by
+building the circuit again for each configuration, as relaunching the
+simulator for each one does, then by one sweep with the circuit built
+once, in one process and in the given number of processes. The final
+levels of the monitors are checked against those of the rebuilt circuits.
+"""
+import sys
+import time
+
+from circuits import build_random_circuit
+from sweep import ParameterSweep
+
+
+def make_sweep(gates, cycles, processes):
+    """Return a ParameterSweep of a random circuit with 8 monitors."""
+    [names, devices, network, monitors] = build_random_circuit(gates=gates)
+    for gate_id in devices.find_devices()[-8:]:
+        monitors.make_monitor(gate_id, None)
+    return ParameterSweep(names, devices, network, monitors, cycles,
+                          processes)
+
+
+def main():
+    """Print the run times."""
+    switches = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    gates = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    cycles = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+    processes = int(sys.argv[4]) if len(sys.argv) > 4 else 4
+    switch_names = ["".join(["sw", str(number)])
+                    for number in range(switches)]
+
+    start = time.perf_counter()
+    sweep = make_sweep(gates, cycles, 1)
+    configurations = sweep.get_combinations(sweep.get_switch_ids(
+        switch_names))
+    reference = []
+    for position, configuration in enumerate(configurations):
+        sweep = make_sweep(gates, cycles, 1)
+        reference.append(sweep.run_configuration(
+            position, configuration).statistics)
+    elapsed = time.perf_counter() - start
+    print("".join([str(len(configurations)), " configurations of ",
+                   str(gates), " gates, rebuilt each time: ",
+                   "{:.3f}".format(elapsed), " s"]))
+
+    for sweep_processes in [1, processes]:
+        start = time.perf_counter()
+        sweep = make_sweep(gates, cycles, sweep_processes)
+        statistics = [None] * len(configurations)
+        for result in sweep.run(configurations):
+            statistics[result.position] = result.statistics
+        elapsed = time.perf_counter() - start
+        print("".join([str(len(configurations)), " configurations of ",
+                       str(gates), " gates, swept in ",
+                       str(sweep_processes), " process(es): ",
+                       "{:.3f}".format(elapsed), " s, final levels ",
+                       "match" if statistics == reference else "differ"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Time cycles of a wide datapath executed with 1, 2, 4 and 8 threads.
+
+Run from the final directory with:
+    python benchmarks/bench_threaded_engine.py [width] [stages] [cycles]
+
+The datapath has stages rows of width gates, see circuits.build_datapath,
+so every row is one level of independent gates. The first row reads 64
+switches, one of which is toggled before every cycle. Threads only run
+at the same time on a free-threaded Python build; with the global
+interpreter lock every level is executed by one thread, whatever the
+number asked for.
+"""
+import sys
+import time
+
+from circuits import build_datapath
+from threaded_engine import ThreadedEngine, gil_enabled
+
+
+def main():
+    """Print the run times."""
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 4096
+    stages = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    cycles = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    print("".join(["Global interpreter lock: ",
+                   "enabled" if gil_enabled() else "disabled"]))
+    for threads in [1, 2, 4, 8]:
+        [names, devices, network, monitors] = build_datapath(width,
+                                                             stages)
+        network.fold_constants = False
+        engine = ThreadedEngine(network, threads)
+        engine.execute_network()
+        start = time.perf_counter()
+        for cycle in range(cycles):
+            switch_id = devices.devices_list[cycle % 64].device_id
+            devices.set_switch(switch_id, 1 - devices.get_device(
+                switch_id).switch_state)
+            engine.execute_network()
+        elapsed = time.perf_counter() - start
+        engine.close()
+        print("".join([str(cycles), " cycles of ", str(width * stages),
+                       " gates, ", str(threads), " threads: ",
+                       "{:.3f}".format(elapsed), " s"]))
+
+
+if __name__ == "__main__":
+    main()
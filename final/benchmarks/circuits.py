@@ -0,0 +1,97 @@
+"""Build large random circuits for the benchmarks.
+
+Used by the benchmark scripts in this directory. The circuits are built
+directly with the Devices and Network classes, without a definition file.
+
+Functions
+---------
+build_random_circuit - builds a random acyclic circuit of gates.
+build_datapath - builds a wide datapath of rows of gates.
+"""
+import os
+import random
+import sys
+
+# Allow the benchmarks to import the simulator modules from the parent folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from names import Names  # noqa: E402
+from devices import Devices  # noqa: E402
+from network import Network  # noqa: E402
+from monitors import Monitors  # noqa: E402
+
+
+def build_random_circuit(switches=32, gates=1000, max_inputs=4, seed=0):
+    """Build a random acyclic circuit of switches and gates.
+
+    Every gate input is connected to a switch or to an earlier gate, so the
+    circuit always settles. Return (names, devices, network, monitors).
+    """
+    generator = random.Random(seed)
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    sources = []
+    for number in range(switches):
+        [switch_id] = names.lookup(["".join(["sw", str(number)])])
+        devices.make_device(switch_id, devices.SWITCH,
+                            generator.choice([devices.LOW, devices.HIGH]))
+        sources.append(switch_id)
+
+    gate_kinds = [devices.AND, devices.OR, devices.NAND, devices.NOR,
+                  devices.XOR, devices.NOT]
+    for number in range(gates):
+        [gate_id] = names.lookup(["".join(["g", str(number)])])
+        device_kind = generator.choice(gate_kinds)
+        if device_kind == devices.XOR:
+            devices.make_device(gate_id, device_kind)
+            inputs = 2
+        elif device_kind == devices.NOT:
+            devices.make_device(gate_id, device_kind)
+            inputs = 1
+        else:
+            inputs = generator.randint(2, max_inputs)
+            devices.make_device(gate_id, device_kind, inputs)
+        for input_number in range(1, inputs + 1):
+            [input_id] = names.lookup(["".join(["I", str(input_number)])])
+            network.make_connection(generator.choice(sources), None,
+                                    gate_id, input_id)
+        sources.append(gate_id)
+
+    return (names, devices, network, monitors)
+
+
+def build_datapath(width, stages, switches=64):
+    """Build a datapath of stages rows of width two-input gates.
+
+    Each gate reads two neighbouring bits of the row before it, and the
+    first row reads the switches. The rows are XOR, NAND, XOR and NOR gates
+    in turn. Return (names, devices, network, monitors).
+    """
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+    row = names.lookup(["".join(["sw", str(number)])
+                        for number in range(switches)])
+    for switch_id in row:
+        devices.make_device(switch_id, devices.SWITCH, 0)
+    [I1, I2] = names.lookup(["I1", "I2"])
+    row_kinds = [devices.XOR, devices.NAND, devices.XOR, devices.NOR]
+    for stage in range(stages):
+        device_kind = row_kinds[stage % len(row_kinds)]
+        next_row = names.lookup(["".join(["g", str(stage), "_", str(bit)])
+                                 for bit in range(width)])
+        for bit, gate_id in enumerate(next_row):
+            if device_kind == devices.XOR:
+                devices.make_device(gate_id, device_kind)
+            else:
+                devices.make_device(gate_id, device_kind, 2)
+            network.make_connection(row[bit % len(row)], None, gate_id, I1)
+            network.make_connection(row[(bit + 1) % len(row)], None,
+                                    gate_id, I2)
+        row = next_row
+    return (names, devices, network, monitors)
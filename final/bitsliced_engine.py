@@ -0,0 +1,251 @@
+"""Execute each level of the gates of a logic network with big integers.
+
+Used in the Logic Simulator project for wide, shallow netlists, where a
+level holds thousands of gates of the same kind, so that each level is
+executed with a few operations on Python integers rather than gate by
+gate.
+
+Classes
+-------
+BitslicedEngine - executes a network with its gates evaluated a level at a
+                  time on bitplanes.
+
+Functions
+---------
+pack_planes - returns the bitplanes of an array of signals.
+unpack_planes - writes bitplanes back to an array of signals.
+get_level_groups - returns the masks that evaluate one level of gates.
+"""
+from partitioned_engine import get_pass_levels
+from signal_tables import HIGH, BLANK
+
+# Tables translating the signal levels to the binary digits of each plane
+HIGH_DIGITS = bytes.maketrans(bytes(range(5)), b"01000")
+LOW_DIGITS = bytes.maketrans(bytes(range(5)), b"10000")
+UPPER_DIGITS = bytes.maketrans(bytes(range(5)), b"01100")
+# Tables translating binary digits back to the bits of the signal levels
+FIRST_BIT = bytes.maketrans(b"01", b"\x00\x01")
+SECOND_BIT = bytes.maketrans(b"01", b"\x00\x02")
+
+
+def pack_planes(signals):
+    """Return (high, low, upper) bitplanes of an array of signals.
+
+    Bit i of each plane is set if the signal of net i is HIGH, LOW, or
+    HIGH or RISING. The three bits tell LOW, HIGH, RISING and FALLING
+    apart. BLANK cannot be packed.
+    """
+    digits = signals.tobytes()[::-1]
+    return (int(digits.translate(HIGH_DIGITS), 2),
+            int(digits.translate(LOW_DIGITS), 2),
+            int(digits.translate(UPPER_DIGITS), 2))
+
+
+def unpack_planes(planes, signals):
+    """Write the signal levels held by planes to the array signals."""
+    (high, low, upper) = planes
+    net_count = len(signals)
+    full = (1 << net_count) - 1
+    # The first bit of the level is set for HIGH and FALLING, and the
+    # second for RISING and FALLING
+    first = high | (full & ~(high | low | upper))
+    second = full & ~(high | low)
+    form = "".join(["0", str(net_count), "b"])
+    levels = (int.from_bytes(format(first, form).encode().translate(
+        FIRST_BIT), "big") + int.from_bytes(format(second, form).encode(
+            ).translate(SECOND_BIT), "big")).to_bytes(net_count, "big")
+    with memoryview(signals) as view:
+        view[:] = memoryview(levels[::-1]).cast("b")
+
+
+def get_level_groups(gates):
+    """Return the masks that evaluate one level of gates on bitplanes.
+
+    gates is a list of (input net IDs, output net ID, x, y) tuples, see
+    Network.execute_gate, none of which reads the output of another. The
+    gates are grouped by their rule and number of inputs. Each group is
+    (x, y, output mask, slots), where the output mask has the bits of the
+    output nets set, and slots has an entry for each input. An entry is a
+    list of (shift, mask) pairs: shifting a plane left by shift and keeping
+    the bits in mask moves the inputs of the gates in mask to the bits of
+    their outputs. Return (groups, shifts), where shifts is the number of
+    pairs, or (None, 0) if a gate is unconnected.
+    """
+    # group_slots dictionary stores {(x, y, inputs): [{shift: mask}, ...]}
+    # and group_masks stores {(x, y, inputs): output mask}
+    group_slots = {}
+    group_masks = {}
+    for input_nets, output_net, x, y in gates:
+        if None in input_nets or output_net is None:  # unconnected
+            return (None, 0)
+        key = (x, y, len(input_nets))
+        slots = group_slots.setdefault(key, [{} for net_id in input_nets])
+        bit = 1 << output_net
+        group_masks[key] = group_masks.get(key, 0) | bit
+        for slot, net_id in zip(slots, input_nets):
+            shift = output_net - net_id
+            slot[shift] = slot.get(shift, 0) | bit
+    groups = []
+    shifts = 0
+    for key, slots in group_slots.items():
+        (x, y, inputs) = key
+        groups.append((x, y, group_masks[key],
+                       [sorted(slot.items()) for slot in slots]))
+        shifts += sum(len(slot) for slot in slots)
+    return (groups, shifts)
+
+
+def gather(plane, slot):
+    """Return the input bits of a slot moved to the bits of the outputs."""
+    gathered = 0
+    for shift, mask in slot:
+        if shift >= 0:
+            gathered |= (plane << shift) & mask
+        else:
+            gathered |= (plane >> -shift) & mask
+    return gathered
+
+
+class BitslicedEngine:
+    """Execute a network with its gates evaluated a level at a time.
+
+    The gates of each pass are put on levels, see
+    partitioned_engine.get_pass_levels, and the signals are held in three
+    bitplanes, Python integers with one bit for each net, see pack_planes.
+    The gates of a level with the same rule and number of inputs are
+    evaluated together: each input is moved to the bits of the outputs
+    with one shift and mask for every distinct distance between an input
+    net and its output net, and the rule and the update towards the new
+    output are then applied to all the gates with a few bitwise
+    operations. As no gate of a level reads another gate of the level, the
+    signals match the network executed on its own.
+
+    Netlists built a row at a time, such as datapaths, have few distinct
+    distances. A level that needs more than one shift for every
+    gates_per_shift gates is executed gate by gate on the signal array
+    instead, as are all the gates if a signal is BLANK.
+
+    Switches, D-types, clocks, lookup tables and remembered blocks are
+    executed as in Network.execute_network. The gates fixed by the
+    switches are executed too, which changes no signal.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+
+    Public methods
+    --------------
+    execute_network(self): Executes all the devices in the network for one
+                           simulation cycle.
+
+    close(self): Forgets the levels found for the execution plan.
+    """
+
+    # Fewest gates in a level for each shift for it to be evaluated on the
+    # bitplanes
+    gates_per_shift = 4
+
+    def __init__(self, network):
+        """Initialise the engine without any levels."""
+        self.network = network
+        # Execution plan the levels were found for, and the levels as
+        # (gates, groups) pairs, where groups is None if the level is
+        # executed gate by gate
+        self.plan = None
+        self.levels = []
+
+    def close(self):
+        """Forget the levels found for the execution plan."""
+        self.plan = None
+        self.levels = []
+
+    def get_levels(self, plan):
+        """Put the gates of plan on their levels and group them."""
+        gate_devices = plan.gate_devices
+        pass_levels = get_pass_levels(gate_devices)
+        level_gates = [[] for level in range(max(pass_levels, default=-1)
+                                             + 1)]
+        for gate, level in zip(gate_devices, pass_levels):
+            level_gates[level].append(gate)
+        self.levels = []
+        for gates in level_gates:
+            (groups, shifts) = get_level_groups(gates)
+            if shifts * self.gates_per_shift > len(gates):
+                groups = None
+            self.levels.append((gates, groups))
+        self.plan = plan
+
+    def evaluate_group(self, planes, group):
+        """Return the planes with the outputs of one group of gates updated.
+
+        Also return True if an output changed.
+        """
+        (high, low, upper) = planes
+        (x, y, outputs, slots) = group
+        if x is None:  # XOR is HIGH if its inputs differ
+            [first_slot, *other_slots] = slots
+            current = [gather(plane, first_slot) for plane in planes]
+            for slot in other_slots:
+                differ = 0
+                for plane, bits in zip(planes, current):
+                    differ |= gather(plane, slot) ^ bits
+                differ &= outputs
+                current = [differ, outputs & ~differ, differ]
+            target = current[2]
+        else:
+            # The output is y if all the inputs are x
+            plane = high if x == HIGH else low
+            all_x = outputs
+            for slot in slots:
+                all_x &= gather(plane, slot)
+            target = all_x if y == HIGH else outputs & ~all_x
+
+        # A signal steps to RISING or FALLING before it reaches its target
+        old_upper = upper & outputs
+        new_high = target & old_upper
+        new_low = outputs & ~(target | old_upper)
+        changed = (new_high != high & outputs or new_low != low & outputs
+                   or target != old_upper)
+        keep = ~outputs
+        return ((high & keep | new_high, low & keep | new_low,
+                 upper & keep | target), changed)
+
+    def execute_gates(self, gate_devices):
+        """Execute every gate of the plan for one pass, level by level.
+
+        gate_devices is the schedule of Network.get_gate_schedule, which
+        only leaves out gates that would not change. Return True if
+        successful.
+        """
+        network = self.network
+        signals = network.devices.net_table.signals
+        if BLANK in signals:  # BLANK cannot be held in the planes
+            return network.execute_gate_pass(self.plan.gate_devices)
+        planes = None
+        for gates, groups in self.levels:
+            if groups is None:
+                if planes is not None:
+                    unpack_planes(planes, signals)
+                    planes = None
+                if not network.execute_gate_pass(gates):
+                    return False
+                continue
+            if planes is None:
+                planes = pack_planes(signals)
+            for group in groups:
+                (planes, changed) = self.evaluate_group(planes, group)
+                if changed:
+                    network.steady_state = False
+        if planes is not None:
+            unpack_planes(planes, signals)
+        return True
+
+    def execute_network(self):
+        """Execute all the devices in the network for one simulation cycle.
+
+        Return True if successful and the network does not oscillate.
+        """
+        plan = self.network.get_execution_plan()
+        if plan is not self.plan:
+            self.get_levels(plan)
+        return self.network.execute_network(self.execute_gates)
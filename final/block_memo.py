@@ -0,0 +1,166 @@
+"""Remember the outputs of blocks of logic gates for their recent inputs.
+
+Used in the Logic Simulator project so that a block of gates whose inputs
+repeat, such as a decoder driven by a few opcodes, is only evaluated the
+first time it sees each set of input levels.
+
+Classes
+-------
+BlockMemo - keeps the recent outputs of one block of gates.
+
+Functions
+---------
+find_blocks - returns the blocks of connected gates outside loops.
+"""
+import collections
+
+from lut_mapping import evaluate_gates
+from netlist_graph import find_strongly_connected
+
+
+def find_blocks(gate_devices, kept_nets, groups=None):
+    """Return the blocks of gate_devices as (input nets, output nets, gates).
+
+    gate_devices is a list of (input net IDs, output net ID, x, y) tuples,
+    see Network.execute_gate. If groups is None, each block is a set of
+    gates connected to each other, directly or through other gates. If not,
+    groups is a list of sets of output net IDs, and each block is the gates
+    driving one set. Gates in combinational loops are left out, and blocks
+    of fewer than two gates are not returned.
+
+    The inputs of a block are the nets its gates read from outside the
+    block. Its outputs are the nets of its gates that are in kept_nets, are
+    read by a gate outside the block or are read by no gate at all. The
+    gates of a block are in the order they are evaluated.
+    """
+    # readers dictionary stores {net ID: set of gate positions}
+    readers = {}
+    # drivers dictionary stores {net ID: gate position}
+    drivers = {}
+    for position, (input_nets, output_net, x, y) in enumerate(gate_devices):
+        drivers[output_net] = position
+        for net_id in input_nets:
+            readers.setdefault(net_id, set()).add(position)
+
+    def successors(position):
+        return readers.get(gate_devices[position][1], [])
+
+    # Components come after the components they drive, so visit them in
+    # reverse to see every driver before its loads
+    order = []
+    for component in reversed(find_strongly_connected(
+            range(len(gate_devices)), successors)):
+        if len(component) == 1 \
+                and component[0] not in successors(component[0]) \
+                and None not in gate_devices[component[0]][0]:
+            order.append(component[0])
+
+    # block_of dictionary stores {gate position: block number}
+    block_of = {}
+    if groups is None:
+        # Join the blocks of every gate and the gates driving it
+        parents = {position: position for position in order}
+
+        def find_root(position):
+            while parents[position] != position:
+                parents[position] = parents[parents[position]]
+                position = parents[position]
+            return position
+
+        for position in order:
+            for net_id in gate_devices[position][0]:
+                driver = drivers.get(net_id)
+                if driver in parents:
+                    parents[find_root(driver)] = find_root(position)
+        for position in order:
+            block_of[position] = find_root(position)
+    else:
+        for number, group in enumerate(groups):
+            for net_id in group:
+                if net_id in drivers:
+                    block_of[drivers[net_id]] = number
+
+    # members dictionary stores {block number: [gate position, ...]}
+    members = collections.OrderedDict()
+    for position in order:
+        if position in block_of:
+            members.setdefault(block_of[position], []).append(position)
+
+    blocks = []
+    for number, positions in members.items():
+        if len(positions) < 2:
+            continue
+        inside = set(positions)
+        input_nets = []
+        output_nets = []
+        for position in positions:
+            (gate_inputs, output_net, x, y) = gate_devices[position]
+            for net_id in gate_inputs:
+                if drivers.get(net_id) not in inside \
+                        and net_id not in input_nets:
+                    input_nets.append(net_id)
+            loads = readers.get(output_net, set())
+            if output_net in kept_nets or not loads or \
+                    not loads.issubset(inside):
+                output_nets.append(output_net)
+        blocks.append((tuple(input_nets), tuple(output_nets),
+                       [gate_devices[position] for position in positions]))
+    return blocks
+
+
+class BlockMemo:
+    """Keep the recent outputs of one block of gates.
+
+    The levels of the input nets are the key to the levels of the output
+    nets. At most size keys are kept, and the least recently used key is
+    dropped to make room for a new one. Every level is cached, so RISING and
+    FALLING inputs are evaluated as Network.execute_gate_nets would
+    evaluate them, in one pass through the gates in order.
+
+    Parameters
+    ----------
+    input_nets: tuple of the net IDs read by the block.
+    output_nets: tuple of the net IDs of the block's outputs.
+    gates: list of (input net IDs, output net ID, x, y) tuples, in the order
+           they are evaluated.
+    size: largest number of input levels remembered.
+
+    Public methods
+    --------------
+    get_outputs(self, signals): Returns the levels of the output nets for
+                                the levels of the input nets in signals.
+    """
+
+    def __init__(self, input_nets, output_nets, gates, size):
+        """Initialise the empty cache and the hit and miss counters."""
+        self.input_nets = input_nets
+        self.output_nets = output_nets
+        self.gates = gates
+        self.size = size
+        # cache dictionary stores {input levels: output levels}, least
+        # recently used first
+        self.cache = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get_outputs(self, signals):
+        """Return the levels of the output nets as bytes.
+
+        The outputs are evaluated from the gates only if the input levels
+        are not in the cache.
+        """
+        key = bytes(signals[net_id] for net_id in self.input_nets)
+        cache = self.cache
+        outputs = cache.get(key)
+        if outputs is not None:
+            cache.move_to_end(key)
+            self.hits += 1
+            return outputs
+        self.misses += 1
+        levels = {}
+        evaluate_gates(self.gates, signals, levels)
+        outputs = bytes(levels[net_id] for net_id in self.output_nets)
+        cache[key] = outputs
+        if len(cache) > self.size:
+            cache.popitem(last=False)
+        return outputs
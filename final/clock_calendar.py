@@ -0,0 +1,90 @@
+"""Schedule the edges of the clocks in a logic network.
+
+Used in the Logic Simulator project so that the network only visits the
+clocks that change in a cycle, and can find the next cycle in which any
+clock changes without looking at every clock.
+
+Classes
+-------
+ClockCalendar - keeps the clocks in a heap ordered by their next edge.
+"""
+import heapq
+
+
+class ClockCalendar:
+    """Keep the clocks in a heap ordered by the cycle of their next edge.
+
+    A clock changes in the cycle that starts with its counter at its half
+    period, that is in cycle clock_start + clock_half_period of the net
+    table. The calendar stores (edge cycle, position, device, net ID) for
+    every clock, and the earliest edge is always at the top of the heap. A
+    clock whose counter is already past its half period never changes
+    again, as in Network.update_clocks.
+
+    The calendar is built for the current clock counters. Setting a clock
+    counter from outside the simulation counts a change in the net table,
+    and the calendar must then be rebuilt. Changing the half period of an
+    existing clock is not tracked.
+
+    Parameters
+    ----------
+    net_table: instance of the net_table.NetTable() class.
+    clock_devices: list of (clock device, output net ID) pairs.
+
+    Public methods
+    --------------
+    is_current(self): Returns True if no clock counter has been set since
+                      the calendar was built.
+
+    next_edge(self): Returns the cycle of the next clock edge, or None if no
+                     clock will change.
+
+    pop_due(self): Returns the clocks that change in the current cycle and
+                   schedules their next edges.
+    """
+
+    def __init__(self, net_table, clock_devices):
+        """Build the heap of clock edges."""
+        self.net_table = net_table
+        self.clock_changes = net_table.clock_changes
+        cycle = net_table.cycle
+        self.heap = []
+        for position, (device, net_id) in enumerate(clock_devices):
+            if device.clock_start is None:  # the clock was never started
+                continue
+            edge = device.clock_start + device.clock_half_period
+            if edge >= cycle:
+                self.heap.append((edge, position, device, net_id))
+        heapq.heapify(self.heap)
+
+    def is_current(self):
+        """Return True if the calendar matches the clock counters."""
+        return self.clock_changes == self.net_table.clock_changes
+
+    def next_edge(self):
+        """Return the cycle of the next clock edge, or None if there is none.
+
+        The result may be the current cycle.
+        """
+        if self.heap:
+            return self.heap[0][0]
+        return None
+
+    def pop_due(self):
+        """Return the (device, net ID) pairs of the clocks due this cycle.
+
+        Each clock returned is restarted, with its counter at 0, and its
+        next edge is scheduled a half period later.
+        """
+        heap = self.heap
+        cycle = self.net_table.cycle
+        due = []
+        while heap and heap[0][0] <= cycle:
+            [edge, position, device, net_id] = heapq.heappop(heap)
+            if edge < cycle:  # the counter was already past the half period
+                continue
+            due.append((device, net_id))
+            device.clock_start = cycle
+            heapq.heappush(heap, (cycle + device.clock_half_period,
+                                  position, device, net_id))
+        return due
@@ -5,42 +5,263 @@ properties.
 
 Classes
 -------
+PortLayout - maps port IDs to positions, shared by devices with equal ports.
+InputsView - presents a device's connections as its inputs dictionary.
 Device - stores device properties.
 Devices - makes and stores all the devices in the logic network.
 """
 import random
+from collections.abc import MutableMapping
+
+from net_table import NetTable, OutputsView
+
+
+class PortLayout:
+
+    """Map port IDs to positions, shared by devices with equal ports.
+
+    Devices store their connections and output nets in lists indexed by port
+    position. The layout gives the position of every input and output ID.
+    Layouts are interned, so all the devices with the same ports in the same
+    order (for example every 2-input gate, or every D-type) share one layout
+    object.
+
+    Parameters
+    ----------
+    input_ids: tuple of input IDs in port order.
+    output_ids: tuple of output IDs in port order.
+
+    Public methods
+    --------------
+    get(input_ids=(), output_ids=()): Returns the shared layout for these
+                                      ports. A class method.
+
+    with_input(self, input_id): Returns the layout with one more input.
+
+    with_output(self, output_id): Returns the layout with one more output.
+    """
+
+    __slots__ = ("input_ids", "output_ids", "input_positions",
+                 "output_positions")
+
+    # layouts dictionary stores {(input_ids, output_ids): PortLayout}
+    layouts = {}
+
+    def __init__(self, input_ids, output_ids):
+        """Initialise the port positions."""
+        self.input_ids = input_ids
+        self.output_ids = output_ids
+        self.input_positions = {input_id: position for position, input_id
+                                in enumerate(input_ids)}
+        self.output_positions = {output_id: position for position, output_id
+                                 in enumerate(output_ids)}
+
+    @classmethod
+    def get(cls, input_ids=(), output_ids=()):
+        """Return the shared layout for these input and output IDs."""
+        key = (tuple(input_ids), tuple(output_ids))
+        layout = cls.layouts.get(key)
+        if layout is None:
+            layout = cls(*key)
+            cls.layouts[key] = layout
+        return layout
+
+    def with_input(self, input_id):
+        """Return the layout with input_id added after the other inputs."""
+        return PortLayout.get(self.input_ids + (input_id,), self.output_ids)
+
+    def with_output(self, output_id):
+        """Return the layout with output_id added after the other outputs."""
+        return PortLayout.get(self.input_ids, self.output_ids + (output_id,))
+
+
+class InputsView(MutableMapping):
+
+    """Present a device's connections as its inputs dictionary.
+
+    The view behaves like the dictionary
+    {input_id: (connected_output_device_id, connected_output_port_id)},
+    where unconnected inputs map to None. Assigning to a new input ID adds
+    an input. Inputs cannot be removed.
+
+    Parameters
+    ----------
+    device: the Device whose inputs are presented.
+
+    Public methods
+    --------------
+    No public methods.
+    """
+
+    __slots__ = ("device",)
+
+    def __init__(self, device):
+        """Initialise the view."""
+        self.device = device
+
+    def __getitem__(self, input_id):
+        """Return the output connected to the input."""
+        device = self.device
+        return device.connections[device.layout.input_positions[input_id]]
+
+    def __setitem__(self, input_id, connected_output):
+        """Connect the input, adding it if it is new."""
+        device = self.device
+        position = device.layout.input_positions.get(input_id)
+        if position is None:
+            device.add_input_port(input_id)
+            position = len(device.connections) - 1
+        device.connections[position] = connected_output
+
+    def __delitem__(self, input_id):
+        """Refuse to remove an input."""
+        raise TypeError("Device inputs cannot be removed.")
+
+    def __contains__(self, input_id):
+        """Return True if the device has the input."""
+        return input_id in self.device.layout.input_positions
+
+    def __iter__(self):
+        """Iterate over the input IDs in port order."""
+        return iter(self.device.layout.input_ids)
+
+    def __len__(self):
+        """Return the number of inputs."""
+        return len(self.device.layout.input_ids)
+
+    def __repr__(self):
+        """Return the inputs as a dictionary would show them."""
+        return repr(dict(self.items()))
 
 
 class Device:
 
     """Store device properties.
 
+    Devices are slotted and keep their ports in small lists indexed by port
+    position: connections holds the output connected to every input, and
+    output_nets the net ID of every output. The port layout, shared with
+    other devices of the same shape, maps port IDs to positions. The output
+    signals and the D-type memory are stored in a net table shared by all
+    the devices. The inputs and outputs properties present the ports as
+    dictionaries, and dtype_memory presents the memory. clock_counter is
+    found from the cycle count of the net table.
+
     Parameters
     ----------
     device_id: device ID.
+    net_table: instance of the net_table.NetTable() class. A new table is
+               made for the device if this is None.
 
     Public methods
     --------------
-    No public methods.
+    add_input_port(self, input_id): Adds an unconnected input.
+
+    add_output_port(self, output_id, signal): Adds an output with a new net.
+
+    set_layout(self, layout, signal=0): Gives a device with no ports all the
+                                        ports of layout at once.
     """
 
-    def __init__(self, device_id):
+    __slots__ = ("device_id", "device_kind", "net_table", "device_index",
+                 "layout", "connections", "output_nets", "clock_half_period",
+                 "clock_start", "switch_state")
+
+    def __init__(self, device_id, net_table=None):
         """Initialise device properties."""
 
         self.device_id = device_id
-
-        # inputs dictionary stores
-        # {input_id: (connected_output_device_id, connected_output_port_id)}
-        self.inputs = {}
-
-        # outputs dictionary stores {output_id: output_signal}
-        self.outputs = {}
+        if net_table is None:
+            net_table = NetTable()
+        self.net_table = net_table
+        self.device_index = net_table.add_device()
+
+        # Ports, indexed by their position in the layout
+        self.layout = PortLayout.get()
+        # connections list stores, for every input,
+        # (connected_output_device_id, connected_output_port_id) or None
+        self.connections = []
+        # output_nets list stores the net ID of every output
+        self.output_nets = []
 
         self.device_kind = None
         self.clock_half_period = None
-        self.clock_counter = None
+        # Cycle of the net table at which the clock counter was 0
+        self.clock_start = None
         self.switch_state = None
-        self.dtype_memory = None
+
+    @property
+    def inputs(self):
+        """Return the inputs, which behave like a dictionary."""
+        return InputsView(self)
+
+    @property
+    def outputs(self):
+        """Return the outputs, which behave like a dictionary."""
+        return OutputsView(self)
+
+    def add_input_port(self, input_id):
+        """Add an unconnected input after the other inputs."""
+        self.layout = self.layout.with_input(input_id)
+        # Concatenate rather than append, so the list is not over-allocated
+        self.connections = self.connections + [None]
+
+    def add_output_port(self, output_id, signal):
+        """Add an output with a new net at the given signal level."""
+        net_id = self.net_table.add_net(self.device_id,
+                                        len(self.output_nets),
+                                        self.device_kind, signal)
+        self.layout = self.layout.with_output(output_id)
+        self.output_nets = self.output_nets + [net_id]
+
+    def set_layout(self, layout, signal=0):
+        """Give a device with no ports all the ports of layout.
+
+        The inputs are unconnected and every output gets a new net at the
+        given signal level.
+        """
+        self.layout = layout
+        self.connections = [None] * len(layout.input_ids)
+        add_net = self.net_table.add_net
+        self.output_nets = [add_net(self.device_id, position,
+                                    self.device_kind, signal)
+                            for position in range(len(layout.output_ids))]
+
+    @property
+    def clock_counter(self):
+        """Return the number of cycles since the clock last changed.
+
+        The counter is not stored: it is the number of cycles the net
+        table has counted since the clock started, so all the clocks
+        advance together when the cycle count does.
+        """
+        if self.clock_start is None:
+            return None
+        return self.net_table.cycle - self.clock_start
+
+    @clock_counter.setter
+    def clock_counter(self, counter):
+        """Set the clock counter, and count the change in the net table."""
+        if counter is None:
+            self.clock_start = None
+        else:
+            self.clock_start = self.net_table.cycle - counter
+        self.net_table.clock_changes += 1
+
+    @property
+    def dtype_memory(self):
+        """Return the D-type memory, or None if it is not set."""
+        memory = self.net_table.memory[self.device_index]
+        if memory == NetTable.NO_MEMORY:
+            return None
+        return memory
+
+    @dtype_memory.setter
+    def dtype_memory(self, memory):
+        """Set the D-type memory."""
+        if memory is None:
+            memory = NetTable.NO_MEMORY
+        self.net_table.memory[self.device_index] = memory
 
 
 class Devices:
@@ -48,7 +269,9 @@ class Devices:
     """Make and store devices.
 
     This class contains many functions for making devices and ports.
-    It stores all the devices in a list.
+    It stores all the devices in a list, and in a dictionary keyed by device
+    ID for constant time lookup. The signals of all the devices are stored
+    in one net table.
 
     Parameters
     ----------
@@ -62,8 +285,9 @@ class Devices:
     find_devices(self, device_kind=None): Returns a list of device_ids of
                                           the specified device_kind.
 
-    add_device(self, device_id, device_kind): Adds the specified device to the
-                                              network.
+    add_device(self, device_id, device_kind, layout=None): Adds the specified
+                                     device to the network, with the ports of
+                                     layout if it is given.
 
     add_input(self, device_id, input_id): Adds the specified input to the
                                           specified device.
@@ -71,6 +295,12 @@ class Devices:
     add_output(self, device_id, output_id, signal=0): Adds the specified output
                                                       to the specified device.
 
+    get_net(self, device_id, output_id): Returns the net ID of the specified
+                                         output.
+
+    get_net_output(self, net_id): Returns the device and output IDs of the
+                                  output driving the specified net.
+
     get_signal_name(self, device_id, output_id): Returns the name string of the
                                                  specified signal.
 
@@ -93,6 +323,8 @@ class Devices:
 
     cold_startup(self): Simulates cold start-up of D-types and clocks.
 
+    cold_start_device(self, device): Simulates cold start-up of one device.
+
     make_device(self, device_id, device_kind, device_property=None): Creates
                        the specified device and returns errors if unsuccessful.
     """
@@ -103,6 +335,13 @@ class Devices:
         self.names = names
 
         self.devices_list = []
+        # devices_dictionary stores {device_id: Device}
+        self.devices_dictionary = {}
+        # Counts the devices and ports added, so that execution plans can be
+        # rebuilt
+        self.version = 0
+        # Signal levels and D-type memories of all the devices
+        self.net_table = NetTable()
 
         gate_strings = ["AND", "OR", "NAND", "NOR", "XOR", "NOT"]
         device_strings = ["CLOCK", "SWITCH", "DTYPE"]
@@ -152,10 +391,7 @@ class Devices:
 
     def get_device(self, device_id):
         """Return the Device object corresponding to device_id."""
-        for device in self.devices_list:
-            if device.device_id == device_id:
-                return device
-        return None
+        return self.devices_dictionary.get(device_id)
 
     def find_devices(self, device_kind=None):
         """Return a list of device IDs of the specified device_kind.
@@ -171,11 +407,20 @@ class Devices:
                 device_id_list.append(device.device_id)
         return device_id_list
 
-    def add_device(self, device_id, device_kind):
-        """Add the specified device to the network."""
-        new_device = Device(device_id)
+    def add_device(self, device_id, device_kind, layout=None):
+        """Add the specified device to the network.
+
+        If a port layout is given, the device gets all its ports at once,
+        with unconnected inputs and LOW outputs. Return the new device.
+        """
+        new_device = Device(device_id, self.net_table)
         new_device.device_kind = device_kind
+        if layout is not None:
+            new_device.set_layout(layout)
         self.devices_list.append(new_device)
+        self.devices_dictionary[device_id] = new_device
+        self.version += 1
+        return new_device
 
     def add_input(self, device_id, input_id):
         """Add the specified input to the specified device.
@@ -184,7 +429,9 @@ class Devices:
         """
         device = self.get_device(device_id)
         if device is not None:
-            device.inputs.setdefault(input_id)
+            if input_id not in device.inputs:
+                device.inputs[input_id] = None
+                self.version += 1
             return True
         else:
             return False
@@ -196,11 +443,30 @@ class Devices:
         """
         device = self.get_device(device_id)
         if device is not None:
+            if output_id not in device.outputs:
+                self.version += 1
             device.outputs[output_id] = signal
             return True
         else:
             return False
 
+    def get_net(self, device_id, output_id):
+        """Return the net ID of the specified output.
+
+        Return None if the device or the output does not exist.
+        """
+        device = self.get_device(device_id)
+        if device is None:
+            return None
+        return device.outputs.get_net(output_id)
+
+    def get_net_output(self, net_id):
+        """Return (device ID, output ID) of the output driving net_id."""
+        device_id = self.net_table.net_devices[net_id]
+        device = self.get_device(device_id)
+        position = self.net_table.net_positions[net_id]
+        return (device_id, device.layout.output_ids[position])
+
     def get_signal_name(self, device_id, port_id):
         """Return the name string of the specified signal.
 
@@ -245,6 +511,8 @@ class Devices:
         elif device.device_kind != self.SWITCH:
             return False
         else:
+            if device.switch_state != signal:
+                self.net_table.changed_switches.add(device_id)
             device.switch_state = signal
             return True
 
@@ -291,18 +559,25 @@ class Devices:
         begin from a random point in their cycles.
         """
         for device in self.devices_list:
-            if device.device_kind == self.D_TYPE:
-                device.dtype_memory = random.choice([self.LOW, self.HIGH])
-
-            elif device.device_kind == self.CLOCK:
-                clock_signal = random.choice([self.LOW, self.HIGH])
-                self.add_output(
-                    device.device_id, output_id=None, signal=clock_signal
-                )
-                # Initialise it to a random point in its cycle.
-                device.clock_counter = random.randrange(
-                    device.clock_half_period
-                )
+            self.cold_start_device(device)
+
+    def cold_start_device(self, device):
+        """Simulate cold start-up of one D-type or clock device.
+
+        Other devices are left unchanged.
+        """
+        if device.device_kind == self.D_TYPE:
+            device.dtype_memory = random.choice([self.LOW, self.HIGH])
+
+        elif device.device_kind == self.CLOCK:
+            clock_signal = random.choice([self.LOW, self.HIGH])
+            self.add_output(
+                device.device_id, output_id=None, signal=clock_signal
+            )
+            # Initialise it to a random point in its cycle.
+            device.clock_counter = random.randrange(
+                device.clock_half_period
+            )
 
     def make_device(self, device_id, device_kind, device_property=None):
         """Create the specified device.
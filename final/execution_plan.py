@@ -0,0 +1,280 @@
+"""Store the order in which the devices of a network are executed.
+
+Used in the Logic Simulator project so that the network does not have to find
+its devices and their connections again on every simulation cycle.
+
+Classes
+-------
+ExecutionPlan - stores the devices to execute and the nets they read.
+"""
+from analysis import get_gate_depths
+from block_memo import BlockMemo, find_blocks
+from lut_mapping import map_lookup_tables
+
+
+class ExecutionPlan:
+    """Store the devices to execute and the nets they read and write.
+
+    The plan is built once from the devices and their connections, and stays
+    valid until a device or port is added or a connection is made or
+    removed. Devices and Network each count these changes in their version
+    attribute, and the plan records the versions it was built from. Every
+    input and output is resolved to its net ID in the net table, so the
+    network can be executed by indexing the signal and memory arrays.
+    Switch states and clock counters are read from the devices when they
+    are executed, so changing them does not invalidate the plan.
+
+    A gate merged into another gate does not drive its output net, and is
+    left out, as the gate that drives the net is executed instead.
+
+    If the network maps gates to lookup tables, the small cones of gates
+    outside combinational loops are executed as lookup tables instead, see
+    lut_mapping.map_lookup_tables. The outputs of the devices kept by the
+    network, and every net read by a D-type, are left as gate outputs. The
+    gates driving the CLK, SET or CLEAR input of a D-type are never mapped,
+    nor put in blocks, so that the D-types see the same edges.
+
+    If the network remembers the outputs of blocks of gates, the blocks of
+    the gates left are executed through their caches, see
+    block_memo.BlockMemo. A new plan starts with empty caches.
+
+    If the network is pruned to a cone of influence, only the switches,
+    D-types and gates in the cone are executed. Every clock is kept, so that
+    clocks stay in phase while nothing depends on them.
+
+    The plan also measures the combinational depth of the network, which
+    sets how many passes over the devices a cycle may take to settle.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+
+    Public methods
+    --------------
+    is_current(self): Returns True if the devices and connections have not
+                      changed since the plan was built.
+
+    get_input_signals(self, device_id): Returns a list of (input ID, signal
+                                        level) pairs for the device's inputs.
+    """
+
+    def __init__(self, devices, network):
+        """Resolve the inputs and outputs of every device to net IDs."""
+        self.devices = devices
+        self.network = network
+        self.devices_version = devices.version
+        self.network_version = network.version
+        self.signals = devices.net_table.signals
+
+        # input_nets dictionary stores {device_id: [(input_id, net_id), ...]}
+        # where the net ID is None if the input is unconnected
+        self.input_nets = {}
+        for device in devices.devices_list:
+            input_nets = []
+            for input_id, connected_output in device.inputs.items():
+                if connected_output is None:
+                    input_nets.append((input_id, None))
+                else:
+                    (output_device_id, output_id) = connected_output
+                    input_nets.append((input_id, devices.get_net(
+                        output_device_id, output_id)))
+            self.input_nets[device.device_id] = input_nets
+
+        # Devices in the order they are executed. Switches and clocks are
+        # stored as (device, output net ID)
+        self.switch_devices = []
+        self.clock_devices = []
+        # D-types are stored as (device index, (CLK, SET, CLEAR, DATA) net
+        # IDs, Q net ID, QBAR net ID)
+        self.d_type_devices = []
+        cone = network.cone
+        if cone is None:
+            executed = devices.devices_list
+        else:
+            executed = [device for device in devices.devices_list
+                        if device.device_id in cone
+                        or device.device_kind == devices.CLOCK]
+        for device in executed:
+            if device.device_kind == devices.SWITCH:
+                self.switch_devices.append(
+                    (device, device.outputs.get_net(None)))
+            elif device.device_kind == devices.CLOCK:
+                self.clock_devices.append(
+                    (device, device.outputs.get_net(None)))
+            elif device.device_kind == devices.D_TYPE:
+                self.d_type_devices.append(self.get_d_type_nets(device))
+
+        # Gates are stored as (input net IDs, output net ID, x, y), see
+        # Network.execute_gate
+        self.gate_devices = []
+        gate_rules = [
+            (devices.AND, devices.HIGH, devices.HIGH),
+            (devices.OR, devices.LOW, devices.LOW),
+            (devices.NAND, devices.HIGH, devices.LOW),
+            (devices.NOR, devices.LOW, devices.HIGH),
+            (devices.XOR, None, None),
+            (devices.NOT, devices.HIGH, devices.LOW),
+        ]
+        net_devices = devices.net_table.net_devices
+        for device_kind, x, y in gate_rules:
+            for device in executed:
+                if device.device_kind != device_kind:
+                    continue
+                output_net = device.outputs.get_net(None)
+                if output_net is not None \
+                        and net_devices[output_net] != device.device_id:
+                    continue  # merged into the gate driving the net
+                self.gate_devices.append(
+                    (self.get_gate_input_nets(device.device_id),
+                     output_net, x, y))
+
+        # Lookup tables are stored as (input net IDs, output net ID, truth
+        # table, gates), see Network.execute_lookup_table
+        self.lookup_tables = []
+        # Blocks of gates with their caches, see Network.execute_memo_block
+        self.memo_blocks = []
+        kept_nets = set()
+        if network.lut_inputs is not None or network.memo_size is not None:
+            for device_index, input_nets, Q_net, QBAR_net \
+                    in self.d_type_devices:
+                kept_nets.update(input_nets)
+            for device_id in network.kept_devices:
+                device = devices.get_device(device_id)
+                if device is not None:
+                    kept_nets.update(device.output_nets)
+        if network.lut_inputs is not None:
+            self.get_lookup_tables(kept_nets)
+            for input_nets, output_net, table, gates in self.lookup_tables:
+                kept_nets.update(input_nets)
+        if network.memo_size is not None:
+            self.get_memo_blocks(kept_nets)
+
+        # A change can take two passes to cross each gate, as outputs step
+        # through RISING or FALLING, whatever order the gates are executed
+        # in. D-types and clocks add a few passes of their own, and chains
+        # of D-types clocked by each other, which the depth does not count,
+        # settle within the fixed limit of 20 passes used before.
+        self.logic_depth = max(get_gate_depths(devices, network).values(),
+                               default=0)
+        self.iteration_limit = max(20, 2 * self.logic_depth + 6)
+
+    def get_edge_drivers(self):
+        """Return the output net IDs of the gates driving D-type edges.
+
+        These are the gates that drive the CLK, SET or CLEAR input of a
+        D-type, directly or through other gates. A lookup table or a block
+        settles in a single pass, where its gates would take one or two
+        passes each, so these gates are always executed on their own to
+        keep the edges the D-types see in the same passes.
+        """
+        return self.get_gate_drivers(
+            net_id for device_index, input_nets, Q_net, QBAR_net
+            in self.d_type_devices for net_id in input_nets[:3])
+
+    def get_gate_drivers(self, net_ids):
+        """Return the output net IDs of the gates the given nets depend on.
+
+        These are the gates driving the nets, directly or through other
+        gates, lookup tables or blocks. The gates inside lookup tables and
+        blocks are left out.
+        """
+        # drivers dictionary stores {output net ID: input net IDs} for the
+        # gates, lookup tables and blocks
+        drivers = {output_net: input_nets for input_nets, output_net,
+                   x, y in self.gate_devices}
+        for input_nets, output_net, table, gates in self.lookup_tables:
+            drivers[output_net] = input_nets
+        for memo_block in self.memo_blocks:
+            for output_net in memo_block.output_nets:
+                drivers[output_net] = memo_block.input_nets
+        driven_nets = set()
+        stack = list(net_ids)
+        while stack:
+            net_id = stack.pop()
+            if net_id in drivers and net_id not in driven_nets:
+                driven_nets.add(net_id)
+                stack.extend(drivers[net_id])
+        return driven_nets.intersection(
+            output_net for input_nets, output_net, x, y in self.gate_devices)
+
+    def get_lookup_tables(self, kept_nets):
+        """Move the cones of gates mapped by the network to lookup_tables.
+
+        Gates that drive D-type edges are executed on their own, see
+        get_edge_drivers.
+        """
+        edge_drivers = self.get_edge_drivers()
+        [gates_left, self.lookup_tables] = map_lookup_tables(
+            [gate for gate in self.gate_devices
+             if gate[1] not in edge_drivers],
+            kept_nets, self.network.lut_inputs)
+        kept = edge_drivers.union(gate[1] for gate in gates_left)
+        self.gate_devices = [gate for gate in self.gate_devices
+                             if gate[1] in kept]
+
+    def get_memo_blocks(self, kept_nets):
+        """Move the blocks of gates remembered by the network to memo_blocks.
+
+        The blocks are the ones declared by the network, or the connected
+        gates if it declares none. Gates that drive D-type edges are
+        executed on their own, see get_edge_drivers.
+        """
+        devices = self.devices
+        network = self.network
+        groups = None
+        if network.memo_groups is not None:
+            groups = []
+            for device_ids in network.memo_groups:
+                group = set()
+                for device_id in device_ids:
+                    device = devices.get_device(device_id)
+                    if device is not None:
+                        group.update(device.output_nets)
+                groups.append(group)
+        edge_drivers = self.get_edge_drivers()
+        memo_gates = [gate for gate in self.gate_devices
+                      if gate[1] not in edge_drivers]
+        blocked = set()
+        for input_nets, output_nets, gates in find_blocks(
+                memo_gates, kept_nets, groups):
+            self.memo_blocks.append(BlockMemo(input_nets, output_nets, gates,
+                                              network.memo_size))
+            blocked.update(output_net for gate_inputs, output_net, x, y
+                           in gates)
+        self.gate_devices = [gate for gate in self.gate_devices
+                             if gate[1] not in blocked]
+
+    def get_gate_input_nets(self, device_id):
+        """Return a tuple of the net IDs read by the device's inputs."""
+        return tuple(net_id for input_id, net_id
+                     in self.input_nets[device_id])
+
+    def get_d_type_nets(self, device):
+        """Return the net IDs read and written by a D-type device.
+
+        The result is (device index, (CLK, SET, CLEAR, DATA) net IDs, Q net
+        ID, QBAR net ID).
+        """
+        devices = self.devices
+        input_nets = dict(self.input_nets[device.device_id])
+        return (device.device_index,
+                tuple(input_nets.get(input_id)
+                      for input_id in [devices.CLK_ID, devices.SET_ID,
+                                       devices.CLEAR_ID, devices.DATA_ID]),
+                device.outputs.get_net(devices.Q_ID),
+                device.outputs.get_net(devices.QBAR_ID))
+
+    def is_current(self):
+        """Return True if the plan matches the devices and connections."""
+        return (self.devices_version == self.devices.version
+                and self.network_version == self.network.version)
+
+    def get_input_signals(self, device_id):
+        """Return a list of (input ID, signal level) pairs for the device.
+
+        The signal level is None if the input is unconnected.
+        """
+        signals = self.signals
+        return [(input_id, None if net_id is None else signals[net_id])
+                for input_id, net_id in self.input_nets[device_id]]
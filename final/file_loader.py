@@ -0,0 +1,150 @@
+"""Load circuit definition files and build the logic network.
+
+Used in the Logic Simulator project to scan and parse a definition file into
+new Names, Devices, Network and Monitors instances, either directly or in a
+background thread that reports its progress and can be cancelled.
+
+Classes
+-------
+LoadCancelled - raised inside a load when it has been cancelled.
+LoaderWorker - loads a definition file in a background thread.
+
+Functions
+---------
+load_definition_file - scans and parses a definition file.
+count_characters - counts the characters the scanner reads from a file.
+"""
+import threading
+import time
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from scanner import Scanner
+from parse import Parser
+
+
+class LoadCancelled(Exception):
+    """Stop a load that has been cancelled."""
+
+
+def load_definition_file(path, scanner_logger, parser_logger,
+                         progress_callback=None):
+    """Scan and parse the definition file at path.
+
+    progress_callback(characters_read, statements_parsed) is called after
+    every statement. Return (parser, success), where success is True if the
+    file was parsed without errors.
+    """
+    names_instance = Names()
+    scanner_instance = Scanner(path, names_instance, scanner_logger)
+    device_instance = Devices(names_instance)
+    network_instance = Network(names_instance, device_instance)
+    monitor_instance = Monitors(
+        names_instance, device_instance, network_instance
+    )
+
+    parser = Parser(
+        names_instance,
+        device_instance,
+        network_instance,
+        monitor_instance,
+        scanner_instance,
+        parser_logger,
+        progress_callback,
+    )
+    try:
+        success = parser.parse_network()
+    except SystemExit:
+        # The parser exits when the END keyword is missing
+        success = False
+    return (parser, success)
+
+
+def count_characters(path):
+    """Return the number of characters the scanner reads from the file.
+
+    The file is decoded as the scanner decodes it, so a character counts
+    once however many bytes it takes, and so does a Windows line ending.
+    """
+    total_characters = 0
+    with open(path, errors="replace") as definition_file:
+        chunk = definition_file.read(65536)
+        while chunk:
+            total_characters += len(chunk)
+            chunk = definition_file.read(65536)
+    return total_characters
+
+
+class LoaderWorker(threading.Thread):
+    """Load a definition file in a background thread.
+
+    The callbacks are called from the worker thread. Graphical interfaces
+    should wrap them (for example with wx.CallAfter) before touching any
+    widgets.
+
+    Parameters
+    ----------
+    path: path to the circuit definition file.
+    scanner_logger: logger for the scanner.
+    parser_logger: logger for the parser.
+    progress_callback: called as progress_callback(characters_read,
+                       total_characters, statements_parsed) at most once
+                       every progress_interval seconds.
+    finish_callback: called as finish_callback(parser, success, cancelled)
+                     once the load has ended. parser is None if the load
+                     was cancelled.
+    progress_interval: minimum time in seconds between progress reports.
+
+    Public methods
+    --------------
+    run(self): Loads the file. Called by start().
+
+    cancel(self): Requests that the load stops.
+    """
+
+    def __init__(self, path, scanner_logger, parser_logger,
+                 progress_callback=None, finish_callback=None,
+                 progress_interval=0.1):
+        """Initialise the worker thread."""
+        super().__init__(daemon=True)
+        self.path = path
+        self.scanner_logger = scanner_logger
+        self.parser_logger = parser_logger
+        self.progress_callback = progress_callback
+        self.finish_callback = finish_callback
+        self.progress_interval = progress_interval
+
+        self.total_characters = count_characters(path)
+        self.last_report = time.monotonic()
+        self.cancel_event = threading.Event()
+
+    def report_progress(self, characters_read, statements_parsed):
+        """Report progress to the callback and stop if cancelled."""
+        if self.cancel_event.is_set():
+            raise LoadCancelled
+        if self.progress_callback is not None:
+            now = time.monotonic()
+            if now - self.last_report >= self.progress_interval:
+                self.last_report = now
+                self.progress_callback(characters_read,
+                                       self.total_characters,
+                                       statements_parsed)
+
+    def run(self):
+        """Load the file and report the result."""
+        parser = None
+        success = False
+        try:
+            [parser, success] = load_definition_file(
+                self.path, self.scanner_logger, self.parser_logger,
+                self.report_progress)
+        except LoadCancelled:
+            pass
+        if self.finish_callback is not None:
+            self.finish_callback(parser, success, self.cancel_event.is_set())
+
+    def cancel(self):
+        """Request that the load stops."""
+        self.cancel_event.set()
@@ -10,16 +10,12 @@ HelpMenu - handles all menu items under 'Help' menu.
 AboutMenu - handles all menu items under 'About' menu.
 ConsoleBox - handles all console items in which the user views the messages.
 CycleNumberText - display the number of cycles specified by the user.
+SignalListCtrl - shows a filtered list of signal names on demand.
+SignalPickerDialog - lets the user search for and choose signals.
 """
 
 import wx
 import os
-from names import Names
-from devices import Devices
-from network import Network
-from monitors import Monitors
-from scanner import Scanner
-from parse import Parser
 
 _ = wx.GetTranslation
 
@@ -39,6 +35,8 @@ class FileMenu(wx.Menu):
     get_screenshot(self): Get a screenshot of the canvas.
     on_save_trace(self, event): Save a screenshot of the canvas as picture.
     on_save_console(self, event): Save the console output to a text file.
+    on_statistics(self, event): Show statistics about the netlist.
+    on_prune(self, event): Simulate only the logic driving the monitors.
     on_quit(self, event): Quit system.
     """
 
@@ -85,6 +83,27 @@ class FileMenu(wx.Menu):
         self.Bind(wx.EVT_MENU, handler=self.on_save_console,
                   source=saveConsoleItem)
 
+        statisticsItem = wx.MenuItem(
+            parentMenu=self,
+            id=wx.ID_ANY,
+            text=_("Netlist Statistics"),
+            helpString=_("Show the size and structure of the circuit"),
+            kind=wx.ITEM_NORMAL,
+        )
+        self.Append(statisticsItem)
+        self.Bind(wx.EVT_MENU, handler=self.on_statistics,
+                  source=statisticsItem)
+
+        pruneItem = wx.MenuItem(
+            parentMenu=self,
+            id=wx.ID_ANY,
+            text=_("Simulate Monitored Logic Only"),
+            helpString=_("Skip the logic that drives no monitored signal"),
+            kind=wx.ITEM_CHECK,
+        )
+        self.Append(pruneItem)
+        self.Bind(wx.EVT_MENU, handler=self.on_prune, source=pruneItem)
+
         self.AppendSeparator()
 
         # Quit project
@@ -110,64 +129,8 @@ class FileMenu(wx.Menu):
             text = _("Loading")
             text += " {file_name:}.\n".format(file_name=path)
             self.parentFrame.console_box.print_console_message(text)
-            # Clear memories from the previous file
-            self.parentFrame.clear_previous_file()
-            names_instance = Names()
-            scanner_instance = Scanner(
-                path, names_instance, self.parentFrame.scanner_logger
-            )
-            device_instance = Devices(names_instance)
-            network_instance = Network(names_instance, device_instance)
-            monitor_instance = Monitors(
-                names_instance, device_instance, network_instance
-            )
-
-            parser = Parser(
-                names_instance,
-                device_instance,
-                network_instance,
-                monitor_instance,
-                scanner_instance,
-                self.parentFrame.parser_logger,
-            )
-
-            if parser.parse_network():
-                # Set successfully parsed
-                self.parentFrame.is_parsed = True
-                # update names, networks etc modules
-                self.parentFrame.names = parser.names
-                self.parentFrame.network = parser.network
-                self.parentFrame.devices = parser.devices
-                self.parentFrame.monitors = parser.monitors
-
-                # Update canvas objects
-                self.parentFrame.canvas.names = parser.names
-                self.parentFrame.canvas.network = parser.network
-                self.parentFrame.canvas.devices = parser.devices
-                self.parentFrame.canvas.monitors = parser.monitors
-
-                self.parentFrame.get_switch_names()
-                self.parentFrame.get_monitor_names()
-                self.parentFrame.get_inputs_outputs()
-
-            else:
-                self.parentFrame.console_box.print_console_message(
-                    "".join(
-                        (_("File cannot be parsed. Please check your "
-                           "definition file"),
-                         "\n"))
-                )
-                error_list = parser.error_string.split("$")
-                for error in error_list:
-                    self.parentFrame.console_box. \
-                        print_console_message(error + os.linesep)
-                self.parentFrame.console_box.print_console_message(
-                    _("A total of ")
-                    + str(parser.error_count)
-                    + _(" Error(s) in File. Please correct them and"
-                        "try again.")
-                    + "\n"
-                )
+            # Parse in the background; the circuit is replaced when done
+            self.parentFrame.load_file(path)
 
         dialog.Destroy()
 
@@ -231,6 +194,14 @@ class FileMenu(wx.Menu):
         self.parentFrame.console_box.print_console_message(
             "".join((_("Console output successfully saved."), "\n")))
 
+    def on_statistics(self, event):
+        """Show statistics about the netlist in the console."""
+        self.parentFrame.show_statistics()
+
+    def on_prune(self, event):
+        """Simulate only the logic that drives the monitored signals."""
+        self.parentFrame.prune = event.IsChecked()
+
     def on_quit(self, event):
         """Quit the system."""
         self.parentFrame.Close()
@@ -418,3 +389,185 @@ class CycleNumberText(wx.StaticText):
     def configure_style(self):
         """Configure the CSS stylesheet in the element."""
         self.style.apply_rules(self)
+
+
+class SignalListCtrl(wx.ListCtrl):
+    """This class shows a filtered list of signal names on demand.
+
+    The list is virtual: rows are only created for the items on screen, so
+    showing hundreds of thousands of names costs no more than a few dozen.
+
+    Parameters
+    ----------
+    parent: parent window.
+    signal_index: instance of the signal_index.SignalIndex() class.
+    multiple: True if several signals can be chosen.
+
+    Public methods
+    --------------
+    set_positions(self, positions): Show the names at these index positions.
+    OnGetItemText(self, item, column): Return the text of a visible cell.
+    """
+
+    def __init__(self, parent, signal_index, multiple):
+        """Initialise properties."""
+        style = wx.LC_REPORT | wx.LC_VIRTUAL
+        if not multiple:
+            style |= wx.LC_SINGLE_SEL
+        super().__init__(parent, wx.ID_ANY, size=(400, 300), style=style)
+        self.signal_index = signal_index
+        self.multiple = multiple
+        # Index positions of the rows shown and of the chosen signals
+        self.positions = []
+        self.chosen = set()
+
+        if multiple:
+            self.InsertColumn(0, _("Chosen"), width=70)
+        self.InsertColumn(self.GetColumnCount(), _("Signal"), width=320)
+
+    def set_positions(self, positions):
+        """Show the names at these index positions."""
+        self.positions = positions
+        self.SetItemCount(len(positions))
+        self.Refresh()
+
+    def OnGetItemText(self, item, column):
+        """Return the text of a visible cell."""
+        position = self.positions[item]
+        if self.multiple and column == 0:
+            return "X" if position in self.chosen else ""
+        return self.signal_index.get_name(position)
+
+
+class SignalPickerDialog(wx.Dialog):
+    """This class lets the user search for and choose signals.
+
+    Typing in the search box filters the list as the user types. When
+    several signals can be chosen, double clicking a row or pressing Enter
+    toggles it, and the buttons choose or clear every row shown.
+
+    Parameters
+    ----------
+    parent: parent window.
+    message: message shown above the search box.
+    title: title of the dialog.
+    signal_index: instance of the signal_index.SignalIndex() class.
+    multiple: True if several signals can be chosen.
+
+    Public methods
+    --------------
+    on_search(self, event): Filter the list by the search text.
+    on_item_activated(self, event): Toggle the signal that was activated.
+    on_choose_shown(self, event): Choose every signal shown.
+    on_clear_shown(self, event): Clear every signal shown.
+    update_count(self): Show how many signals are shown and chosen.
+    SetSelections(self, positions): Choose the signals at these positions.
+    GetSelections(self): Return the positions of the chosen signals.
+    GetSelection(self): Return the position of the selected signal.
+    GetStringSelection(self): Return the name of the selected signal.
+    """
+
+    def __init__(self, parent, message, title, signal_index, multiple=True):
+        """Initialise the search box, list and buttons."""
+        super().__init__(parent, wx.ID_ANY, title,
+                         style=wx.DEFAULT_DIALOG_STYLE | wx.RESIZE_BORDER)
+        self.signal_index = signal_index
+        self.multiple = multiple
+
+        self.search_box = wx.SearchCtrl(self, wx.ID_ANY,
+                                        style=wx.TE_PROCESS_ENTER)
+        self.search_box.ShowCancelButton(True)
+        self.signal_list = SignalListCtrl(self, signal_index, multiple)
+        self.count_text = wx.StaticText(self, wx.ID_ANY, "")
+
+        sizer = wx.BoxSizer(wx.VERTICAL)
+        sizer.Add(wx.StaticText(self, wx.ID_ANY, message), 0, wx.ALL, 5)
+        sizer.Add(self.search_box, 0, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(self.signal_list, 1, wx.EXPAND | wx.ALL, 5)
+        sizer.Add(self.count_text, 0, wx.ALL, 5)
+        if multiple:
+            choose_button = wx.Button(self, wx.ID_ANY, _("Choose Shown"))
+            clear_button = wx.Button(self, wx.ID_ANY, _("Clear Shown"))
+            button_sizer = wx.BoxSizer(wx.HORIZONTAL)
+            button_sizer.Add(choose_button, 0, wx.ALL, 5)
+            button_sizer.Add(clear_button, 0, wx.ALL, 5)
+            sizer.Add(button_sizer, 0)
+            choose_button.Bind(wx.EVT_BUTTON, self.on_choose_shown)
+            clear_button.Bind(wx.EVT_BUTTON, self.on_clear_shown)
+            self.signal_list.Bind(wx.EVT_LIST_ITEM_ACTIVATED,
+                                  self.on_item_activated)
+        else:
+            self.signal_list.Bind(wx.EVT_LIST_ITEM_ACTIVATED,
+                                  lambda event: self.EndModal(wx.ID_OK))
+        sizer.Add(self.CreateButtonSizer(wx.OK | wx.CANCEL), 0,
+                  wx.EXPAND | wx.ALL, 5)
+        self.SetSizerAndFit(sizer)
+
+        self.search_box.Bind(wx.EVT_TEXT, self.on_search)
+        self.search_box.Bind(wx.EVT_SEARCHCTRL_CANCEL_BTN,
+                             lambda event: self.search_box.SetValue(""))
+        self.signal_list.set_positions(signal_index.search(""))
+        self.update_count()
+        self.search_box.SetFocus()
+
+    def on_search(self, event):
+        """Filter the list by the search text."""
+        text = self.search_box.GetValue()
+        self.signal_list.set_positions(self.signal_index.search(text))
+        self.update_count()
+
+    def on_item_activated(self, event):
+        """Toggle the signal that was activated."""
+        item = event.GetIndex()
+        position = self.signal_list.positions[item]
+        if position in self.signal_list.chosen:
+            self.signal_list.chosen.remove(position)
+        else:
+            self.signal_list.chosen.add(position)
+        self.signal_list.RefreshItem(item)
+        self.update_count()
+
+    def on_choose_shown(self, event):
+        """Choose every signal shown."""
+        self.signal_list.chosen.update(self.signal_list.positions)
+        self.signal_list.Refresh()
+        self.update_count()
+
+    def on_clear_shown(self, event):
+        """Clear every signal shown."""
+        self.signal_list.chosen.difference_update(self.signal_list.positions)
+        self.signal_list.Refresh()
+        self.update_count()
+
+    def update_count(self):
+        """Show how many signals are shown and chosen."""
+        text = "".join([str(len(self.signal_list.positions)), " / ",
+                        str(len(self.signal_index)), _(" shown")])
+        if self.multiple:
+            text = "".join([text, ", ", str(len(self.signal_list.chosen)),
+                            _(" chosen")])
+        self.count_text.SetLabel(text)
+
+    def SetSelections(self, positions):
+        """Choose the signals at these positions."""
+        self.signal_list.chosen = set(positions)
+        self.signal_list.Refresh()
+        self.update_count()
+
+    def GetSelections(self):
+        """Return the positions of the chosen signals in index order."""
+        return sorted(self.signal_list.chosen)
+
+    def GetSelection(self):
+        """Return the position of the selected signal, or wx.NOT_FOUND."""
+        item = self.signal_list.GetFirstSelected()
+        if item == -1:
+            return wx.NOT_FOUND
+        return self.signal_list.positions[item]
+
+    def GetStringSelection(self):
+        """Return the name of the selected signal, or an empty string."""
+        position = self.GetSelection()
+        if position == wx.NOT_FOUND:
+            return ""
+        return self.signal_index.get_name(position)
@@ -5,6 +5,8 @@ Classes:
 MyGLCanvas - handles all canvas drawing operations.
 """
 
+import bisect
+
 import wx
 import wx.glcanvas as wxcanvas
 from OpenGL import GL, GLUT
@@ -32,7 +34,10 @@ class MyGLCanvas(wxcanvas.GLCanvas):
     on_mouse(self, event): Handles mouse events.
     render_text(self, text, x_pos, y_pos): Handles text drawing
                                            operations.
-    draw_grid(self, spin_value): Draw grid axes on the displayed signals.
+    draw_grid(self, spin_value, first_cycle=0): Draw grid axes on the
+                                        displayed signals.
+    update_trace_cache(self): Add newly recorded samples to the render cache.
+    clear_trace_cache(self): Forget all cached signal traces.
     draw_signal(self): Draw signals chosen.
     """
 
@@ -103,6 +108,11 @@ class MyGLCanvas(wxcanvas.GLCanvas):
         self.monitored_signal_list = []
         # Cycles already run in total
         self.cycles_completed = cycles_completed
+        # Only the newest cycles are drawn when more have been run
+        self.max_display_cycles = 1000
+        # trace_cache stores {(device_id, output_id): [signal_list,
+        # samples_processed, change_cycles, change_levels]}
+        self.trace_cache = {}
 
         # Bind events to the canvas
         self.Bind(wx.EVT_PAINT, self.on_paint)
@@ -264,8 +274,12 @@ class MyGLCanvas(wxcanvas.GLCanvas):
             else:
                 GLUT.glutBitmapCharacter(font, ord(character))
 
-    def draw_grid(self, spin_value):
-        """Draw grid axes on the displayed signals."""
+    def draw_grid(self, spin_value, first_cycle=0):
+        """Draw grid axes on the displayed signals.
+
+        spin_value is the number of cycles displayed and first_cycle is the
+        number of the first cycle shown.
+        """
         # Period of cycles
         cycle_period = spin_value // (self.num_period_display - 1)
 
@@ -335,9 +349,9 @@ class MyGLCanvas(wxcanvas.GLCanvas):
             GL.glRasterPos2f(x_pos, y_pos)
             font = self.small_font
             if spin_value <= 10:
-                label = str(i)
+                label = str(first_cycle + i)
             else:
-                label = str(tick_list[i])
+                label = str(first_cycle + tick_list[i])
             for character in label:
                 GLUT.glutBitmapCharacter(font, ord(character))
 
@@ -447,12 +461,61 @@ class MyGLCanvas(wxcanvas.GLCanvas):
         for character in text:
             GLUT.glutBitmapCharacter(font, ord(character))
 
+    def update_trace_cache(self):
+        """Add newly recorded samples to the render cache of each monitor.
+
+        The cache stores, for every monitor, the cycles at which its signal
+        changes and the level it changes to. Only the samples recorded since
+        the last call are processed, so redrawing during a long run costs time
+        proportional to the new samples rather than the whole trace.
+        """
+        for monitor_name in self.monitored_signal_list:
+            key = tuple(self.devices.get_signal_ids(monitor_name))
+            signal_list = self.monitors.monitors_dictionary.get(key)
+            if signal_list is None:
+                continue
+            entry = self.trace_cache.get(key)
+            # Start again if the monitor was reset since the last update
+            if entry is None or entry[0] is not signal_list \
+                    or entry[1] > len(signal_list):
+                entry = [signal_list, 0, [], []]
+                self.trace_cache[key] = entry
+            [start, change_cycles, change_levels] = entry[1:]
+            end = len(signal_list)
+            last_level = change_levels[-1] if change_levels else None
+            for index in range(start, end):
+                level = signal_list[index]
+                if level != last_level:
+                    change_cycles.append(index)
+                    change_levels.append(level)
+                    last_level = level
+            entry[1] = end
+
+    def clear_trace_cache(self):
+        """Forget all cached signal traces."""
+        self.trace_cache = {}
+
     def draw_signal(self):
-        """Draw signal traces for each monitor."""
-        self.draw_grid(spin_value=self.cycles_completed)
+        """Draw signal traces for each monitor.
+
+        Only the most recent max_display_cycles cycles are shown, so the view
+        scrolls to follow the newest cycles during a long run.
+        """
+        self.update_trace_cache()
+        display_cycles = min(self.cycles_completed, self.max_display_cycles)
+        first_cycle = self.cycles_completed - display_cycles
+        self.draw_grid(spin_value=display_cycles, first_cycle=first_cycle)
         # e.g. if cycles period is 2, the label goes 0, 2, 4, ...
-        cycle_period = self.cycles_completed \
-            // (self.num_period_display - 1)
+        cycle_period = display_cycles // (self.num_period_display - 1)
+        # Squeeze cycles together if too many cycles chosen
+        if display_cycles <= 10:
+            cycle_width = self.signal_cycle_width
+        elif display_cycles < 20:
+            cycle_width = self.signal_cycle_width / 2
+        else:
+            cycle_width = self.signal_cycle_width / cycle_period
+        x_origin = (self.canvas_origin[0] + self.x_axis_offset
+                    + self.y_axis_offset)
         # Draw signals one on top of another.
         if self.cycles_completed > 0:
             # Draw all signals selected
@@ -479,11 +542,13 @@ class MyGLCanvas(wxcanvas.GLCanvas):
                 GL.glRasterPos2f(x_pos_y_label, y_pos_y_label)
                 for character in text:
                     GLUT.glutBitmapCharacter(font, ord(character))
-                # Find signal list for each monitor
-                [device_id, output_id] = \
-                    self.devices.get_signal_ids(monitor_name)
-                signal_list = \
-                    self.monitors.monitors_dictionary[(device_id, output_id)]
+                # Find the cached trace for each monitor
+                key = tuple(self.devices.get_signal_ids(monitor_name))
+                if key not in self.trace_cache:
+                    continue
+                [recorded, change_cycles, change_levels] = \
+                    self.trace_cache[key][1:]
+                last_cycle = min(recorded, self.cycles_completed)
 
                 # Signal trace depends on the signal count
                 if count % 3 == 1:
@@ -516,81 +581,38 @@ class MyGLCanvas(wxcanvas.GLCanvas):
                     + self.tick_width / 2
                     + self.label_width
                 )
-
-                # Draw signal trace
-                for index in range(len(signal_list)):
-                    indiv_signal = signal_list[index]
-                    # Horizontal start point of signal
-                    if self.cycles_completed <= 10:
-                        normal_cycle_width = self.signal_cycle_width
-                        x_start = (
-                            (index * normal_cycle_width)
-                            + self.canvas_origin[0]
-                            + self.x_axis_offset
-                            + self.y_axis_offset
-                        )
-                        x_end = x_start + normal_cycle_width
-
-                        # If signal is high
-                        if indiv_signal == self.devices.HIGH:
-                            # Add offset to y
-                            y = (
-                                self.canvas_origin[1]
-                                + self.x_axis_offset
-                                + self.y_grid_offset_lower
-                                + self.signal_height
-                                + offset
-                            )
-                            GL.glVertex2f(x_start, y)
-                            GL.glVertex2f(x_end, y)
-                        # If signal is low
-                        elif indiv_signal == self.devices.LOW:
-                            # Add offset to y
-                            y = (
-                                self.canvas_origin[1]
-                                + self.x_axis_offset
-                                + self.y_grid_offset_lower
-                                + offset
-                            )
-                            GL.glVertex2f(x_start, y)
-                            GL.glVertex2f(x_end, y)
+                y_low = (
+                    self.canvas_origin[1]
+                    + self.x_axis_offset
+                    + self.y_grid_offset_lower
+                    + offset
+                )
+                y_high = y_low + self.signal_height
+
+                # Draw one line per constant run of the visible trace
+                index = max(bisect.bisect_right(change_cycles,
+                                                first_cycle) - 1, 0)
+                while index < len(change_cycles) \
+                        and change_cycles[index] < last_cycle:
+                    run_start = max(change_cycles[index], first_cycle)
+                    if index + 1 < len(change_cycles):
+                        run_end = min(change_cycles[index + 1], last_cycle)
+                    else:
+                        run_end = last_cycle
+                    x_start = x_origin + (run_start - first_cycle) \
+                        * cycle_width
+                    x_end = x_origin + (run_end - first_cycle) * cycle_width
+                    level = change_levels[index]
+                    if level == self.devices.HIGH:
+                        GL.glVertex2f(x_start, y_high)
+                        GL.glVertex2f(x_end, y_high)
+                    elif level == self.devices.LOW:
+                        GL.glVertex2f(x_start, y_low)
+                        GL.glVertex2f(x_end, y_low)
                     else:
-                        # Squeeze cycles together if too many cycles chosen
-                        if 10 <= self.cycles_completed < 20:
-                            short_cycle_width = self.signal_cycle_width / 2
-                        else:
-                            short_cycle_width = self.signal_cycle_width \
-                                                / cycle_period
-                        x_start = (
-                            (index * short_cycle_width)
-                            + self.canvas_origin[0]
-                            + self.x_axis_offset
-                            + self.y_axis_offset
-                        )
-                        x_end = x_start + short_cycle_width
-
-                        # If signal is high
-                        if indiv_signal == self.devices.HIGH:
-                            # Add offset to y
-                            y = (
-                                self.canvas_origin[1]
-                                + self.x_axis_offset
-                                + self.y_grid_offset_lower
-                                + self.signal_height
-                                + offset
-                            )
-                            GL.glVertex2f(x_start, y)
-                            GL.glVertex2f(x_end, y)
-                        # If signal is low
-                        if indiv_signal == self.devices.LOW:
-                            # Add offset to y
-                            y = (
-                                self.canvas_origin[1]
-                                + self.x_axis_offset
-                                + self.y_grid_offset_lower
-                                + offset
-                            )
-                            GL.glVertex2f(x_start, y)
-                            GL.glVertex2f(x_end, y)
+                        # Leave a gap where the signal was not recorded
+                        GL.glEnd()
+                        GL.glBegin(GL.GL_LINE_STRIP)
+                    index += 1
 
                 GL.glEnd()
@@ -8,11 +8,16 @@ Classes:
 Gui - configures the main window and all the widgets.
 """
 import wx
+import os
 import logging
 
+from analysis import NetlistAnalysis
 from gl_canvas import MyGLCanvas
+from simulator import Simulator, SimulationWorker
+from file_loader import LoaderWorker
 from frame_elements import FileMenu, HelpMenu, AboutMenu, \
-    ConsoleBox, CycleNumberText
+    ConsoleBox, CycleNumberText, SignalPickerDialog
+from signal_index import SignalIndex
 
 _ = wx.GetTranslation
 
@@ -37,11 +42,57 @@ class Gui(wx.Frame):
     check_cycle(self): Check whether the number of cycles is sensible
                             to be run.
 
-    run_network(self, cycles): Check whether the cycle is successfully run.
+    run_network(self, cycles, on_complete): Start running the network in a
+                            background worker.
+
+    is_running(self): Return True if a simulation is in progress.
+
+    set_running(self, running): Enable or disable the widgets that must not
+                            be used while a simulation is in progress.
+
+    on_simulation_progress(self, cycles_run): Store the progress of the
+                            simulation in progress.
+
+    on_redraw_timer(self, event): Redraw the progress gauge and the canvas at
+                            a fixed frame rate while a simulation runs.
+
+    on_simulation_finish(self, worker, cycles_run, oscillating, cancelled):
+                            Handle the end of a simulation run.
+
+    cancel_simulation(self): Stop the simulation in progress, if any.
+
+    load_file(self, path): Start loading a definition file in a background
+                            worker.
+
+    is_loading(self): Return True if a definition file is being loaded.
+
+    on_load_progress(self, loader, characters_read, total_characters,
+                     statements_parsed): Show the progress of the load.
+
+    on_load_finish(self, loader, parser, success, cancelled): Handle the end
+                            of a load.
+
+    load_circuit(self, parser): Use the circuit built by the parser.
+
+    cancel_load(self): Stop the load in progress, if any.
+
+    on_cancel_button(self, event): Event handler for when the user clicks
+                            the cancel button.
+
+    on_close(self, event): Event handler for when the window is closed.
+
+    start_run(self): Run the simulation from scratch, only simulating the
+                            logic that drives the monitors if prune is set.
+
+    on_run_complete(self, cycles_run): Report a completed run.
+
+    on_continue_complete(self, cycles_run): Report a completed continuation.
 
     on_run_button(self, spin_value): Event handler for when the user clicks
                             the run button.
 
+    show_statistics(self): Print the netlist statistics to the console.
+
     on_clear_console_button(self): Event handler for when the user clicks
                             the clear console button.
 
@@ -140,15 +191,43 @@ class Gui(wx.Frame):
         # All inputs and outputs in the network
         self.input_list = []
         self.output_list = []
+        # Search indexes for the signal picker dialogs
+        self.monitor_index = SignalIndex([])
+        self.switch_index = SignalIndex([])
+        self.input_index = SignalIndex([])
+        self.output_index = SignalIndex([])
 
         # Temporarily set file to be not parsed
         self.is_parsed = False
+        # Set to simulate only the logic that drives the monitored signals.
+        # Monitors added later bring their own logic in.
+        self.prune = False
         self.cycle_ok = False
 
         # Configure initial parameters
         # Set default spin value
         self.spin_value = 10
         self.cycles_completed = 0
+        # Largest number of cycles that can be run at once
+        self.max_cycles = 100000000
+        # Runs longer than this ask the user for confirmation
+        self.cycle_warning_limit = 1000000
+
+        # Background simulation state
+        self.worker = None
+        # Cycles completed before the run in progress started
+        self.run_start_cycles = 0
+        self.run_cycles = 0
+        self.run_complete_handler = None
+        self.gauge_range = 1000
+        # Progress written by the worker and the progress last drawn
+        self.latest_cycles_run = 0
+        self.drawn_cycles_run = 0
+        # Redraws per second while a simulation is in progress
+        self.frame_rate = 30
+        self.redraw_timer = wx.Timer(self)
+        # Background definition file loader
+        self.loader = None
 
         # Canvas for drawing signals; Input the spin value here
         self.canvas = MyGLCanvas(
@@ -193,13 +272,18 @@ class Gui(wx.Frame):
             str(self.spin_value),
             style=wx.SP_ARROW_KEYS,
             min=0,
-            max=1000,
+            max=self.max_cycles,
         )
         self.run_button = wx.Button(self, wx.ID_ANY, _("Run"))
         self.continue_button = wx.Button(self, wx.ID_ANY, _("Continue"))
         self.rerun_button = wx.Button(self, wx.ID_ANY, _("Rerun"))
         self.clear_console_button = \
             wx.Button(self, wx.ID_ANY, _("Clear Console"))
+        # Progress of the simulation in progress
+        self.gauge = wx.Gauge(self, wx.ID_ANY, range=self.gauge_range,
+                              style=wx.GA_HORIZONTAL | wx.GA_SMOOTH)
+        self.cancel_button = wx.Button(self, wx.ID_ANY, _("Cancel"))
+        self.cancel_button.Disable()
         # Monitor and Switch Buttons
         self.monitor_button = wx.Button(self, wx.ID_ANY, _("Choose Monitor"))
         self.switch_button = wx.Button(self, wx.ID_ANY, _("Choose Switch"))
@@ -213,6 +297,7 @@ class Gui(wx.Frame):
         self.rerun_button.SetFont(self.run_font)
         self.continue_button.SetFont(self.run_font)
         self.clear_console_button.SetFont(self.run_font)
+        self.cancel_button.SetFont(self.run_font)
         self.monitor_button.SetFont(self.monitor_font)
         self.switch_button.SetFont(self.monitor_font)
         self.make_connection_button.SetFont(self.run_font)
@@ -225,6 +310,9 @@ class Gui(wx.Frame):
         self.clear_console_button.Bind(wx.EVT_BUTTON,
                                        self.on_clear_console_button)
         self.continue_button.Bind(wx.EVT_BUTTON, self.on_continue_button)
+        self.cancel_button.Bind(wx.EVT_BUTTON, self.on_cancel_button)
+        self.Bind(wx.EVT_CLOSE, self.on_close)
+        self.Bind(wx.EVT_TIMER, self.on_redraw_timer, self.redraw_timer)
         self.monitor_button.Bind(wx.EVT_BUTTON, self.on_monitor_button)
         self.switch_button.Bind(wx.EVT_BUTTON, self.on_switch_button)
         # Make and remove connections
@@ -249,6 +337,7 @@ class Gui(wx.Frame):
         simulation_action_sizer = wx.BoxSizer(wx.VERTICAL)
         simulation_action_sizer_1 = wx.BoxSizer(wx.HORIZONTAL)
         simulation_action_sizer_2 = wx.BoxSizer(wx.HORIZONTAL)
+        simulation_progress_sizer = wx.BoxSizer(wx.HORIZONTAL)
         function_sizer = wx.StaticBoxSizer(wx.VERTICAL, self)
         connection_sizer = wx.BoxSizer(wx.HORIZONTAL)
 
@@ -279,6 +368,12 @@ class Gui(wx.Frame):
                              wx.ALL | wx.EXPAND, 5)
         simulation_sizer.Add(simulation_action_sizer, 5,
                              wx.ALL | wx.EXPAND, 5)
+        simulation_progress_sizer.Add(self.gauge, 2,
+                                      wx.ALIGN_CENTER_VERTICAL | wx.ALL, 3)
+        simulation_progress_sizer.Add(self.cancel_button, 1,
+                                      wx.LEFT | wx.RIGHT, 3)
+        simulation_sizer.Add(simulation_progress_sizer, 2,
+                             wx.ALL | wx.EXPAND, 5)
 
         function_sizer.Add(self.monitor_button, 5,
                            wx.EXPAND | wx.TOP | wx.BOTTOM, 5)
@@ -318,47 +413,294 @@ class Gui(wx.Frame):
 
     def check_cycle(self):
         """Check whether the number of cycles set to run is sensible."""
-        # Warning if too many cycles set
-        if self.spin_value >= 1000:
+        # Very long runs take a lot of memory to record, so ask first
+        if self.spin_value > self.cycle_warning_limit:
             dlg = wx.MessageDialog(
                 self,
-                _("More than 1000 cycles set to be run. "
-                  "Please change to a lower value of runs."),
-                _("Warning"),
-                wx.OK | wx.ICON_WARNING,
-            )
-            dlg.ShowModal()
-            dlg.Destroy()
-            self.cycle_ok = False
-        # Warning if running more than 100 cycles
-        elif 100 < self.spin_value < 1000:
-            dlg = wx.MessageDialog(
-                self,
-                _("More than 100 cycles set to be run! Are you sure you"
-                  " want to continue?"),
+                _("More than {} cycles set to be run! Are you sure you want"
+                  " to continue?").format(self.cycle_warning_limit),
                 _("Warning"),
                 wx.YES_NO | wx.ICON_QUESTION,
             )
-            dlg.ShowModal()
-            if dlg.ShowModal() == wx.ID_YES:
-                self.cycle_ok = True
+            self.cycle_ok = dlg.ShowModal() == wx.ID_YES
             dlg.Destroy()
         else:
             self.cycle_ok = True
 
-    def run_network(self, cycles):
-        """Run the network for the specified number of simulation cycles.
+    def run_network(self, cycles, on_complete):
+        """Start running the network for the specified number of cycles.
 
-        Return True if successfully run.
+        The simulation runs in a background worker so that the window stays
+        responsive. on_complete(cycles_run) is called on the main thread once
+        the run has ended without the network oscillating.
         """
-        for i in range(cycles):
-            if self.network.execute_network():
-                self.monitors.record_signals()
-            else:
-                text = "".join((_("Error! Network oscillating."), "\n"))
+        self.run_start_cycles = self.cycles_completed
+        self.run_cycles = cycles
+        self.run_complete_handler = on_complete
+        self.latest_cycles_run = 0
+        self.drawn_cycles_run = 0
+        self.gauge.SetValue(0)
+        self.set_running(True)
+
+        simulator = Simulator(self.network, self.monitors,
+                              progress_interval=0.5 / self.frame_rate)
+        # The worker is passed back so that a late callback from a worker
+        # that was cancelled is ignored
+        worker = SimulationWorker(
+            simulator,
+            cycles,
+            progress_callback=self.on_simulation_progress,
+            finish_callback=lambda done, oscillating, cancelled: wx.CallAfter(
+                self.on_simulation_finish, worker, done, oscillating,
+                cancelled),
+        )
+        self.worker = worker
+        worker.start()
+        self.redraw_timer.Start(1000 // self.frame_rate)
+
+    def is_running(self):
+        """Return True if a simulation is in progress."""
+        return self.worker is not None and self.worker.is_alive()
+
+    def set_running(self, running):
+        """Enable or disable the widgets while a simulation runs.
+
+        The cancel button stays enabled while a file is being loaded.
+        """
+        for widget in [self.run_button, self.continue_button,
+                       self.rerun_button, self.spin, self.monitor_button,
+                       self.switch_button, self.make_connection_button,
+                       self.remove_connection_button]:
+            widget.Enable(not running)
+        self.cancel_button.Enable(running or self.is_loading())
+
+    def on_simulation_progress(self, cycles_run):
+        """Store the progress of the simulation in progress.
+
+        Called from the worker thread, so only records the cycles completed.
+        The redraw timer picks the value up at a fixed frame rate.
+        """
+        self.latest_cycles_run = cycles_run
+
+    def on_redraw_timer(self, event):
+        """Redraw the canvas with the cycles completed since the last frame."""
+        cycles_run = self.latest_cycles_run
+        if cycles_run == self.drawn_cycles_run:
+            return
+        self.drawn_cycles_run = cycles_run
+        if self.run_cycles > 0:
+            self.gauge.SetValue(
+                self.gauge_range * cycles_run // self.run_cycles)
+        # Only the samples added since the last frame need processing
+        self.canvas.cycles_completed = self.run_start_cycles + cycles_run
+        self.canvas.Refresh()
+
+    def on_simulation_finish(self, worker, cycles_run, oscillating,
+                             cancelled):
+        """Handle the end of a simulation run.
+
+        Nothing is done if the window has been destroyed or the worker has
+        been cancelled by cancel_simulation since.
+        """
+        if not self or worker is not self.worker:
+            return
+        self.redraw_timer.Stop()
+        self.worker = None
+        self.set_running(False)
+        self.gauge.SetValue(self.gauge_range)
+        if cancelled:
+            text = "".join((_("Simulation cancelled after "), str(cycles_run),
+                            _(" cycles."), "\n"))
+            self.console_box.print_console_message(text)
+        # The cycles recorded before an oscillation are kept and shown
+        self.cycles_completed = self.run_start_cycles + cycles_run
+        if oscillating:
+            text = "".join((_("Error! Network oscillating."), "\n"))
+            self.console_box.print_console_message(text)
+            for loop_names in self.network.get_oscillating_loop_names():
+                text = "".join((_("Oscillating loop: "),
+                                ", ".join(loop_names), "\n"))
                 self.console_box.print_console_message(text)
-                return False
-        return True
+        else:
+            self.run_complete_handler(cycles_run)
+        self.canvas.cycles_completed = self.cycles_completed
+        self.canvas.Refresh()
+
+    def cancel_simulation(self):
+        """Stop the simulation in progress and wait for the worker.
+
+        The end of the run is not reported, as its callback is ignored.
+        """
+        if self.is_running():
+            self.worker.cancel()
+            self.worker.join()
+        if self.worker is not None:
+            self.worker = None
+            self.redraw_timer.Stop()
+            self.set_running(False)
+
+    def load_file(self, path):
+        """Start loading the definition file at path.
+
+        The file is scanned and parsed in a background worker so that the
+        window stays responsive and the load can be cancelled. The current
+        circuit can still be simulated and edited meanwhile, and is only
+        replaced once the new file has been parsed.
+        """
+        self.cancel_load()
+        if not self.is_running():
+            self.gauge.SetValue(0)
+        # The loader is passed back so that late callbacks from a loader
+        # that was cancelled are ignored
+        loader = LoaderWorker(
+            path,
+            self.scanner_logger,
+            self.parser_logger,
+            progress_callback=lambda read, total, statements: wx.CallAfter(
+                self.on_load_progress, loader, read, total, statements),
+            finish_callback=lambda parser, success, cancelled: wx.CallAfter(
+                self.on_load_finish, loader, parser, success, cancelled),
+        )
+        self.loader = loader
+        loader.start()
+        self.cancel_button.Enable(True)
+
+    def is_loading(self):
+        """Return True if a definition file is being loaded."""
+        return self.loader is not None and self.loader.is_alive()
+
+    def on_load_progress(self, loader, characters_read, total_characters,
+                         statements_parsed):
+        """Show the progress of the load in the gauge and on the canvas.
+
+        A simulation in progress keeps the gauge and canvas to itself.
+        """
+        if not self or loader is not self.loader or self.is_running():
+            return
+        if total_characters > 0:
+            self.gauge.SetValue(min(
+                self.gauge_range * characters_read // total_characters,
+                self.gauge_range))
+        text = "".join([_("Loading: "), str(characters_read), " / ",
+                        str(total_characters), _(" characters, "),
+                        str(statements_parsed), _(" statements parsed")])
+        self.canvas.render(text)
+
+    def on_load_finish(self, loader, parser, success, cancelled):
+        """Handle the end of a load.
+
+        Nothing is done if the window has been destroyed or another load
+        has been started since. A simulation of the current circuit is
+        stopped before the new circuit replaces it.
+        """
+        if not self or loader is not self.loader:
+            return
+        self.loader = None
+        self.cancel_button.Enable(self.is_running())
+        if not self.is_running():
+            self.gauge.SetValue(self.gauge_range)
+        if cancelled:
+            text = "".join((_("Loading cancelled."), "\n"))
+            self.console_box.print_console_message(text)
+        elif success:
+            self.cancel_simulation()
+            self.gauge.SetValue(self.gauge_range)
+            self.load_circuit(parser)
+        else:
+            self.console_box.print_console_message(
+                "".join(
+                    (_("File cannot be parsed. Please check your "
+                       "definition file"),
+                     "\n"))
+            )
+            error_list = parser.error_string.split("$")
+            for error in error_list:
+                self.console_box.print_console_message(error + os.linesep)
+            self.console_box.print_console_message(
+                _("A total of ")
+                + str(parser.error_count)
+                + _(" Error(s) in File. Please correct them and"
+                    "try again.")
+                + "\n"
+            )
+
+    def load_circuit(self, parser):
+        """Replace the current circuit with the one built by the parser."""
+        # Clear memories from the previous file
+        self.clear_previous_file()
+        # Set successfully parsed
+        self.is_parsed = True
+        # update names, networks etc modules
+        self.names = parser.names
+        self.network = parser.network
+        self.devices = parser.devices
+        self.monitors = parser.monitors
+
+        # Update canvas objects
+        self.canvas.names = parser.names
+        self.canvas.network = parser.network
+        self.canvas.devices = parser.devices
+        self.canvas.monitors = parser.monitors
+
+        self.get_switch_names()
+        self.get_monitor_names()
+        self.get_inputs_outputs()
+        self.canvas.Refresh()
+
+    def cancel_load(self):
+        """Stop the load in progress and wait for the worker."""
+        if self.is_loading():
+            self.loader.cancel()
+            self.loader.join()
+        # Any callback the loader queued is ignored
+        self.loader = None
+        self.cancel_button.Enable(self.is_running())
+
+    def on_cancel_button(self, event):
+        """Handle the event when the user clicks the cancel button."""
+        if self.is_loading():
+            self.loader.cancel()
+        elif self.is_running():
+            self.worker.cancel()
+
+    def on_close(self, event):
+        """Stop the simulation and any load before the window is closed."""
+        self.cancel_load()
+        self.cancel_simulation()
+        event.Skip()
+
+    def start_run(self):
+        """Run the simulation from scratch."""
+        # Reset the number of cycles
+        self.cycles_completed = 0
+        self.monitors.reset_monitors()
+        self.devices.cold_startup()
+        if self.prune:
+            self.monitors.prune_network()
+        else:
+            self.network.set_cone(None)
+        self.canvas.monitored_signal_list = self.monitored_list
+        self.run_network(self.spin_value, self.on_run_complete)
+
+    def on_run_complete(self, cycles_run):
+        """Report a completed run."""
+        text = "".join([_("Running for "), str(cycles_run), _(" cycles."),
+                        "\n"])
+        self.console_box.print_console_message(text)
+
+    def on_continue_complete(self, cycles_run):
+        """Report a completed continuation."""
+        text = "".join(
+            [
+                _("Continuing for "),
+                str(cycles_run),
+                _(" cycles,"),
+                _(" a total of "),
+                str(self.cycles_completed),
+                _(" cycles run."), "\n",
+            ]
+        )
+        self.console_box.print_console_message(text)
 
     def on_run_button(self, event):
         """Handle the event when the user clicks the run button."""
@@ -366,19 +708,7 @@ class Gui(wx.Frame):
         self.check_cycle()
         if self.cycle_ok:
             if self.is_parsed:
-                # Reset the number of cycles
-                self.cycles_completed = 0
-                self.monitors.reset_monitors()
-                self.devices.cold_startup()
-                # If successfully run
-                if self.run_network(self.spin_value):
-                    self.cycles_completed += self.spin_value
-                    self.canvas.monitored_signal_list = self.monitored_list
-                    # Update cycles run
-                    self.canvas.cycles_completed = self.cycles_completed
-                    text = "".join([_("Running for "),
-                                    str(self.spin_value), _(" cycles."), "\n"])
-                    self.console_box.print_console_message(text)
+                self.start_run()
             else:
                 # Show error if file was not parsed correctly
                 text = "".join((_("Cannot run simulation. Please check your "
@@ -395,27 +725,12 @@ class Gui(wx.Frame):
                     # If no previous cycles have run
                     if self.cycles_completed == 0:
                         self.console_box.print_console_message(
-                            _("Error! No previous simulation. "),
-                            "".join((_("Please run first."), "\n"))
+                            "".join((_("Error! No previous simulation. "),
+                                     _("Please run first."), "\n"))
                         )
-                    # If the network is successfully run.
-                    elif self.run_network(cycles=self.spin_value):
-                        self.cycles_completed += self.spin_value
-                        # Update canvas cycles
-                        self.canvas.cycles_completed = self.cycles_completed
-                        text = "".join(
-                            [
-                                _("Continuing for "),
-                                str(self.spin_value),
-                                _(" cycles,"),
-                                _(" a total of "),
-                                str(self.cycles_completed),
-                                _(" cycles run."), "\n",
-                            ]
-                        )
-                        self.console_box.print_console_message(text)
-                        # Update canvas information
-                        # Add to the number of cycles run
+                    else:
+                        self.run_network(self.spin_value,
+                                         self.on_continue_complete)
 
             else:
                 # Show error if file was not parsed correctly
@@ -425,6 +740,17 @@ class Gui(wx.Frame):
                 ))
                 self.console_box.print_console_message(text)
 
+    def show_statistics(self):
+        """Print statistics about the current netlist to the console."""
+        if not self.is_parsed:
+            text = "".join((_("Cannot analyse the circuit. Please check "
+                              "your definition file."), "\n"))
+            self.console_box.print_console_message(text)
+            return
+        analysis = NetlistAnalysis(self.devices, self.network)
+        text = "".join(("\n".join(analysis.get_report()), "\n"))
+        self.console_box.print_console_message(text)
+
     def on_clear_console_button(self, event):
         """Clear the entire console output."""
         self.console_box.clear_console()
@@ -440,7 +766,7 @@ class Gui(wx.Frame):
                 self.canvas.cycles_completed = self.cycles_completed
                 # Reset console to be clear
                 self.console_box.clear_console()
-                self.on_run_button(None)
+                self.start_run()
             else:
                 text = "".join((
                     _("Cannot rerun simulation. Please check "),
@@ -456,13 +782,15 @@ class Gui(wx.Frame):
         monitor_names_list :all monitor names.
         """
         # Set monitored and unmonitored lists
-        self.monitored_list = self.monitors.get_signal_names()[0]
-        self.unmonitored_list = self.monitors.get_signal_names()[1]
+        [self.monitored_list, self.unmonitored_list] = \
+            self.monitors.get_signal_names()
         # Append list to get a full list of monitor names
         self.monitor_names_list = self.monitored_list \
             + self.unmonitored_list
+        self.monitor_index = SignalIndex(self.monitor_names_list)
 
         # To get monitor ids
+        self.monitor_id_list = []
         for monitor_name in self.monitor_names_list:
             device_id, output_id = self.devices.get_signal_ids(monitor_name)
             # Append device id, output id to the monitor id list
@@ -473,16 +801,15 @@ class Gui(wx.Frame):
         if self.is_parsed:
             # Renew the names for monitors
             self.get_monitor_names()
-            dlg = wx.MultiChoiceDialog(
+            dlg = SignalPickerDialog(
                 self,
                 _("Choose the Signals You Wish to Monitor"),
                 _("Monitored Signals"),
-                self.monitor_names_list,
+                self.monitor_index,
             )
-            monitor_on_ids = [self.monitor_names_list.index(j)
-                              for j in self.monitored_list]
-            # Preselet
-            dlg.SetSelections(monitor_on_ids)
+            # Preselect the signals already monitored
+            dlg.SetSelections(
+                self.monitor_index.get_positions(self.monitored_list))
 
             if dlg.ShowModal() == wx.ID_OK:
                 # Return indexes selected by the user
@@ -502,13 +829,14 @@ class Gui(wx.Frame):
         # Make monitored list based on user selections
         new_monitored_list = [self.monitor_names_list[i]
                               for i in selections]
+        already_monitored = set(self.monitored_list)
 
         for monitored_signal in new_monitored_list:
-            # Get device and output ids
-            device_id, output_id = \
-                self.devices.get_signal_ids(monitored_signal)
             # If not already monitored
-            if monitored_signal not in self.monitored_list:
+            if monitored_signal not in already_monitored:
+                # Get device and output ids
+                device_id, output_id = \
+                    self.devices.get_signal_ids(monitored_signal)
                 # Make monitor
                 monitor_error = self.monitors.make_monitor(
                     device_id, output_id, self.cycles_completed
@@ -540,6 +868,8 @@ class Gui(wx.Frame):
         self.switch_name_list = [
             self.names.get_name_string(x) for x in self.switch_id_list
         ]
+        self.switch_index = SignalIndex(self.switch_name_list)
+        self.switch_on_list = []
         for i in range(len(self.switch_id_list)):
             switch_id = self.switch_id_list[i]
             switch_name = self.switch_name_list[i]
@@ -552,15 +882,14 @@ class Gui(wx.Frame):
     def on_switch_button(self, event):
         """Set switch to desired state."""
         if self.is_parsed:
-            dlg = wx.MultiChoiceDialog(
+            dlg = SignalPickerDialog(
                 self,
                 _("Choose the switches to be set to 1"),
                 _("Switch Settings"),
-                self.switch_name_list,
+                self.switch_index,
             )
-            switch_on_ids = [self.switch_name_list.index(j)
-                             for j in self.switch_on_list]
-            dlg.SetSelections(switch_on_ids)
+            dlg.SetSelections(
+                self.switch_index.get_positions(self.switch_on_list))
 
             if dlg.ShowModal() == wx.ID_OK:
                 selections = dlg.GetSelections()
@@ -576,21 +905,19 @@ class Gui(wx.Frame):
 
     def update_switches(self, selections):
         """Update states of the switches in devices and pass into canvas."""
-        # Reset the list of switches on depending on user selection
-        self.switch_on_list = [self.switch_name_list[i] for i in selections]
-        # Unchosen switches in switch_off_list
-        self.switch_off_list = [
-            x for x in self.switch_name_list if x not in self.switch_on_list
-        ]
-        for switch in self.switch_on_list:
-            switch_id = self.names.query(switch)
-            # Set selected switches to be high
-            self.devices.set_switch(switch_id, self.devices.HIGH)
-
-        for switch in self.switch_off_list:
-            switch_id = self.names.query(switch)
-            # Set unselected switches to be low
-            self.devices.set_switch(switch_id, self.devices.LOW)
+        chosen = set(selections)
+        # Reset the lists of switches on and off depending on user selection
+        self.switch_on_list = []
+        self.switch_off_list = []
+        for i, switch_id in enumerate(self.switch_id_list):
+            if i in chosen:
+                # Set selected switches to be high
+                self.devices.set_switch(switch_id, self.devices.HIGH)
+                self.switch_on_list.append(self.switch_name_list[i])
+            else:
+                # Set unselected switches to be low
+                self.devices.set_switch(switch_id, self.devices.LOW)
+                self.switch_off_list.append(self.switch_name_list[i])
 
         # Update devices in the canvas element
         self.canvas.devices = self.devices
@@ -621,6 +948,8 @@ class Gui(wx.Frame):
 
         self.input_list = input_list
         self.output_list = output_list
+        self.input_index = SignalIndex(input_list)
+        self.output_index = SignalIndex(output_list)
 
     def on_make_connection_button(self, event):
         """Make connection between two inputs/outputs."""
@@ -628,11 +957,12 @@ class Gui(wx.Frame):
         chosen_output = None
         if self.is_parsed:
             # Dialog for choosing input
-            input_dlg = wx.SingleChoiceDialog(
+            input_dlg = SignalPickerDialog(
                 self,
                 _("Choose the Input You Wish to Connect"),
                 _("Input of Connection"),
-                self.input_list,
+                self.input_index,
+                multiple=False,
             )
 
             if input_dlg.ShowModal() == wx.ID_OK:
@@ -641,11 +971,12 @@ class Gui(wx.Frame):
                 chosen_input = selected_input
             input_dlg.Destroy()
 
-            output_dlg = wx.SingleChoiceDialog(
+            output_dlg = SignalPickerDialog(
                 self,
                 _("Choose the Output You Wish to Connect"),
                 _("Output of Connection"),
-                self.output_list,
+                self.output_index,
+                multiple=False,
             )
 
             if output_dlg.ShowModal() == wx.ID_OK:
@@ -690,11 +1021,12 @@ class Gui(wx.Frame):
         if self.is_parsed:
             # Dialog for choosing input
             self.get_inputs_outputs()
-            input_dlg = wx.SingleChoiceDialog(
+            input_dlg = SignalPickerDialog(
                 self,
                 _("Choose the Input of the Connection You Wish to Remove"),
                 _("Input of Connection"),
-                self.input_list,
+                self.input_index,
+                multiple=False,
             )
 
             if input_dlg.ShowModal() == wx.ID_OK:
@@ -703,11 +1035,12 @@ class Gui(wx.Frame):
                 chosen_input = selected_input
             input_dlg.Destroy()
 
-            output_dlg = wx.SingleChoiceDialog(
+            output_dlg = SignalPickerDialog(
                 self,
                 _("Choose the Output of the Connection You Wish to Remove"),
                 _("Output of Connection"),
-                self.output_list,
+                self.output_index,
+                multiple=False,
             )
 
             if output_dlg.ShowModal() == wx.ID_OK:
@@ -757,6 +1090,11 @@ class Gui(wx.Frame):
         self.input_list = []
         self.output_list = []
 
+        # Search indexes for the signal picker dialogs
+        self.monitor_index = SignalIndex([])
+        self.switch_index = SignalIndex([])
+        self.input_index = SignalIndex([])
+        self.output_index = SignalIndex([])
         # Set file to be not parsed
         self.is_parsed = False
 
@@ -777,3 +1115,4 @@ class Gui(wx.Frame):
         self.canvas.monitors = None
         self.canvas.monitored_signal_list = []
         self.canvas.cycles_completed = 0
+        self.canvas.clear_trace_cache()
@@ -2,46 +2,239 @@
 """Parse command line options and arguments for the Logic Simulator.
 
 This script parses options and arguments specified on the command line, and
-runs either the command line user interface or the graphical user interface.
+runs either the command line user interface, the graphical user interface,
+prints statistics about the netlist, renders the signal traces of a
+simulation to an image file, or sweeps the configurations of the switches.
 
 Usage
 -----
 Show help: logsim.py -h
-Command line user interface: logsim.py -c <file path>
+Command line user interface:
+    logsim.py [-p] [-m] [-l] [-k <size>] -c <file path>
+Netlist statistics: logsim.py -s <file path>
 Graphical user interface: logsim.py <file path>
+Render traces to a PNG or SVG image:
+    logsim.py -o <image path> [-n <cycles>] [-r <width>x<height>] [-p] [-m]
+              [-l] [-k <size>] [-j <processes> | -t <threads> | -b]
+              <file path>
+Sweep switch configurations:
+    logsim.py (-w <switch names> | -f <configuration file>) [-n <cycles>]
+              [-j <processes>] [-p] [-m] [-l] [-k <size>] <file path>
+
+With -p, only the logic that drives the monitored signals is simulated.
+With -m, gates that duplicate other gates are merged before simulating.
+With -l, small cones of gates are simulated as lookup tables.
+With -k, blocks of gates remember their outputs for up to <size> recent
+inputs.
+With -j, the gates are split between <processes> processes when rendering.
+With -t, each level of gates is split between <threads> threads when
+rendering on a free-threaded Python build.
+With -b, each level of gates is evaluated on bitplanes when rendering.
+With -w, every combination of the comma-separated switches is simulated,
+and with -f, every configuration listed in the file, one per line as
+"sw1=1 sw2=0". The configurations are split between <processes> processes.
 """
 import getopt
 import sys
 import logging
-import wx
-
-from names import Names
-from devices import Devices
-from network import Network
-from monitors import Monitors
-from scanner import Scanner
-from parse import Parser
+
+from analysis import NetlistAnalysis
+from bitsliced_engine import BitslicedEngine
+from partitioned_engine import PartitionedEngine
+from threaded_engine import ThreadedEngine
+from file_loader import load_definition_file
 from userint import UserInterface
-from gui import Gui
-from logic_simulator_app import LogicSimulatorApp
+from simulator import Simulator
+from sweep import ParameterSweep
+from trace_render import TraceRenderer
+
+try:
+    import wx
+    _ = wx.GetTranslation
+except ImportError:  # wxPython is only needed by the graphical interface
+    def _(text):
+        """Return text untranslated when wxPython is not installed."""
+        return text
+
+
+def parse_definition_file(path, scanner_logger, parser_logger):
+    """Parse the definition file at path and build the network.
+
+    Return the parser if the file was parsed successfully, or None if not.
+    """
+    [parser, success] = load_definition_file(path, scanner_logger,
+                                             parser_logger)
+    if success:
+        return parser
+    return None
+
+
+def render_traces(parser, cycles, image_path, width, height, prune=False,
+                  merge=False, lookup_tables=False, memo_size=None,
+                  processes=None, threads=None, bitsliced=False):
+    """Simulate the parsed network and render its traces to image_path.
+
+    If prune is True, only the devices the monitors depend on are
+    simulated. If merge is True, duplicate gates are merged first. If
+    lookup_tables is True, small cones of gates are mapped to lookup
+    tables. If memo_size is not None, blocks of gates remember their
+    outputs for up to memo_size recent inputs. If processes is not None,
+    the gates are split between that many processes, and if threads is
+    not None, each level of gates is split between that many threads. If
+    bitsliced is True, each level of gates is evaluated on bitplanes.
+    Return True if successful.
+    """
+    renderer = TraceRenderer(parser.devices, parser.monitors)
+    if height is not None and height < renderer.get_min_height():
+        print(_("Error: the image must be at least {} pixels high to show "
+                "every monitor.").format(renderer.get_min_height()))
+        return False
+    if not renderer.is_image_path(image_path):
+        print(_("Error: image file must end in .png or .svg."))
+        return False
+    if merge:
+        parser.network.merge_duplicate_gates()
+    if lookup_tables:
+        parser.monitors.map_lookup_tables()
+    if memo_size is not None:
+        parser.monitors.memoise_blocks(memo_size)
+    if prune:
+        parser.monitors.prune_network()
+    engine = None
+    if processes is not None:
+        engine = PartitionedEngine(parser.network, processes)
+    elif threads is not None:
+        engine = ThreadedEngine(parser.network, threads)
+    elif bitsliced:
+        engine = BitslicedEngine(parser.network)
+    # Long runs of periodic circuits are repeated rather than simulated
+    simulator = Simulator(parser.network, parser.monitors,
+                          detect_period=True, engine=engine)
+    try:
+        cycles_completed = simulator.run(cycles)
+    finally:
+        if engine is not None:
+            engine.close()
+    if simulator.oscillating:
+        print("".join((_("Error! Network oscillating."), "\n")))
+        for loop_names in parser.network.get_oscillating_loop_names():
+            print("".join((_("Oscillating loop: "), ", ".join(loop_names))))
+    renderer.render(image_path, width, height)
+    print("".join((_("Rendered "), str(cycles_completed), _(" cycles to "),
+                   image_path)))
+    if memo_size is not None:
+        print(_("Block cache: {} hits, {} misses").format(
+            *parser.network.get_memo_counts()))
+    return True
 
-_ = wx.GetTranslation
+
+def sweep_switches(parser, cycles, switch_names, configuration_path,
+                   prune=False, merge=False, lookup_tables=False,
+                   memo_size=None, processes=None):
+    """Simulate the parsed network for many configurations of its switches.
+
+    Every combination of the switches in switch_names is simulated if it
+    is not None, or else every configuration listed in the file at
+    configuration_path. The result of each configuration is printed as it
+    finishes, followed by a table of all the results. The other arguments
+    are as in render_traces, except that processes is the number of
+    processes the configurations are split between. Return True if
+    successful.
+    """
+    if merge:
+        parser.network.merge_duplicate_gates()
+    if lookup_tables:
+        parser.monitors.map_lookup_tables()
+    if memo_size is not None:
+        parser.monitors.memoise_blocks(memo_size)
+    if prune:
+        parser.monitors.prune_network()
+    sweep = ParameterSweep(parser.names, parser.devices, parser.network,
+                           parser.monitors, cycles, processes)
+    if switch_names is not None:
+        switch_ids = sweep.get_switch_ids(switch_names)
+        if switch_ids is None:
+            print(_("Error: every name to sweep must be a switch."))
+            return False
+        configurations = sweep.get_combinations(switch_ids)
+    else:
+        try:
+            configurations = sweep.read_configurations(configuration_path)
+        except OSError:
+            configurations = None
+        if configurations is None:
+            print(_("Error: invalid configuration file."))
+            return False
+
+    # Names of the monitored signals, in the order of the statistics
+    signal_names = [parser.devices.get_signal_name(device_id, output_id)
+                    for device_id, output_id
+                    in parser.monitors.monitors_dictionary]
+    results = []
+    for result in sweep.run(configurations):
+        line = "".join([_("Configuration "), str(result.position + 1),
+                        _(" of "), str(len(configurations)), " (",
+                        sweep.get_configuration_string(result.configuration),
+                        "): ", str(result.cycles_completed), _(" cycles")])
+        if result.oscillating:
+            line = "".join([line, _(", oscillating")])
+        for signal_name, (final_level, high_cycles, changes) \
+                in zip(signal_names, result.statistics):
+            if final_level is None:
+                final_level = "-"
+            line = "".join([line, "\n    ", _(
+                "{}: ends at {}, HIGH for {} cycles, {} changes").format(
+                    signal_name, final_level, high_cycles, changes)])
+        print(line)
+        results.append(result)
+    print("")
+    print("\n".join(sweep.get_summary(results)))
+    return True
 
 
 def main(arg_list):
     """Parse the command line options and arguments specified in arg_list.
 
     Run either the command line user interface, the graphical user interface,
-    or display the usage message.
+    print the netlist statistics, render the traces to an image, or display
+    the usage message.
     """
     usage_message = (
         "Usage:\n"
         "Show help: logsim.py -h\n"
-        "Command line user interface: logsim.py -c <file path>\n"
-        "Graphical user interface: logsim.py <file path>"
+        "Command line user interface: logsim.py [-p] [-m] [-l] "
+        "[-k <size>] -c <file path>\n"
+        "Netlist statistics: logsim.py -s <file path>\n"
+        "Graphical user interface: logsim.py <file path>\n"
+        "Render traces to a PNG or SVG image:\n"
+        "    logsim.py -o <image path> [-n <cycles>] "
+        "[-r <width>x<height>] [-p] [-m] [-l] [-k <size>] "
+        "[-j <processes> | -t <threads> | -b] <file path>\n"
+        "Sweep switch configurations:\n"
+        "    logsim.py (-w <switch names> | -f <configuration file>) "
+        "[-n <cycles>] [-j <processes>] [-p] [-m] [-l] [-k <size>] "
+        "<file path>\n"
+        "With -p, only the logic that drives the monitored signals is "
+        "simulated.\n"
+        "With -m, gates that duplicate other gates are merged before "
+        "simulating.\n"
+        "With -l, small cones of gates are simulated as lookup tables.\n"
+        "With -k, blocks of gates remember their outputs for up to <size> "
+        "recent inputs.\n"
+        "With -j, the gates are split between <processes> processes when "
+        "rendering.\n"
+        "With -t, each level of gates is split between <threads> threads "
+        "when rendering on a free-threaded Python build.\n"
+        "With -b, each level of gates is evaluated on bitplanes when "
+        "rendering.\n"
+        "With -w, every combination of the comma-separated switches is "
+        "simulated, and with -f, every configuration listed in the file, "
+        "one per line as \"sw1=1 sw2=0\". The configurations are split "
+        "between <processes> processes."
     )
     try:
-        options, arguments = getopt.getopt(arg_list, "hc:")
+        options, arguments = getopt.getopt(arg_list,
+                                           "hpmlbk:c:s:o:n:r:j:t:w:f:")
     except getopt.GetoptError:
         print("".join((_("Error: invalid command line arguments."), "\n")))
         print(usage_message)
@@ -52,6 +245,37 @@ def main(arg_list):
     network = None
     monitors = None
     path = None
+    # Simulate only the logic that drives the monitors
+    prune = ("-p", "") in options
+    # Merge duplicate gates before simulating
+    merge = ("-m", "") in options
+    # Map small cones of gates to lookup tables
+    lookup_tables = ("-l", "") in options
+    # Evaluate each level of gates on bitplanes when rendering
+    bitsliced = ("-b", "") in options
+    # Remember the outputs of blocks of gates for this many inputs
+    memo_size = None
+    for option, value in options:
+        if option == "-k":
+            try:
+                memo_size = int(value)
+            except ValueError:
+                memo_size = 0
+            if memo_size <= 0:
+                print(_("Error: the cache size must be a positive "
+                        "integer."))
+                sys.exit()
+
+    # Settings for rendering traces to an image
+    image_path = None
+    processes = None
+    threads = None
+    cycles = 100
+    width = 1200
+    height = None
+    # Settings for sweeping the configurations of the switches
+    switch_names = None
+    configuration_path = None
 
     # Configure the loggers
     scanner_logger = logging.getLogger("scanner")
@@ -60,38 +284,107 @@ def main(arg_list):
     scanner_logger.propagate = False
     parser_logger.propagate = False
 
-    for option, path in options:
+    for option, value in options:
         if option == "-h":  # print the usage message
             print(usage_message)
             sys.exit()
         elif option == "-c":  # use the command line user interface
-            names_instance = Names()
-            scanner_instance = Scanner(
-                path, names_instance, scanner_logger
-            )
-            device_instance = Devices(names_instance)
-            network_instance = Network(names_instance, device_instance)
-            monitor_instance = Monitors(
-                names_instance, device_instance, network_instance
-            )
-
-            parser = Parser(
-                names_instance,
-                device_instance,
-                network_instance,
-                monitor_instance,
-                scanner_instance,
-                parser_logger,
-            )
-
-            if parser.parse_network():
+            path = value
+            parser = parse_definition_file(path, scanner_logger,
+                                           parser_logger)
+            if parser is not None:
                 # Initialise an instance of the userint.UserInterface() class
                 names = parser.names
                 network = parser.network
                 devices = parser.devices
                 monitors = parser.monitors
+                if merge:
+                    network.merge_duplicate_gates()
+                if lookup_tables:
+                    monitors.map_lookup_tables()
+                if memo_size is not None:
+                    monitors.memoise_blocks(memo_size)
+                if prune:
+                    monitors.prune_network()
                 userint = UserInterface(names, devices, network, monitors)
                 userint.command_interface()
+        elif option == "-s":  # print statistics about the netlist
+            parser = parse_definition_file(value, scanner_logger,
+                                           parser_logger)
+            if parser is None:
+                sys.exit(1)
+            analysis = NetlistAnalysis(parser.devices, parser.network)
+            print("\n".join(analysis.get_report()))
+        elif option in ["-p", "-m", "-l", "-k", "-b"]:  # already read above
+            pass
+        elif option == "-o":  # render the traces to an image file
+            image_path = value
+        elif option == "-n":  # number of cycles to render or sweep
+            try:
+                cycles = int(value)
+            except ValueError:
+                cycles = 0
+            if cycles <= 0:
+                print(_("Error: the number of cycles must be a positive "
+                        "integer."))
+                sys.exit()
+        elif option == "-j":  # number of processes executing the gates
+            try:
+                processes = int(value)
+            except ValueError:
+                processes = 0
+            if processes <= 0:
+                print(_("Error: the number of processes must be a positive "
+                        "integer."))
+                sys.exit()
+        elif option == "-t":  # number of threads executing each level
+            try:
+                threads = int(value)
+            except ValueError:
+                threads = 0
+            if threads <= 0:
+                print(_("Error: the number of threads must be a positive "
+                        "integer."))
+                sys.exit()
+        elif option == "-r":  # image resolution
+            try:
+                [width, height] = [int(size) for size in value.split("x")]
+            except ValueError:
+                width = height = 0
+            if width <= 0 or height <= 0:
+                print(_("Error: the resolution must be <width>x<height>."))
+                sys.exit()
+        elif option == "-w":  # switches to sweep every combination of
+            switch_names = value.split(",")
+        elif option == "-f":  # file listing the configurations to sweep
+            configuration_path = value
+
+    if image_path is not None:
+        if len(arguments) != 1:
+            print(_("Error: one definition file must be given."))
+            print(usage_message)
+            sys.exit()
+        parser = parse_definition_file(arguments[0], scanner_logger,
+                                       parser_logger)
+        if parser is None or not render_traces(parser, cycles, image_path,
+                                               width, height, prune,
+                                               merge, lookup_tables,
+                                               memo_size, processes,
+                                               threads, bitsliced):
+            sys.exit(1)
+
+    if switch_names is not None or configuration_path is not None:
+        if len(arguments) != 1:
+            print(_("Error: one definition file must be given."))
+            print(usage_message)
+            sys.exit()
+        parser = parse_definition_file(arguments[0], scanner_logger,
+                                       parser_logger)
+        if parser is None or not sweep_switches(parser, cycles, switch_names,
+                                                configuration_path, prune,
+                                                merge, lookup_tables,
+                                                memo_size, processes):
+            sys.exit(1)
 
     # no options, use GUI
     if not options:
@@ -102,6 +395,11 @@ def main(arg_list):
             print(usage_message)
             sys.exit()
 
+        # The graphical interface is only imported when it is used, so the
+        # other modes work without a display
+        from gui import Gui
+        from logic_simulator_app import LogicSimulatorApp
+
         # Initialise an instance of the LogicSimulatorApp class
         app = LogicSimulatorApp('./style.css')
         gui = Gui("Logic Simulator", path, names, devices, network, monitors)
@@ -0,0 +1,170 @@
+"""Map small cones of logic gates to lookup tables.
+
+Used in the Logic Simulator project so that a cone of gates with few inputs
+is executed as one table lookup, rather than gate by gate.
+
+Functions
+---------
+map_lookup_tables - replaces the small cones of a list of gates with lookup
+                    tables.
+get_truth_table - returns the truth table of a cone of gates.
+evaluate_gates - returns the output of a cone of gates for any signal
+                 levels.
+"""
+from netlist_graph import find_strongly_connected
+from signal_tables import LOW, HIGH, GATE_FOLDS
+
+
+def map_lookup_tables(gate_devices, kept_nets, max_inputs):
+    """Replace the small cones of gate_devices with lookup tables.
+
+    gate_devices is a list of (input net IDs, output net ID, x, y) tuples,
+    see Network.execute_gate. A gate can be absorbed into the cone of the
+    gate reading its output if no other gate reads it and the net is not in
+    kept_nets, which holds the nets read by other devices or monitored.
+    Cones are grown from the inputs towards the outputs while they read at
+    most max_inputs nets. Gates in combinational loops are never mapped.
+
+    Return (gates left, lookup tables). Each lookup table is (input net
+    IDs, output net ID, truth table, gates), where the gates of the cone
+    are in the order they are evaluated, ending with the gate driving the
+    output.
+    """
+    # readers dictionary stores {net ID: set of gate positions}
+    readers = {}
+    # drivers dictionary stores {net ID: gate position}
+    drivers = {}
+    for position, (input_nets, output_net, x, y) in enumerate(gate_devices):
+        drivers[output_net] = position
+        for net_id in input_nets:
+            readers.setdefault(net_id, set()).add(position)
+
+    def successors(position):
+        return readers.get(gate_devices[position][1], [])
+
+    # Components come after the components they drive, so visit them in
+    # reverse to see every driver before its loads
+    order = []
+    in_loop = set()
+    for component in reversed(find_strongly_connected(
+            range(len(gate_devices)), successors)):
+        if len(component) > 1 or component[0] in successors(component[0]):
+            in_loop.update(component)
+        else:
+            order.append(component[0])
+
+    # cone_inputs and cone_gates dictionaries store {gate position: input
+    # net IDs} and {gate position: [gate position, ...]} for the cone
+    # ending at each gate that can be mapped
+    cone_inputs = {}
+    cone_gates = {}
+    absorbed = set()
+    for position in order:
+        (input_nets, output_net, x, y) = gate_devices[position]
+        if None in input_nets:  # unconnected, so left to fail as a gate
+            continue
+        inputs = []
+        children = []
+        for net_id in input_nets:
+            child = drivers.get(net_id)
+            if child in cone_inputs and net_id not in kept_nets \
+                    and len(readers[net_id]) == 1:
+                if child not in children:
+                    children.append(child)
+            elif net_id not in inputs:
+                inputs.append(net_id)
+        if len(inputs) > max_inputs:
+            continue
+        gates = []
+        for child in children:
+            merged = inputs + [net_id for net_id in cone_inputs[child]
+                               if net_id not in inputs]
+            if len(merged) <= max_inputs:
+                inputs = merged
+                gates.extend(cone_gates[child])
+                absorbed.add(child)
+            elif len(inputs) < max_inputs:
+                inputs.append(gate_devices[child][1])
+            else:
+                break
+        else:
+            gates.append(position)
+            cone_inputs[position] = inputs
+            cone_gates[position] = gates
+            continue
+        # The children could not all be read, so they stay as they are
+        for child in children:
+            absorbed.discard(child)
+
+    lookup_tables = []
+    mapped = set()
+    for position in order:
+        if position in absorbed or len(cone_gates.get(position, [])) < 2:
+            continue
+        gates = [gate_devices[member] for member in cone_gates[position]]
+        mapped.update(cone_gates[position])
+        input_nets = tuple(cone_inputs[position])
+        lookup_tables.append((input_nets, gate_devices[position][1],
+                              get_truth_table(input_nets, gates), gates))
+    gates_left = [gate for position, gate in enumerate(gate_devices)
+                  if position not in mapped]
+    return (gates_left, lookup_tables)
+
+
+def get_truth_table(input_nets, gates):
+    """Return the truth table of a cone of gates reading input_nets.
+
+    Bit i of the result is the output of the last gate when each input net
+    j is HIGH if bit j of i is set, and LOW if not. Every net is evaluated
+    for all the input levels at once, as an integer with one bit per row.
+    """
+    rows = 1 << len(input_nets)
+    full = (1 << rows) - 1
+    # columns dictionary stores {net ID: integer with one bit per row}
+    columns = {}
+    for bit, net_id in enumerate(input_nets):
+        columns[net_id] = sum(1 << row for row in range(rows)
+                              if row >> bit & 1)
+    for input_nets, output_net, x, y in gates:
+        inputs = [columns[net_id] for net_id in input_nets]
+        if x is None:  # XOR
+            column = 0
+            for value in inputs:
+                column ^= value
+        else:
+            # Rows in which every input is x
+            column = full
+            for value in inputs:
+                column &= value if x == HIGH else full & ~value
+            if y == LOW:
+                column = full & ~column
+        columns[output_net] = column
+    return columns[gates[-1][1]]
+
+
+def evaluate_gates(gates, signals, levels=None):
+    """Return the output of a cone of gates for the levels in signals.
+
+    This is used when an input is RISING or FALLING, which the truth table
+    does not cover. The gates are folded as in Network.execute_gate_nets,
+    from the levels of the input nets, without changing signals. If levels
+    is given, the output level of every gate is stored in it.
+    """
+    # levels dictionary stores {net ID: level} for the nets of the cone
+    if levels is None:
+        levels = {}
+    output_signal = LOW
+    for input_nets, output_net, x, y in gates:
+        (output_signal, table, final_signal) = GATE_FOLDS[(x, y)]
+        for net_id in input_nets:
+            signal = levels.get(net_id)
+            if signal is None:
+                signal = signals[net_id]
+            if output_signal is None:
+                output_signal = signal
+            else:
+                output_signal = table[output_signal][signal]
+                if output_signal == final_signal:
+                    break
+        levels[output_net] = output_signal
+    return output_signal
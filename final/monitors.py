@@ -31,10 +31,26 @@ class Monitors:
     remove_monitor(self, device_id, output_id): Removes a monitor from the
                                                 specified output.
 
+    prune_network(self): Executes only the devices that the monitored
+                         signals depend on.
+
+    map_lookup_tables(self, max_inputs=8): Executes small cones of gates as
+                                           lookup tables, keeping the
+                                           monitored signals.
+
+    memoise_blocks(self, size=1024, groups=None): Remembers the outputs of
+                                                  blocks of gates, keeping
+                                                  the monitored signals.
+
     get_monitor_signal(self, device_id, output_id): Returns the signal level of
                                                     the specified monitor.
 
-    record_signals(self): Records the current signal level of all monitors.
+    record_signals(self, cycles=1): Records the current signal level of all
+                                    monitors for a number of cycles.
+
+    repeat_signals(self, period, cycles): Records a number of cycles more of
+                                          every monitor by repeating its
+                                          last period cycles.
 
     get_signal_names(self): Returns two lists of signal names: monitored and
                             not monitored.
@@ -82,6 +98,10 @@ class Monitors:
             self.monitors_dictionary[(device_id, output_id)] = [
                 self.devices.BLANK
             ] * cycles_completed
+            # If the network is pruned, bring the new signal's fan-in in,
+            # and if it is mapped, keep the new signal up to date
+            self.network.add_to_cone(device_id)
+            self.network.keep_device(device_id)
             return self.NO_ERROR
 
     def remove_monitor(self, device_id, output_id):
@@ -95,6 +115,36 @@ class Monitors:
             del self.monitors_dictionary[(device_id, output_id)]
             return True
 
+    def prune_network(self):
+        """Execute only the devices that the monitored signals depend on.
+
+        Monitors made afterwards add their own devices to the network.
+        """
+        self.network.set_cone(
+            device_id for device_id, output_id in self.monitors_dictionary)
+
+    def map_lookup_tables(self, max_inputs=8):
+        """Execute the small cones of gates as lookup tables.
+
+        Cones read at most max_inputs signals. The monitored signals, and
+        the signals of monitors made afterwards, are kept up to date.
+        """
+        self.network.map_lookup_tables(
+            max_inputs,
+            [device_id for device_id, output_id in self.monitors_dictionary])
+
+    def memoise_blocks(self, size=1024, groups=None):
+        """Remember the outputs of blocks of gates for their recent inputs.
+
+        Each block remembers up to size sets of input levels. groups is a
+        list of lists of gate IDs, or None to find the blocks. The monitored
+        signals, and the signals of monitors made afterwards, are kept up
+        to date.
+        """
+        self.network.memoise_blocks(
+            size, groups,
+            [device_id for device_id, output_id in self.monitors_dictionary])
+
     def get_monitor_signal(self, device_id, output_id):
         """Return the signal level of the specified monitor.
 
@@ -105,15 +155,28 @@ class Monitors:
         else:
             return None
 
-    def record_signals(self):
+    def record_signals(self, cycles=1):
         """Record the current signal level for every monitor.
 
-        This function is called at every simulation cycle.
+        This function is called at every simulation cycle. The level is
+        recorded once for each of the given number of cycles, for cycles in
+        which the signals cannot change.
         """
         for device_id, output_id in self.monitors_dictionary:
             signal_level = self.get_monitor_signal(device_id, output_id)
-            self.monitors_dictionary[(device_id,
-                                      output_id)].append(signal_level)
+            self.monitors_dictionary[(device_id, output_id)].extend(
+                [signal_level] * cycles)
+
+    def repeat_signals(self, period, cycles):
+        """Record cycles more levels by repeating the last period levels.
+
+        This is used once the network is known to repeat itself every period
+        cycles. Every monitor must have at least period levels recorded.
+        """
+        for signal_list in self.monitors_dictionary.values():
+            repeated = signal_list[len(signal_list) - period:]
+            signal_list.extend(repeated * (cycles // period))
+            signal_list.extend(repeated[:cycles % period])
 
     def get_signal_names(self):
         """Return two signal name lists: monitored and not monitored."""
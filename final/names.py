@@ -45,6 +45,8 @@ class Names:
         self.error_code_count = 0  # how many error codes have been declared
         # initialise a private list to store names
         self.__names_list = []
+        # private dictionary mapping each name string to its ID
+        self.__names_dictionary = {}
 
     def unique_error_codes(self, num_error_codes):
         """Return a list of unique integer error codes.
@@ -73,10 +75,7 @@ class Names:
         """
         if type(name_string) != str:
             raise TypeError
-        if name_string in self.__names_list:
-            return self.__names_list.index(name_string)
-        else:
-            return None
+        return self.__names_dictionary.get(name_string)
 
     def lookup(self, name_string_list):
         """Return a list of name IDs for each name string in name_string_list.
@@ -90,12 +89,13 @@ class Names:
         """
         results = []
         for name_string in name_string_list:
-            if name_string in self.__names_list:
-                results.append(self.__names_list.index(name_string))
-            else:
+            name_id = self.__names_dictionary.get(name_string)
+            if name_id is None:
                 self.__names_list.append(name_string)
-                # can do this return as the append will always be on the end
-                results.append(len(self.__names_list) - 1)
+                # can do this as the append will always be on the end
+                name_id = len(self.__names_list) - 1
+                self.__names_dictionary[name_string] = name_id
+            results.append(name_id)
         return results
 
     def get_name_string(self, name_id):
@@ -0,0 +1,140 @@
+"""Store the signals of the logic network in flat arrays.
+
+Used in the Logic Simulator project so that simulation engines can read and
+write signal levels by integer index, instead of going through a dictionary
+on every Device object.
+
+Classes
+-------
+NetTable - stores the level, driver kind and D-type memory of every net.
+OutputsView - presents one device's nets as its outputs dictionary.
+"""
+from array import array
+from collections.abc import MutableMapping
+
+
+class NetTable:
+    """Store the level, driver kind and D-type memory of every net.
+
+    Every device output is a net with a dense integer net ID, allocated in
+    the order the outputs are added. Every device has a dense integer
+    device index. Signal levels, driver kinds and driving ports are stored
+    by net ID, and D-type memories by device index, in contiguous arrays.
+    The table also counts the simulation cycles, which clock counters are
+    measured from, and the changes made to clock counters, and records the
+    switches whose state has been set.
+
+    Parameters
+    ----------
+    No parameters.
+
+    Public methods
+    --------------
+    add_device(self): Returns the index of a new device.
+
+    add_net(self, device_id, position, device_kind, signal): Returns the net
+                          ID of a new net driven by the output at position on
+                          the given device.
+    """
+
+    # Stored in the memory array for a device with no D-type memory
+    NO_MEMORY = -1
+
+    def __init__(self):
+        """Initialise the empty arrays."""
+        # Signal level and driving device kind for every net
+        self.signals = array("b")
+        self.driver_kinds = array("q")
+        # Driving device ID and output position for every net
+        self.net_devices = array("q")
+        self.net_positions = array("B")
+        # D-type memory for every device
+        self.memory = array("b")
+        # Number of cycles simulated, and number of clock counter changes
+        # made other than by the simulation
+        self.cycle = 0
+        self.clock_changes = 0
+        # Device IDs of the switches set since the network last looked
+        self.changed_switches = set()
+
+    def add_device(self):
+        """Return the index of a new device."""
+        self.memory.append(self.NO_MEMORY)
+        return len(self.memory) - 1
+
+    def add_net(self, device_id, position, device_kind, signal):
+        """Return the net ID of a new net for the given output."""
+        self.signals.append(signal)
+        self.driver_kinds.append(device_kind)
+        self.net_devices.append(device_id)
+        self.net_positions.append(position)
+        return len(self.signals) - 1
+
+
+class OutputsView(MutableMapping):
+    """Present one device's nets as its outputs dictionary.
+
+    Reading or writing an output reads or writes the level of its net in the
+    net table, so code written for the {output_id: signal} dictionary keeps
+    working. Assigning to a new output ID adds a net for it. Outputs cannot
+    be removed. The view stores nothing itself: the device keeps the net IDs
+    of its outputs in port order, and its port layout maps output IDs to
+    positions.
+
+    Parameters
+    ----------
+    device: the Device whose outputs are presented.
+
+    Public methods
+    --------------
+    get_net(self, output_id): Returns the net ID of the output, or None if
+                              the device has no such output.
+    """
+
+    __slots__ = ("device",)
+
+    def __init__(self, device):
+        """Initialise the view."""
+        self.device = device
+
+    def get_net(self, output_id):
+        """Return the net ID of the output, or None if it is absent."""
+        position = self.device.layout.output_positions.get(output_id)
+        if position is None:
+            return None
+        return self.device.output_nets[position]
+
+    def __getitem__(self, output_id):
+        """Return the signal level of the output."""
+        device = self.device
+        position = device.layout.output_positions[output_id]
+        return device.net_table.signals[device.output_nets[position]]
+
+    def __setitem__(self, output_id, signal):
+        """Set the signal level of the output, adding a net if it is new."""
+        device = self.device
+        position = device.layout.output_positions.get(output_id)
+        if position is None:
+            device.add_output_port(output_id, signal)
+        else:
+            device.net_table.signals[device.output_nets[position]] = signal
+
+    def __delitem__(self, output_id):
+        """Refuse to remove an output."""
+        raise TypeError("Device outputs cannot be removed.")
+
+    def __contains__(self, output_id):
+        """Return True if the device has the output."""
+        return output_id in self.device.layout.output_positions
+
+    def __iter__(self):
+        """Iterate over the output IDs in port order."""
+        return iter(self.device.layout.output_ids)
+
+    def __len__(self):
+        """Return the number of outputs."""
+        return len(self.device.layout.output_ids)
+
+    def __repr__(self):
+        """Return the outputs as a dictionary would show them."""
+        return repr(dict(self.items()))
@@ -0,0 +1,320 @@
+"""Build large generated netlists without a definition file.
+
+Used in the Logic Simulator project to load netlists made by other programs.
+The devices and connections are given as lists, checked together, and added
+to the Devices and Network instances in one pass.
+
+Classes
+-------
+NetlistBuilder - checks and builds the devices and connections of a netlist.
+"""
+from devices import PortLayout
+
+
+class NetlistBuilder:
+    """Check and build the devices and connections of a netlist.
+
+    Devices are given as (name, kind, property) specifications, where kind
+    is a device keyword such as "AND", "DTYPE" or "SWITCH", and property is
+    the number of inputs, switch state or clock half period, as in a
+    definition file. Connections are given as (first name, first port,
+    second name, second port) specifications, where the ports are port name
+    strings or None for single output devices. As with
+    Network.make_connection, one port must be an input and the other an
+    output, in either order.
+
+    Every specification is checked before anything is built, so all the
+    errors in a netlist are found at once, and the devices and network are
+    left unchanged if there are any. Names and port layouts are looked up
+    once per list, instead of once per call, and clocks and D-types are
+    started individually, so building takes time linear in the size of the
+    netlist.
+
+    The errors are the device and network error codes, and INPUT_UNCONNECTED
+    for a new device with an unconnected input.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+
+    Public methods
+    --------------
+    build(self, device_specs, connection_specs): Checks the netlist and adds
+                         it to the network if there are no errors. Returns
+                         True if successful.
+
+    get_layout(self, device_kind, device_property): Returns the error type
+                         and port layout for a device specification.
+
+    check_device(self, device_kind, device_property): Checks a device
+                         specification and returns its error type and port
+                         layout.
+
+    check_devices(self, device_specs): Checks the device specifications and
+                         returns the new devices.
+
+    check_connections(self, connection_specs, layouts): Checks the
+                         connection specifications and returns the new
+                         connections.
+
+    find_layout(self, device_id, layouts): Returns the port layout of an
+                         existing device.
+    """
+
+    def __init__(self, names, devices, network):
+        """Initialise the builder and its error code."""
+        self.names = names
+        self.devices = devices
+        self.network = network
+
+        [self.INPUT_UNCONNECTED] = self.names.unique_error_codes(1)
+
+        # device_errors and connection_errors store (index, error_type) for
+        # every specification in error, in the order of the lists
+        self.device_errors = []
+        self.connection_errors = []
+
+        # layouts dictionary stores {(device_kind, device_property):
+        # (error_type, port layout)}
+        self.layouts = {}
+
+    def get_layout(self, device_kind, device_property):
+        """Return (error type, port layout) for a device specification.
+
+        The layout is None if the specification is not valid. The checks
+        are the same as in Devices.make_device.
+        """
+        key = (device_kind, device_property)
+        if key not in self.layouts:
+            self.layouts[key] = self.check_device(device_kind,
+                                                  device_property)
+        return self.layouts[key]
+
+    def check_device(self, device_kind, device_property):
+        """Check a device specification and return (error type, layout)."""
+        devices = self.devices
+        single_output = PortLayout.get((), (None,))
+        if device_kind in [devices.SWITCH, devices.CLOCK]:
+            if device_property is None:
+                return (devices.NO_QUALIFIER, None)
+            elif device_kind == devices.SWITCH \
+                    and device_property not in [devices.LOW, devices.HIGH]:
+                return (devices.INVALID_QUALIFIER, None)
+            elif device_kind == devices.CLOCK \
+                    and (not isinstance(device_property, int)
+                         or device_property <= 0):
+                return (devices.INVALID_QUALIFIER, None)
+            return (devices.NO_ERROR, single_output)
+
+        elif device_kind in devices.gate_types:
+            if device_kind in [devices.XOR, devices.NOT]:
+                if device_property is not None:
+                    return (devices.QUALIFIER_PRESENT, None)
+                no_of_inputs = 2 if device_kind == devices.XOR else 1
+            elif device_property is None:
+                return (devices.NO_QUALIFIER, None)
+            elif device_property not in range(
+                    1, devices.max_gate_inputs + 1):
+                return (devices.INVALID_QUALIFIER, None)
+            else:
+                no_of_inputs = device_property
+            input_ids = self.names.lookup(
+                ["".join(["I", str(input_number)])
+                 for input_number in range(1, no_of_inputs + 1)])
+            return (devices.NO_ERROR, PortLayout.get(input_ids, (None,)))
+
+        elif device_kind == devices.D_TYPE:
+            if device_property is not None:
+                return (devices.QUALIFIER_PRESENT, None)
+            return (devices.NO_ERROR,
+                    PortLayout.get(devices.dtype_input_ids,
+                                   devices.dtype_output_ids))
+
+        return (devices.BAD_DEVICE, None)
+
+    def check_devices(self, device_specs):
+        """Check the device specifications.
+
+        Return a list of (index, device ID, device kind, device property,
+        layout) for the new devices.
+        """
+        devices = self.devices
+        names = self.names
+        kind_ids = {}
+        for kind_string in ["AND", "OR", "NAND", "NOR", "XOR", "NOT",
+                            "CLOCK", "SWITCH", "DTYPE"]:
+            kind_ids[kind_string] = names.query(kind_string)
+
+        device_ids = names.lookup([spec[0] for spec in device_specs])
+        new_devices = []
+        seen = set()
+        for index, (device_id, spec) in enumerate(zip(device_ids,
+                                                      device_specs)):
+            [device_name, kind_string, device_property] = spec
+            device_kind = kind_ids.get(kind_string)
+            if device_id in seen or devices.get_device(device_id) is not None:
+                error_type = devices.DEVICE_PRESENT
+                layout = None
+            elif device_kind is None:
+                error_type = devices.BAD_DEVICE
+                layout = None
+            else:
+                [error_type, layout] = self.get_layout(device_kind,
+                                                       device_property)
+            seen.add(device_id)
+            if error_type != devices.NO_ERROR:
+                self.device_errors.append((index, error_type))
+            else:
+                new_devices.append((index, device_id, device_kind,
+                                    device_property, layout))
+        return new_devices
+
+    def check_connections(self, connection_specs, layouts):
+        """Check the connection specifications.
+
+        layouts is {device_id: port layout} for the new devices, and the
+        layouts of existing devices are added to it. Return a list of
+        ((input device ID, input ID), (output device ID, output ID)) for the
+        new connections.
+        """
+        network = self.network
+        devices = self.devices
+        names = self.names
+
+        # Look up every name and port name once
+        first_ids = names.lookup([spec[0] for spec in connection_specs])
+        second_ids = names.lookup([spec[2] for spec in connection_specs])
+        port_names = list({spec[port] for spec in connection_specs
+                           for port in [1, 3]} - {None})
+        port_ids = dict(zip(port_names, names.lookup(port_names)))
+        port_ids[None] = None
+
+        new_connections = []
+        # connected set stores (device_id, input_id) for every input
+        # connected by this netlist
+        connected = set()
+        for index, spec in enumerate(connection_specs):
+            first_id = first_ids[index]
+            second_id = second_ids[index]
+            first_port_id = port_ids[spec[1]]
+            second_port_id = port_ids[spec[3]]
+            first_layout = layouts.get(first_id)
+            if first_layout is None:
+                first_layout = self.find_layout(first_id, layouts)
+            second_layout = layouts.get(second_id)
+            if second_layout is None:
+                second_layout = self.find_layout(second_id, layouts)
+
+            if first_layout is None or second_layout is None:
+                error_type = network.DEVICE_ABSENT
+            elif first_port_id in first_layout.output_positions:
+                if second_port_id in second_layout.input_positions:
+                    error_type = network.NO_ERROR
+                    input_port = (second_id, second_port_id)
+                    output_port = (first_id, first_port_id)
+                elif second_port_id in second_layout.output_positions:
+                    error_type = network.OUTPUT_TO_OUTPUT
+                else:
+                    error_type = network.PORT_ABSENT
+            elif first_port_id in first_layout.input_positions:
+                if second_port_id in second_layout.output_positions:
+                    error_type = network.NO_ERROR
+                    input_port = (first_id, first_port_id)
+                    output_port = (second_id, second_port_id)
+                elif second_port_id in second_layout.input_positions:
+                    error_type = network.INPUT_TO_INPUT
+                else:
+                    error_type = network.PORT_ABSENT
+            else:
+                error_type = network.PORT_ABSENT
+
+            if error_type == network.NO_ERROR:
+                if input_port in connected or (
+                        input_port[0] in devices.devices_dictionary
+                        and network.get_connected_output(*input_port)
+                        is not None):
+                    error_type = network.INPUT_CONNECTED
+                else:
+                    connected.add(input_port)
+                    new_connections.append((input_port, output_port))
+            if error_type != network.NO_ERROR:
+                self.connection_errors.append((index, error_type))
+        return new_connections
+
+    def find_layout(self, device_id, layouts):
+        """Return the port layout of an existing device, or None.
+
+        The layout is added to layouts.
+        """
+        device = self.devices.get_device(device_id)
+        if device is None:
+            return None
+        layouts[device_id] = device.layout
+        return device.layout
+
+    def build(self, device_specs, connection_specs):
+        """Check the netlist and add it to the network if there are no errors.
+
+        Return True if successful. The errors are stored in device_errors
+        and connection_errors.
+        """
+        devices = self.devices
+        network = self.network
+        self.device_errors = []
+        self.connection_errors = []
+        device_specs = list(device_specs)
+        connection_specs = list(connection_specs)
+
+        new_devices = self.check_devices(device_specs)
+        layouts = {device_id: layout
+                   for index, device_id, device_kind, device_property, layout
+                   in new_devices}
+        new_connections = self.check_connections(connection_specs, layouts)
+
+        # Every input of a new device must be connected. Each input can only
+        # be connected once, so it is enough to count the connections.
+        connection_counts = {}
+        for input_port, output_port in new_connections:
+            device_id = input_port[0]
+            connection_counts[device_id] = \
+                connection_counts.get(device_id, 0) + 1
+        for index, device_id, device_kind, device_property, layout \
+                in new_devices:
+            if connection_counts.get(device_id, 0) < len(layout.input_ids):
+                self.device_errors.append((index, self.INPUT_UNCONNECTED))
+        self.device_errors.sort()
+
+        if self.device_errors or self.connection_errors:
+            return False
+
+        # Build the devices
+        for index, device_id, device_kind, device_property, layout \
+                in new_devices:
+            device = devices.add_device(device_id, device_kind, layout)
+            if device_kind == devices.SWITCH:
+                device.switch_state = device_property
+            elif device_kind == devices.CLOCK:
+                device.clock_half_period = device_property
+                devices.cold_start_device(device)
+            elif device_kind == devices.D_TYPE:
+                devices.cold_start_device(device)
+
+        # Make the connections
+        fanout = network.fanout
+        devices_dictionary = devices.devices_dictionary
+        for input_port, output_port in new_connections:
+            # Write the connection directly, rather than through the inputs
+            # view, as this is the inner loop of the build
+            device = devices_dictionary[input_port[0]]
+            position = device.layout.input_positions[input_port[1]]
+            device.connections[position] = output_port
+            fanout.setdefault(output_port, []).append(input_port)
+        if new_connections:
+            network.version += 1
+        if network.cone is not None:
+            for input_port, output_port in new_connections:
+                if input_port[0] in network.cone:
+                    network.add_to_cone(output_port[0])
+        return True
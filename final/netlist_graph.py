@@ -0,0 +1,80 @@
+"""Find the loops in the graph of devices and connections.
+
+Used in the Logic Simulator project to report feedback loops, such as the
+loop of devices that keeps a network oscillating.
+
+Functions
+---------
+find_strongly_connected - returns the strongly connected components of a
+                          graph.
+find_loops - returns the components of a graph that contain a loop.
+"""
+
+
+def find_strongly_connected(nodes, successors):
+    """Return the strongly connected components of a directed graph.
+
+    successors(node) returns the nodes that node has an edge to. Nodes that
+    are not in nodes are ignored. The components are found with Tarjan's
+    algorithm, iteratively so that long chains do not exhaust the Python
+    stack, and are returned as lists of nodes, each component after every
+    component it has an edge to.
+    """
+    node_set = set(nodes)
+    # index and low_link dictionaries store {node: integer}
+    index = {}
+    low_link = {}
+    stack = []
+    on_stack = set()
+    components = []
+
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low_link[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        # Each frame is a node and an iterator over its successors
+        frames = [(root, iter(successors(root)))]
+        while frames:
+            [node, children] = frames[-1]
+            for child in children:
+                if child not in node_set:
+                    continue
+                if child not in index:
+                    index[child] = low_link[child] = len(index)
+                    stack.append(child)
+                    on_stack.add(child)
+                    frames.append((child, iter(successors(child))))
+                    break
+                elif child in on_stack:
+                    low_link[node] = min(low_link[node], index[child])
+            else:
+                # Every successor of node has been visited
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    low_link[parent] = min(low_link[parent], low_link[node])
+                if low_link[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+
+def find_loops(nodes, successors):
+    """Return the strongly connected components that contain a loop.
+
+    A component contains a loop if it has more than one node, or its one
+    node has an edge to itself.
+    """
+    loops = []
+    for component in find_strongly_connected(nodes, successors):
+        if len(component) > 1 or component[0] in successors(component[0]):
+            loops.append(component)
+    return loops
@@ -6,6 +6,18 @@ Classes
 --------
 Network - builds and executes the network.
 """
+import hashlib
+from array import array
+
+from clock_calendar import ClockCalendar
+from execution_plan import ExecutionPlan
+from lut_mapping import evaluate_gates
+from net_table import NetTable
+from netlist_graph import find_loops
+from signal_tables import (LOW, HIGH, UPDATE, INVERT, SETTLED, SAMPLE,
+                           GATE_FOLDS)
+from structural_hashing import find_duplicate_gates
+from switch_constants import SwitchConstants
 
 
 class Network:
@@ -15,6 +27,34 @@ class Network:
     in the network, getting information about connections, and executing all
     the devices in the network.
 
+    Each input stores the output driving it. The network also keeps the
+    reverse index, from each output to the inputs it drives, so that the
+    loads of an output can be found without scanning every device.
+
+    The network can be pruned to the cone of influence of some devices: the
+    devices themselves and every device they depend on through their
+    inputs, including through D-types. Only the devices in the cone and the
+    clocks are then executed, so logic that drives nothing in the cone
+    costs nothing. The cone only grows, as devices are added to it or
+    connections are made into it. A device that joins the cone during a run
+    starts from the signals and D-type memory it had when it was left out.
+
+    Gates of the same kind that read the same nets can be merged. The output
+    of each duplicate is then the net of the gate it duplicates, so only
+    that gate is executed, while the duplicate keeps its name, connections
+    and monitors. Making or removing a connection undoes the merge.
+
+    Small cones of gates can be mapped to lookup tables, each found once
+    from the truth table of its gates and executed with one index. Only the
+    output of each cone is updated, so the outputs of gates inside a cone
+    keep their last levels, unless their devices are kept, as monitored
+    devices are.
+
+    Blocks of gates can also remember their output levels for their most
+    recent input levels, so a block is only evaluated the first time it
+    sees its inputs. The gates inside a block that are only read inside it
+    keep their last levels too, unless their devices are kept.
+
     Parameters
     ----------
     devices - instance of the devices.Devices() class.
@@ -24,9 +64,16 @@ class Network:
     get_connected_output(self, device_id, output_id): Returns the device and
                                               port id of the connected output.
 
+    get_fanout(self, device_id, output_id): Returns the list of inputs
+                              driven by the given output, as (device ID,
+                              input ID) pairs.
+
     get_input_signal(self, device_id, input_id): Returns the signal level at
                                      the output connected to the given input.
 
+    get_input_signals(self, device_id): Returns a list of (input ID, signal
+                                        level) pairs for the device's inputs.
+
     get_output_signal(self, device_id, output_id): Returns the signal level at
                                                    the given output.
 
@@ -38,6 +85,37 @@ class Network:
 
     check_network(self): Checks if all inputs in the network are connected.
 
+    set_cone(self, device_ids): Executes only the devices that the given
+                                devices depend on, or every device if
+                                device_ids is None.
+
+    add_to_cone(self, device_id): Adds a device and the devices it depends
+                                  on to the devices executed.
+
+    merge_duplicate_gates(self): Merges the gates that duplicate other
+                                 gates, and returns the number merged.
+
+    unmerge_gates(self): Gives every merged gate its own output again.
+
+    map_lookup_tables(self, max_inputs, device_ids=()): Executes small
+                             cones of gates as lookup tables, keeping the
+                             outputs of the given devices.
+
+    memoise_blocks(self, size, groups=None, device_ids=()): Remembers the
+                             outputs of blocks of gates for their recent
+                             inputs, keeping the outputs of the given
+                             devices.
+
+    get_memo_counts(self): Returns the number of hits and misses of the
+                           block caches.
+
+    keep_device(self, device_id): Keeps the outputs of the device up to
+                                  date when gates are mapped or blocks
+                                  remembered.
+
+    get_execution_plan(self): Returns the execution plan, rebuilding it if the
+                              devices or connections have changed.
+
     update_signal(self, signal, target): Updates the signal in the direction of
                                          the target.
 
@@ -46,20 +124,61 @@ class Network:
 
     execute_switch(self, device_id): Simulates a switch press.
 
+    execute_switch_net(self, target, net_id): Updates a switch's net towards
+                                              its target.
+
     execute_gate(self, device_id, x=None, y=None): Simulates a logic gate and
                                               updates its output signal value.
 
+    execute_gate_nets(self, input_nets, output_net, x, y): Simulates a logic
+                                     gate on the given net IDs.
+
+    execute_lookup_table(self, input_nets, output_net, table, gates):
+                         Simulates a cone of gates mapped to a lookup table.
+
+    execute_memo_block(self, memo_block): Simulates a block of gates through
+                                          its cache.
+
     execute_d_type(self, device_id): Simulates a D-type device and updates its
                                      output signal value.
 
+    execute_d_type_nets(self, device_index, input_nets, Q_net, QBAR_net):
+                        Simulates a D-type device on the given net IDs.
+
     execute_clock(self, device_id): Simulates a clock and updates its output
                                     signal value.
 
+    execute_clock_net(self, net_id): Settles a clock's net.
+
+    get_clock_calendar(self): Returns the calendar of clock edges, rebuilding
+                              it if the clocks have changed.
+
     update_clocks(self): If it is time to do so, sets clock signals to RISING
                          or FALLING.
 
-    execute_network(self): Executes all the devices in the network for one
-                           simulation cycle.
+    get_gate_schedule(self): Returns the gates to execute, leaving out the
+                             gates fixed by the switches.
+
+    execute_gate_pass(self, gate_devices): Executes the gates in order for
+                                           one pass.
+
+    execute_network(self, execute_gates=None): Executes all the devices in
+                           the network for one simulation cycle.
+
+    quiet_cycles(self, limit): Returns the number of following cycles, up to
+                               limit, in which no signal can change.
+
+    skip_cycles(self, cycles): Advances the clocks through quiet cycles
+                               without executing the devices.
+
+    get_state_digest(self): Returns a digest of the state that determines
+                            the following cycles.
+
+    find_oscillating_loops(self, net_ids): Returns the loops of devices that
+                                           drive the given nets.
+
+    get_oscillating_loop_names(self): Returns the names of the devices in
+                                      each loop found oscillating.
     """
 
     def __init__(self, names, devices):
@@ -74,8 +193,51 @@ class Network:
             self.INPUT_CONNECTED,
             self.PORT_ABSENT,
             self.DEVICE_ABSENT,
-        ] = self.names.unique_error_codes(6)
+            self.NOT_CONNECTED,
+        ] = self.names.unique_error_codes(7)
         self.steady_state = True  # for checking if signals have settled
+        # Set if the last call of execute_network settled
+        self.settled = False
+        # Number of passes over the devices to wait for the signals to
+        # settle before declaring the network unstable. If None, the limit
+        # is set by the logic depth of the network.
+        self.iteration_limit = None
+        # Lists of device IDs forming the loops that kept the last cycle
+        # from settling
+        self.oscillating_loops = []
+        # Set of the device IDs executed, or None to execute every device
+        self.cone = None
+        # merged_nets dictionary stores {merged gate ID: net ID of its own
+        # output}
+        self.merged_nets = {}
+        # Most inputs of a cone of gates mapped to a lookup table, or None
+        # to execute every gate on its own, and the devices whose outputs
+        # are kept up to date
+        self.lut_inputs = None
+        self.kept_devices = set()
+        # Most input levels remembered by each block of gates, or None to
+        # remember none, and the blocks as lists of gate IDs, or None to
+        # make a block of every set of connected gates
+        self.memo_size = None
+        self.memo_groups = None
+
+        # fanout dictionary stores
+        # {(output_device_id, output_port_id): [(device_id, input_id), ...]}
+        self.fanout = {}
+        # Counts the connections made and removed and the changes to the
+        # cone, and the execution plan built for the current devices,
+        # connections and cone
+        self.version = 0
+        self.execution_plan = None
+        # Calendar of clock edges, and the execution plan it was built for
+        self.clock_calendar = None
+        self.clock_calendar_plan = None
+        # If set, gates fixed by the switches are left out of the cycles
+        # once the network has settled
+        self.fold_constants = True
+        # Constant gates, and the execution plan they were found for
+        self.switch_constants = None
+        self.switch_constants_plan = None
 
     def get_connected_output(self, device_id, input_id):
         """Return the output connected to the given input.
@@ -90,6 +252,14 @@ class Network:
                 return connected_output
         return None
 
+    def get_fanout(self, device_id, output_id):
+        """Return the list of inputs driven by the given output.
+
+        Each input is of the form (device ID, port ID). Return an empty list
+        if the output drives nothing or the IDs are invalid.
+        """
+        return list(self.fanout.get((device_id, output_id), []))
+
     def get_input_signal(self, device_id, input_id):
         """Return the signal level at the output connected to the given input.
 
@@ -103,6 +273,19 @@ class Network:
             (output_device_id, output_port_id) = connected_output
             return self.get_output_signal(output_device_id, output_port_id)
 
+    def get_input_signals(self, device_id):
+        """Return a list of (input ID, signal level) pairs for the device.
+
+        The signal level is None if the input is unconnected. Uses the
+        execution plan if it is up to date.
+        """
+        if self.execution_plan is not None \
+                and self.execution_plan.is_current():
+            return self.execution_plan.get_input_signals(device_id)
+        device = self.devices.get_device(device_id)
+        return [(input_id, self.get_input_signal(device_id, input_id))
+                for input_id in device.inputs]
+
     def get_output_signal(self, device_id, output_id):
         """Return the signal level at the given output.
 
@@ -137,8 +320,15 @@ class Network:
                 error_type = self.INPUT_TO_INPUT
             elif second_port_id in second_device.outputs:
                 # Make connection
+                self.unmerge_gates()
                 first_device.inputs[first_port_id] = \
                     (second_device_id, second_port_id)
+                self.fanout.setdefault(
+                    (second_device_id, second_port_id), []).append(
+                        (first_device_id, first_port_id))
+                self.version += 1
+                if self.cone is not None and first_device_id in self.cone:
+                    self.add_to_cone(second_device_id)
                 error_type = self.NO_ERROR
             else:  # second_port_id is not a valid input or output port
                 error_type = self.PORT_ABSENT
@@ -152,10 +342,18 @@ class Network:
                     # Input is already in a connection
                     error_type = self.INPUT_CONNECTED
                 else:
+                    self.unmerge_gates()
                     second_device.inputs[second_port_id] = (
                         first_device_id,
                         first_port_id,
                     )
+                    self.fanout.setdefault(
+                        (first_device_id, first_port_id), []).append(
+                            (second_device_id, second_port_id))
+                    self.version += 1
+                    if self.cone is not None \
+                            and second_device_id in self.cone:
+                        self.add_to_cone(first_device_id)
                     error_type = self.NO_ERROR
             else:
                 error_type = self.PORT_ABSENT
@@ -169,29 +367,44 @@ class Network:
             self, first_device_id, first_port_id, second_device_id,
             second_port_id
     ):
-        """Remove connetion between first device and second device.
+        """Remove the connection between first device and second device.
 
-        Return self.NO_ERROR if successful, or the corresponding error if not.
+        One port must be an input and the other the output driving it, in
+        either order. Return self.NO_ERROR if successful, or the
+        corresponding error if not.
         """
         first_device = self.devices.get_device(first_device_id)
         second_device = self.devices.get_device(second_device_id)
 
         if first_device is None or second_device is None:
-            error_type = self.DEVICE_ABSENT
-
-        # If valid port ids
-        elif first_port_id in first_device.inputs \
-                and second_port_id in second_device.outputs:
-            if first_device.inputs[first_port_id] is not None \
-                    and second_device.outputs[second_port_id] is not None:
-                # Remove connection
-                first_device.inputs[first_port_id] = None
-                error_type = self.NO_ERROR
-            else:  # second_port_id is not a valid input or output port
-                error_type = self.PORT_ABSENT
-
-        else:  # first_port_id not a valid input or output port
+            return self.DEVICE_ABSENT
+
+        # Put the input first
+        if first_port_id in first_device.outputs \
+                and second_port_id in second_device.inputs:
+            [first_device_id, first_port_id, first_device,
+             second_device_id, second_port_id, second_device] = \
+                [second_device_id, second_port_id, second_device,
+                 first_device_id, first_port_id, first_device]
+
+        if first_port_id not in first_device.inputs \
+                or second_port_id not in second_device.outputs:
+            # Not an input and an output
             error_type = self.PORT_ABSENT
+        elif first_device.inputs[first_port_id] != \
+                (second_device_id, second_port_id):
+            # The input is not driven by this output
+            error_type = self.NOT_CONNECTED
+        else:
+            # Remove connection
+            self.unmerge_gates()
+            first_device.inputs[first_port_id] = None
+            loads = self.fanout[(second_device_id, second_port_id)]
+            loads.remove((first_device_id, first_port_id))
+            if not loads:
+                del self.fanout[(second_device_id, second_port_id)]
+            self.version += 1
+            error_type = self.NO_ERROR
 
         return error_type
 
@@ -204,23 +417,160 @@ class Network:
                     return False
         return True
 
+    def set_cone(self, device_ids):
+        """Execute only the given devices and the devices they depend on.
+
+        If device_ids is None, every device is executed again.
+        """
+        if device_ids is None:
+            if self.cone is not None:
+                self.cone = None
+                self.version += 1
+            return
+        self.cone = set()
+        self.version += 1
+        for device_id in device_ids:
+            self.add_to_cone(device_id)
+
+    def add_to_cone(self, device_id):
+        """Add the device and every device it depends on to the cone.
+
+        Devices already in the cone are not visited again, so only the part
+        of the fan-in that is new is walked. A merged gate depends on the
+        gate that drives its output. Return True if the cone grew. Does
+        nothing if the network is not pruned.
+        """
+        cone = self.cone
+        if cone is None or device_id in cone \
+                or self.devices.get_device(device_id) is None:
+            return False
+        net_devices = self.devices.net_table.net_devices
+        cone.add(device_id)
+        stack = [device_id]
+        while stack:
+            device = self.devices.get_device(stack.pop())
+            driver_ids = [net_devices[net_id]
+                          for net_id in device.output_nets]
+            for connected_output in device.inputs.values():
+                if connected_output is not None:
+                    driver_ids.append(connected_output[0])
+            for driver_id in driver_ids:
+                if driver_id not in cone:
+                    cone.add(driver_id)
+                    stack.append(driver_id)
+        self.version += 1
+        return True
+
+    def merge_duplicate_gates(self):
+        """Merge the gates that duplicate other gates.
+
+        A duplicate is a gate of the same kind as an earlier gate, reading
+        the same nets and at the same output level, so both always settle
+        to the same level. The output of a duplicate becomes the net of the
+        gate it duplicates. If the network is pruned, the gate a duplicate
+        in the cone is merged into joins the cone, as it now drives the
+        duplicate's output. Return the number of gates merged.
+        """
+        devices = self.devices
+        duplicates = find_duplicate_gates(devices, self)
+        for device_id, representative_id in duplicates.items():
+            device = devices.get_device(device_id)
+            self.merged_nets[device_id] = device.output_nets[0]
+            device.output_nets = [devices.get_net(representative_id, None)]
+            if self.cone is not None and device_id in self.cone:
+                self.add_to_cone(representative_id)
+        if duplicates:
+            self.version += 1
+        return len(duplicates)
+
+    def unmerge_gates(self):
+        """Give every merged gate its own output net again.
+
+        Each net is set to the level of the net the gate was merged into.
+        """
+        if not self.merged_nets:
+            return
+        signals = self.devices.net_table.signals
+        for device_id, net_id in self.merged_nets.items():
+            device = self.devices.get_device(device_id)
+            signals[net_id] = signals[device.output_nets[0]]
+            device.output_nets = [net_id]
+        self.merged_nets = {}
+        self.version += 1
+
+    def map_lookup_tables(self, max_inputs, device_ids=()):
+        """Execute the cones of gates with up to max_inputs inputs as tables.
+
+        The outputs of the given devices are kept up to date. If max_inputs
+        is None, every gate is executed on its own again.
+        """
+        self.lut_inputs = max_inputs
+        self.kept_devices.update(device_ids)
+        self.version += 1
+
+    def memoise_blocks(self, size, groups=None, device_ids=()):
+        """Remember the outputs of blocks of gates for their recent inputs.
+
+        Each block remembers up to size sets of input levels, dropping the
+        least recently used. If groups is None, every set of connected
+        gates outside loops is a block. If not, groups is a list of lists
+        of gate IDs, one for each block. The outputs of the given devices
+        are kept up to date. If size is None, every gate is executed on its
+        own again.
+
+        A block settles in a single pass, where its gates would step through
+        RISING or FALLING one pass after another, so the gates driving the
+        CLK, SET and CLEAR inputs of D-types are never put in a block and
+        the D-types see the same edges. Blocks also settle in fewer passes
+        than their gates, so a cycle that only ran out of passes because of
+        those gates settles instead of being reported as oscillating.
+        """
+        self.memo_size = size
+        self.memo_groups = None if groups is None else \
+            [list(device_ids) for device_ids in groups]
+        self.kept_devices.update(device_ids)
+        self.version += 1
+
+    def get_memo_counts(self):
+        """Return (hits, misses) of the block caches of the current plan."""
+        plan = self.get_execution_plan()
+        return (sum(block.hits for block in plan.memo_blocks),
+                sum(block.misses for block in plan.memo_blocks))
+
+    def keep_device(self, device_id):
+        """Keep the outputs of the device up to date when gates are mapped.
+
+        The device's gate is taken out of any lookup table it was part of,
+        and becomes an output of its block, from the next cycle.
+        """
+        if (self.lut_inputs is None and self.memo_size is None) \
+                or device_id in self.kept_devices:
+            return
+        self.kept_devices.add(device_id)
+        self.version += 1
+
+    def get_execution_plan(self):
+        """Return the execution plan for the current devices and connections.
+
+        The plan is only rebuilt after devices are added or connections are
+        made or removed.
+        """
+        if self.execution_plan is None \
+                or not self.execution_plan.is_current():
+            self.execution_plan = ExecutionPlan(self.devices, self)
+        return self.execution_plan
+
     def update_signal(self, signal, target):
         """Update the signal in the direction of the target.
 
         Return updated signal, and set steady_state to false if the new signal
         is different from the old signal.
         """
-        if signal in [self.devices.LOW, self.devices.FALLING]:
-            if target == self.devices.LOW:
-                new_signal = self.devices.LOW
-            else:
-                new_signal = self.devices.RISING
-        elif signal in [self.devices.HIGH, self.devices.RISING]:
-            if target == self.devices.LOW:
-                new_signal = self.devices.FALLING
-            else:
-                new_signal = self.devices.HIGH
-        else:
+        try:
+            new_signal = UPDATE[signal][target]
+        except (IndexError, TypeError):  # not a signal level
+            return None
+        if new_signal is None:
             return None
         if signal != new_signal:
             self.steady_state = False
@@ -231,11 +581,9 @@ class Network:
 
         Return None if the signal is not HIGH or LOW.
         """
-        if signal == self.devices.HIGH:
-            return self.devices.LOW
-        elif signal == self.devices.LOW:
-            return self.devices.HIGH
-        else:
+        try:
+            return INVERT[signal]
+        except (IndexError, TypeError):  # not a signal level
             return None
 
     def execute_switch(self, device_id):
@@ -245,15 +593,23 @@ class Network:
         if successful.
         """
         device = self.devices.get_device(device_id)
-        target = device.switch_state
-        signal = self.get_output_signal(device_id, output_id=None)
+        return self.execute_switch_net(device.switch_state,
+                                       device.outputs.get_net(None))
+
+    def execute_switch_net(self, target, net_id):
+        """Update the signal of a switch's net towards target.
+
+        Return True if successful.
+        """
+        if net_id is None:  # the switch has no output
+            return False
+        signals = self.devices.net_table.signals
         # Update and store the updated signal
-        updated_signal = self.update_signal(signal, target)
+        updated_signal = self.update_signal(signals[net_id], target)
         if updated_signal is None:  # signal update is unsuccessful
             return False
-        else:
-            device.outputs[None] = updated_signal
-            return True
+        signals[net_id] = updated_signal
+        return True
 
     def execute_gate(self, device_id, x=None, y=None):
         """Simulate a logic gate and update its output signal value.
@@ -264,35 +620,81 @@ class Network:
         LOW), (LOW, HIGH), (HIGH, LOW), (None, None).
         Return True if successful.
         """
+        plan = self.get_execution_plan()
         device = self.devices.get_device(device_id)
-        input_signal_list = []
-        for input_id in device.inputs:
-            input_signal = self.get_input_signal(device_id, input_id)
-            if input_signal is None:  # this input is unconnected
-                return False
-            input_signal_list.append(input_signal)
+        return self.execute_gate_nets(plan.get_gate_input_nets(device_id),
+                                      device.outputs.get_net(None), x, y)
 
-            if device.device_kind != self.devices.XOR:
-                if input_signal != x:
-                    output_signal = self.invert_signal(y)
-                    break
-                output_signal = y
+    def execute_gate_nets(self, input_nets, output_net, x, y):
+        """Simulate a logic gate given the net IDs it reads and writes.
 
-        if device.device_kind == self.devices.XOR:
-            # Output is high only if both inputs are different
-            # assume 2 inputs
-            if input_signal_list[0] == input_signal_list[1]:
-                output_signal = self.devices.LOW
+        Return True if successful.
+        """
+        if None in input_nets or output_net is None:  # unconnected
+            return False
+        signals = self.devices.net_table.signals
+        # Fold the inputs through the gate's table, starting from y. XOR
+        # starts from its first input instead.
+        (output_signal, table, final_signal) = GATE_FOLDS[(x, y)]
+        for net_id in input_nets:
+            if output_signal is None:
+                output_signal = signals[net_id]
             else:
-                output_signal = self.devices.HIGH
+                output_signal = table[output_signal][signals[net_id]]
+                if output_signal == final_signal:
+                    break
+
+        # Update and store the new signal
+        updated_signal = self.update_signal(signals[output_net],
+                                            output_signal)
+        if updated_signal is None:  # if the update is unsuccessful
+            return False
+        signals[output_net] = updated_signal
+        return True
+
+    def execute_lookup_table(self, input_nets, output_net, table, gates):
+        """Simulate a cone of gates mapped to a lookup table.
+
+        If every input is HIGH or LOW, the output is read from bit i of the
+        truth table, where bit j of i is set if input j is HIGH. Otherwise
+        the gates are evaluated one by one. Return True if successful.
+        """
+        signals = self.devices.net_table.signals
+        index = 0
+        bit = 1
+        for net_id in input_nets:
+            signal = signals[net_id]
+            if signal == HIGH:
+                index |= bit
+            elif signal != LOW:  # RISING or FALLING
+                output_signal = evaluate_gates(gates, signals)
+                break
+            bit <<= 1
+        else:
+            output_signal = table >> index & 1
 
         # Update and store the new signal
-        signal = self.get_output_signal(device_id, None)
-        target = output_signal
-        updated_signal = self.update_signal(signal, target)
+        updated_signal = self.update_signal(signals[output_net],
+                                            output_signal)
         if updated_signal is None:  # if the update is unsuccessful
             return False
-        device.outputs[None] = updated_signal
+        signals[output_net] = updated_signal
+        return True
+
+    def execute_memo_block(self, memo_block):
+        """Simulate a block of gates through its cache.
+
+        Every output of the block is updated towards its level for the
+        current inputs. Return True if successful.
+        """
+        signals = self.devices.net_table.signals
+        outputs = memo_block.get_outputs(signals)
+        for net_id, output_signal in zip(memo_block.output_nets, outputs):
+            updated_signal = self.update_signal(signals[net_id],
+                                                output_signal)
+            if updated_signal is None:  # if the update is unsuccessful
+                return False
+            signals[net_id] = updated_signal
         return True
 
     def execute_d_type(self, device_id):
@@ -300,48 +702,43 @@ class Network:
 
         Return True if successful.
         """
+        plan = self.get_execution_plan()
         device = self.devices.get_device(device_id)
+        return self.execute_d_type_nets(*plan.get_d_type_nets(device))
 
-        for input_id in device.inputs:
-            input_signal = self.get_input_signal(device_id, input_id)
-            if input_signal is None:  # if the input is unconnected
-                return False
-            if input_id == self.devices.CLK_ID:
-                clock_signal = input_signal
-            elif input_id == self.devices.DATA_ID:
-                data_signal = input_signal
-            elif input_id == self.devices.CLEAR_ID:
-                clear_signal = input_signal
-            elif input_id == self.devices.SET_ID:
-                set_signal = input_signal
+    def execute_d_type_nets(self, device_index, input_nets, Q_net, QBAR_net):
+        """Simulate a D-type device given the net IDs it reads and writes.
+
+        input_nets are the net IDs connected to CLK, SET, CLEAR and DATA.
+        Return True if successful.
+        """
+        if None in input_nets or Q_net is None or QBAR_net is None:
+            return False
+        signals = self.devices.net_table.signals
+        memory = self.devices.net_table.memory
+        (clock_net, set_net, clear_net, data_net) = input_nets
 
         # Set D-type memory depending on the input signal
-        if clock_signal == self.devices.RISING:
-            if data_signal in [self.devices.HIGH, self.devices.FALLING]:
-                device.dtype_memory = self.devices.HIGH
-            elif data_signal in [self.devices.LOW, self.devices.RISING]:
-                device.dtype_memory = self.devices.LOW
-        if set_signal == self.devices.HIGH:
-            device.dtype_memory = self.devices.HIGH
-        if clear_signal == self.devices.HIGH:
-            device.dtype_memory = self.devices.LOW
-
-        if self.devices.Q_ID not in device.outputs:
-            if self.devices.QBAR_ID not in device.outputs:
-                return False
-        Q_signal = device.outputs[self.devices.Q_ID]
-        QBAR_signal = device.outputs[self.devices.QBAR_ID]
+        stored = memory[device_index]
+        if signals[clock_net] == self.devices.RISING:
+            sample = SAMPLE[signals[data_net]]
+            if sample is not None:
+                stored = sample
+        if signals[set_net] == self.devices.HIGH:
+            stored = self.devices.HIGH
+        if signals[clear_net] == self.devices.HIGH:
+            stored = self.devices.LOW
+        if stored == NetTable.NO_MEMORY:  # memory was never initialised
+            return False
+        memory[device_index] = stored
 
         # Update the output towards its memory
-        new_Q = self.update_signal(Q_signal, device.dtype_memory)
-        new_QBAR = self.update_signal(
-            QBAR_signal, self.invert_signal(device.dtype_memory)
-        )
+        new_Q = self.update_signal(signals[Q_net], stored)
+        new_QBAR = self.update_signal(signals[QBAR_net], INVERT[stored])
         if new_Q is None or new_QBAR is None:  # if the update is unsuccessful
             return False
-        device.outputs[self.devices.Q_ID] = new_Q
-        device.outputs[self.devices.QBAR_ID] = new_QBAR
-
+        signals[Q_net] = new_Q
+        signals[QBAR_net] = new_QBAR
         return True
 
     def execute_clock(self, device_id):
@@ -350,103 +747,251 @@ class Network:
         Return True if successful.
         """
         device = self.devices.get_device(device_id)
-        output_signal = device.outputs[None]  # output ID is None
+        return self.execute_clock_net(device.outputs.get_net(None))
 
-        if output_signal == self.devices.RISING:
-            new_signal = self.update_signal(output_signal,
-                                            self.devices.HIGH)
-            if new_signal is None:  # update is unsuccessful
-                return False
-            device.outputs[None] = new_signal
-            return True
-
-        elif output_signal == self.devices.FALLING:
-            new_signal = self.update_signal(output_signal, self.devices.LOW)
-            if new_signal is None:  # update is unsuccessful
-                return False
-            device.outputs[None] = new_signal
-            return True
+    def execute_clock_net(self, net_id):
+        """Settle the signal of a clock's net.
 
-        elif output_signal in [self.devices.HIGH, self.devices.LOW]:
-            return True
+        Return True if successful.
+        """
+        if net_id is None:  # the clock has no output
+            return False
+        signals = self.devices.net_table.signals
+        output_signal = signals[net_id]
 
-        else:
+        # RISING and FALLING clocks settle; HIGH and LOW clocks stay put
+        new_signal = self.update_signal(output_signal,
+                                        SETTLED[output_signal])
+        if new_signal is None:  # update is unsuccessful
             return False
+        signals[net_id] = new_signal
+        return True
+
+    def get_clock_calendar(self):
+        """Return the calendar of clock edges for the current clocks.
+
+        The calendar is rebuilt when the execution plan changes or a clock
+        counter is set from outside the simulation.
+        """
+        plan = self.get_execution_plan()
+        if self.clock_calendar is None \
+                or self.clock_calendar_plan is not plan \
+                or not self.clock_calendar.is_current():
+            self.clock_calendar = ClockCalendar(self.devices.net_table,
+                                                plan.clock_devices)
+            self.clock_calendar_plan = plan
+        return self.clock_calendar
 
     def update_clocks(self):
-        """If it is time to do so, set clock signals to RISING or FALLING."""
-        clock_devices = self.devices.find_devices(self.devices.CLOCK)
-        for device_id in clock_devices:
-            device = self.devices.get_device(device_id)
-            if device.clock_counter == device.clock_half_period:
-                device.clock_counter = 0
-                output_signal = self.get_output_signal(device_id,
-                                                       output_id=None)
-                if output_signal == self.devices.HIGH:
-                    device.outputs[None] = self.devices.FALLING
-                elif output_signal == self.devices.LOW:
-                    device.outputs[None] = self.devices.RISING
-            device.clock_counter += 1
-
-    def execute_network(self):
+        """If it is time to do so, set clock signals to RISING or FALLING.
+
+        Only the clocks due to change this cycle are visited, and the cycle
+        count of the net table is advanced, which advances every clock
+        counter. Return the (device, net ID) pairs of the clocks changed.
+        """
+        net_table = self.devices.net_table
+        signals = net_table.signals
+        due = self.get_clock_calendar().pop_due()
+        for device, net_id in due:
+            output_signal = signals[net_id]
+            if output_signal == self.devices.HIGH:
+                signals[net_id] = self.devices.FALLING
+            elif output_signal == self.devices.LOW:
+                signals[net_id] = self.devices.RISING
+        net_table.cycle += 1
+        return due
+
+    def get_gate_schedule(self):
+        """Return the gates to execute in this cycle.
+
+        The gates are (input net IDs, output net ID, x, y) tuples, as in the
+        execution plan. If fold_constants is set, the gates whose outputs
+        are fixed by the switch states are left out once the network has
+        settled. Setting a switch puts the gates it drives back in. The
+        constants are found again when the execution plan changes.
+        """
+        plan = self.get_execution_plan()
+        if not self.fold_constants:
+            return plan.gate_devices
+        changed_switches = self.devices.net_table.changed_switches
+        if self.switch_constants is None \
+                or self.switch_constants_plan is not plan:
+            self.switch_constants = SwitchConstants(plan.switch_devices,
+                                                    plan.gate_devices)
+            self.switch_constants_plan = plan
+            changed_switches.clear()
+        elif changed_switches:
+            self.switch_constants.update_switches(changed_switches)
+            changed_switches.clear()
+        elif self.settled:
+            self.switch_constants.fold(self.devices.net_table.signals)
+        return self.switch_constants.schedule
+
+    def execute_gate_pass(self, gate_devices):
+        """Execute the gates in order for one pass.
+
+        Return True if successful.
+        """
+        for input_nets, output_net, x, y in gate_devices:
+            if not self.execute_gate_nets(input_nets, output_net, x, y):
+                return False
+        return True
+
+    def execute_network(self, execute_gates=None):
         """Execute all the devices in the network for one simulation cycle.
 
-        Return True if successful and the network does not oscillate.
+        The gates of each pass are executed by execute_gates(gate_devices),
+        which defaults to execute_gate_pass. Return True if successful and
+        the network does not oscillate.
         """
-        clock_devices = self.devices.find_devices(self.devices.CLOCK)
-        switch_devices = self.devices.find_devices(self.devices.SWITCH)
-        d_type_devices = self.devices.find_devices(self.devices.D_TYPE)
-        and_devices = self.devices.find_devices(self.devices.AND)
-        or_devices = self.devices.find_devices(self.devices.OR)
-        nand_devices = self.devices.find_devices(self.devices.NAND)
-        nor_devices = self.devices.find_devices(self.devices.NOR)
-        xor_devices = self.devices.find_devices(self.devices.XOR)
+        plan = self.get_execution_plan()
+        gate_devices = self.get_gate_schedule()
+        if execute_gates is None:
+            execute_gates = self.execute_gate_pass
+        self.settled = False
 
         # This sets clock signals to RISING or FALLING, where necessary
-        self.update_clocks()
+        changed_clocks = self.update_clocks()
 
-        # Number of iterations to wait for the signals to settle before
-        # declaring the network unstable
-        iteration_limit = 20
+        iteration_limit = self.iteration_limit
+        if iteration_limit is None:
+            iteration_limit = plan.iteration_limit
+        signals = self.devices.net_table.signals
+        self.oscillating_loops = []
 
         iterations = 0
+        # changed_nets set stores the nets that changed in the final two
+        # passes, to find the oscillating loop if the network does not settle
+        changed_nets = set()
         while iterations < iteration_limit:
             iterations += 1
             self.steady_state = True
+            final_pass = iterations > iteration_limit - 2
+            if final_pass:
+                previous_signals = array("b", signals)
 
-            for device_id in switch_devices:  # execute switch devices
-                if not self.execute_switch(device_id):
+            # execute switch devices
+            for device, net_id in plan.switch_devices:
+                if not self.execute_switch_net(device.switch_state, net_id):
                     return False
             # Execute D-type devices before clocks to catch the rising
             # edge of the clock
-            for device_id in d_type_devices:  # execute DTYPE devices
-                if not self.execute_d_type(device_id):
-                    return False
-            for device_id in clock_devices:  # complete clock executions
-                if not self.execute_clock(device_id):
+            for d_type_nets in plan.d_type_devices:  # execute DTYPE devices
+                if not self.execute_d_type_nets(*d_type_nets):
                     return False
-            for device_id in and_devices:  # execute AND gate devices
-                if not self.execute_gate(
-                        device_id, self.devices.HIGH, self.devices.HIGH
-                ):
+            # Complete clock executions. Only the clocks changed this cycle
+            # are RISING or FALLING, the others are settled.
+            for device, net_id in changed_clocks:
+                if not self.execute_clock_net(net_id):
                     return False
-            for device_id in or_devices:  # execute OR gate devices
-                if not self.execute_gate(device_id, self.devices.LOW,
-                                         self.devices.LOW):
-                    return False
-            for device_id in nand_devices:  # execute NAND gate devices
-                if not self.execute_gate(
-                        device_id, self.devices.HIGH, self.devices.LOW
-                ):
-                    return False
-            for device_id in nor_devices:  # execute NOR gate devices
-                if not self.execute_gate(
-                        device_id, self.devices.LOW, self.devices.HIGH
-                ):
+            # Execute gates in the order AND, OR, NAND, NOR, XOR, NOT
+            if not execute_gates(gate_devices):
+                return False
+            for lookup_table in plan.lookup_tables:
+                if not self.execute_lookup_table(*lookup_table):
                     return False
-            for device_id in xor_devices:  # execute XOR devices
-                if not self.execute_gate(device_id, None, None):
+            for memo_block in plan.memo_blocks:
+                if not self.execute_memo_block(memo_block):
                     return False
             if self.steady_state:
                 break
+            if final_pass:
+                changed_nets.update(
+                    net_id for net_id, (previous, signal)
+                    in enumerate(zip(previous_signals, signals))
+                    if previous != signal)
+        if not self.steady_state:
+            self.oscillating_loops = self.find_oscillating_loops(
+                changed_nets)
+        self.settled = self.steady_state
         return self.steady_state
+
+    def quiet_cycles(self, limit):
+        """Return the number of following cycles in which nothing can change.
+
+        Once the network has settled, executing it again changes no signal
+        and no D-type memory, unless a switch is set to a new state or a
+        clock reaches the end of its half period. A quiet cycle only
+        advances the clock counters. Return the number of quiet cycles
+        before the next clock edge, at most limit, or 0 if the last cycle
+        did not settle or the network has changed since.
+        """
+        plan = self.execution_plan
+        if not self.settled or plan is None or not plan.is_current():
+            return 0
+        signals = self.devices.net_table.signals
+        for device, net_id in plan.switch_devices:
+            if signals[net_id] != device.switch_state:
+                return 0
+        next_edge = self.get_clock_calendar().next_edge()
+        if next_edge is None:  # no clock will change
+            return limit
+        return max(min(limit, next_edge - self.devices.net_table.cycle), 0)
+
+    def skip_cycles(self, cycles):
+        """Advance the clocks through quiet cycles without executing them.
+
+        cycles must not be more than quiet_cycles returned. All the clock
+        counters advance together with the cycle count of the net table.
+        """
+        self.devices.net_table.cycle += cycles
+
+    def get_state_digest(self):
+        """Return a digest of the state that determines the following cycles.
+
+        The state is every signal level, D-type memory, clock counter and
+        switch state. Two cycles that start from the same state go on to
+        repeat the same signals, as long as no device or connection
+        changes. A clock counter past its half period never toggles the
+        clock again, so all such counters are treated as equal.
+        """
+        net_table = self.devices.net_table
+        plan = self.get_execution_plan()
+        counters = array("q")
+        for device, net_id in plan.clock_devices:
+            counter = device.clock_counter
+            if counter is None:
+                counters.append(-1)
+            else:
+                counters.append(min(counter, device.clock_half_period + 1))
+        switch_states = bytes(device.switch_state
+                              for device, net_id in plan.switch_devices)
+        state = hashlib.blake2b(digest_size=16)
+        for part in [net_table.signals, net_table.memory, counters]:
+            state.update(part.tobytes())
+        state.update(switch_states)
+        return state.digest()
+
+    def find_oscillating_loops(self, net_ids):
+        """Return the loops of devices that drive the given nets.
+
+        Only connections between the devices driving net_ids are followed,
+        so given the nets that kept changing, the loops found are the ones
+        that oscillate. Each loop is a list of device IDs, in the order the
+        devices were made.
+        """
+        devices = self.devices
+        net_devices = devices.net_table.net_devices
+        changed_devices = {net_devices[net_id] for net_id in net_ids}
+
+        def successors(device_id):
+            loads = set()
+            for output_id in devices.get_device(device_id).outputs:
+                for input_device_id, input_id in self.fanout.get(
+                        (device_id, output_id), []):
+                    loads.add(input_device_id)
+            return loads
+
+        order = {device_id: position for position, device_id
+                 in enumerate(devices.find_devices())}
+        loops = [sorted(loop, key=order.get) for loop
+                 in find_loops(sorted(changed_devices, key=order.get),
+                               successors)]
+        loops.sort(key=lambda loop: order[loop[0]])
+        return loops
+
+    def get_oscillating_loop_names(self):
+        """Return a list of device names for each oscillating loop."""
+        return [[self.names.get_name_string(device_id)
+                 for device_id in loop]
+                for loop in self.oscillating_loops]
@@ -16,9 +16,14 @@ from network import Network
 from monitors import Monitors
 import logging
 import sys
-import wx
 
-_ = wx.GetTranslation
+try:
+    import wx
+    _ = wx.GetTranslation
+except ImportError:  # wxPython is only needed by the graphical interface
+    def _(text):
+        """Return text untranslated when wxPython is not installed."""
+        return text
 
 
 class Parser:
@@ -37,11 +42,16 @@ class Parser:
     network: instance of the network.Network() class.
     monitors: instance of the monitors.Monitors() class.
     scanner: instance of the scanner.Scanner() class.
+    logger: logger for debugging and error messages.
+    progress_callback: optional, called as progress_callback(characters_read,
+                       statement_count) after every statement.
 
     Public methods
     --------------
     parse_network(self): Parses the circuit definition file as per EBNF spec.
 
+    report_progress(self): Counts a parsed statement and reports progress.
+
     make_monitor(self): Parse the monitor line.
 
     create_conn(self): Parse connection creation.
@@ -73,7 +83,8 @@ class Parser:
 
     """
 
-    def __init__(self, names, devices, network, monitors, scanner, logger):
+    def __init__(self, names, devices, network, monitors, scanner, logger,
+                 progress_callback=None):
         """Initialise constants."""
         self.names = names
         self.scanner = scanner
@@ -85,6 +96,8 @@ class Parser:
         self.error_count = 0
         self.error_string = ""  # when new error encountered add $
         self.logger = logger
+        self.progress_callback = progress_callback
+        self.statement_count = 0  # devices, connections and monitor lines
 
         self.semantic_error_dict = {
             "INPUT_TO_INPUT": _("Input is connected to an input."),
@@ -259,6 +272,7 @@ class Parser:
         else:
             pass
         self.logger.debug("-Monitor point ended")
+        self.report_progress()
 
     def create_conn(self):
         """Parse connection creation as per EBNF spec."""
@@ -324,6 +338,7 @@ class Parser:
         if self.symbol.type != self.scanner.SEMICOLON:
             self.error("SEMICOLON_EXPECTED")
         self.logger.debug("-Connection Ended")
+        self.report_progress()
 
     def device(self):
         """Parse devices as per EBNF spec."""
@@ -352,6 +367,14 @@ class Parser:
             self.not_devices(self.symbol.id)
         else:
             self.error("DEVICE_TYPE_NOT_DECLARED")
+        self.report_progress()
+
+    def report_progress(self):
+        """Count a parsed statement and report progress to the callback."""
+        self.statement_count += 1
+        if self.progress_callback is not None:
+            self.progress_callback(self.scanner.characters_read,
+                                   self.statement_count)
 
     def gate_devices(self, device_kind):
         """Parse and create device."""
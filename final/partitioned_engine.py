@@ -0,0 +1,384 @@
+"""Execute the gates of a logic network in several processes.
+
+Used in the Logic Simulator project to spread the gates of a large network
+over several cores, as one Python process only ever runs on one core.
+
+Classes
+-------
+PartitionedEngine - executes a network with its gates split between
+                    processes.
+
+Functions
+---------
+partition_gates - splits a list of gates into balanced partitions that cut
+                  few nets.
+get_pass_levels - returns the level of each gate within one pass.
+execute_partition - executes one partition of the gates for one pass.
+run_worker - runs one partition in a worker process.
+"""
+import collections
+import multiprocessing
+import os
+from array import array
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7 has no shared memory module
+    shared_memory = None
+
+from signal_tables import UPDATE, GATE_FOLDS
+
+# Commands written to the shared memory for the worker processes
+[RUN, STOP] = range(2)
+# Results of a partition for one pass
+[STEADY, CHANGED, FAILED] = range(3)
+
+
+def partition_gates(gate_devices, parts):
+    """Return the partition number of each gate in gate_devices.
+
+    gate_devices is a list of (input net IDs, output net ID, x, y) tuples,
+    see Network.execute_gate. Each partition gets at most ceil(gates /
+    parts) gates. The partitions are grown breadth first along the nets
+    between gates, so that connected gates end up together, and each gate
+    is then moved to the partition holding most of its neighbours if there
+    is room for it.
+    """
+    gate_count = len(gate_devices)
+    capacity = -(-gate_count // parts)
+    drivers = {}
+    for position, (input_nets, output_net, x, y) in enumerate(gate_devices):
+        drivers[output_net] = position
+    # neighbours list stores [gate position, ...] for each gate, that is
+    # the gates it reads and the gates reading it
+    neighbours = [[] for position in range(gate_count)]
+    for position, (input_nets, output_net, x, y) in enumerate(gate_devices):
+        for net_id in input_nets:
+            driver = drivers.get(net_id)
+            if driver is not None and driver != position:
+                neighbours[position].append(driver)
+                neighbours[driver].append(position)
+
+    part_of = [None] * gate_count
+    sizes = [0] * parts
+    part = 0
+    queue = collections.deque()
+    for seed in range(gate_count):
+        queue.append(seed)
+        while queue:
+            position = queue.popleft()
+            if part_of[position] is not None:
+                continue
+            if sizes[part] == capacity:
+                part += 1
+            part_of[position] = part
+            sizes[part] += 1
+            queue.extend(neighbour for neighbour in neighbours[position]
+                         if part_of[neighbour] is None)
+
+    # Move each gate to the partition most of its neighbours are in
+    for position in range(gate_count):
+        counts = collections.Counter(part_of[neighbour]
+                                     for neighbour in neighbours[position])
+        if not counts:
+            continue
+        [(best, count)] = counts.most_common(1)
+        current = part_of[position]
+        if best != current and count > counts[current] \
+                and sizes[best] < capacity:
+            part_of[position] = best
+            sizes[best] += 1
+            sizes[current] -= 1
+    return part_of
+
+
+def get_pass_levels(gate_devices):
+    """Return the level of each gate in gate_devices within one pass.
+
+    In one pass, Network.execute_network executes the gates in order, so a
+    gate reads the new output of a gate before it and the old output of a
+    gate after it. Each gate is therefore put on a higher level than every
+    gate before it that it reads or that reads it. Executing the levels in
+    turn, with the gates of a level in any order, gives the same signals as
+    executing the gates in order.
+    """
+    drivers = {}
+    for position, (input_nets, output_net, x, y) in enumerate(gate_devices):
+        drivers[output_net] = position
+    # earlier list stores [gate position, ...] for each gate, that is the
+    # gates before it that it reads or that read it
+    earlier = [[] for gate in gate_devices]
+    for position, (input_nets, output_net, x, y) in enumerate(gate_devices):
+        for net_id in input_nets:
+            driver = drivers.get(net_id)
+            if driver is None or driver == position:
+                continue
+            if driver < position:
+                earlier[position].append(driver)
+            else:
+                earlier[driver].append(position)
+    levels = []
+    for position in range(len(gate_devices)):
+        levels.append(max((levels[other] + 1 for other in earlier[position]),
+                          default=0))
+    return levels
+
+
+def execute_partition(signals, gates):
+    """Execute one partition of the gates in order, for one pass.
+
+    gates is a list of (input net IDs, output net ID, x, y) tuples, see
+    Network.execute_gate, which write their outputs to signals. Return
+    STEADY, CHANGED or FAILED.
+    """
+    status = STEADY
+    for input_nets, output_net, x, y in gates:
+        if None in input_nets or output_net is None:  # unconnected
+            status = FAILED
+            continue
+        (output_signal, table, final_signal) = GATE_FOLDS[(x, y)]
+        for net_id in input_nets:
+            if output_signal is None:
+                output_signal = signals[net_id]
+            else:
+                output_signal = table[output_signal][signals[net_id]]
+                if output_signal == final_signal:
+                    break
+        signal = signals[output_net]
+        updated_signal = UPDATE[signal][output_signal]
+        if updated_signal is None:  # if the update is unsuccessful
+            status = FAILED
+        elif updated_signal != signal:
+            signals[output_net] = updated_signal
+            if status == STEADY:
+                status = CHANGED
+    return status
+
+
+def run_worker(memory_name, worker_count, index, start, net_count,
+               owned_count, gates, barrier):
+    """Run one partition of the gates in a worker process.
+
+    The shared memory holds the command, the result of each partition and
+    the nets exchanged with each worker, see PartitionedEngine. The
+    worker's nets start at start and are numbered as in gates, with the
+    nets it drives first. On every RUN command, the worker reads its nets,
+    executes its gates and writes back the nets it drives. It returns on
+    the STOP command.
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    command = memory.buf[0:1]
+    statuses = memory.buf[1:1 + worker_count]
+    exchange = memory.buf[start:start + net_count].cast("b")
+    signals = array("b", bytes(net_count))
+    try:
+        while True:
+            barrier.wait()
+            if command[0] == STOP:
+                break
+            with memoryview(signals) as view:
+                view[:] = exchange
+                statuses[index] = execute_partition(signals, gates)
+                exchange[:owned_count] = view[:owned_count]
+            barrier.wait()
+    finally:
+        for view in [command, statuses, exchange]:
+            view.release()
+        memory.close()
+
+
+class PartitionedEngine:
+    """Execute a network with its gates split between several processes.
+
+    The gates of the execution plan are split into balanced partitions
+    that cut few nets, see partition_gates, and each partition is executed
+    by its own process, this one included. The processes meet only at the
+    start and the end of each pass of the network. At the start, this
+    process writes the nets each worker reads or drives to the shared
+    memory. Each worker then executes its gates in order on its own copy
+    of those nets, while this process executes its own gates, and writes
+    back only the nets it drives, which this process copies into the
+    signals at the end of the pass. Switches, D-types, clocks, lookup
+    tables and remembered blocks are executed by this process, as in
+    Network.execute_network.
+
+    A gate therefore reads the outputs of the gates of other partitions
+    as they were at the start of the pass, which can take the network a
+    few more passes to settle. The gates that the inputs of the D-types
+    depend on, see ExecutionPlan.get_gate_drivers, are all executed by
+    this process in order, so that the D-types see the same levels and
+    edges in every pass as in the network executed on its own. The other
+    gates settle to the same levels, unless they form a loop whose final
+    levels depend on the order its gates are executed in.
+
+    The gates fixed by the switches are executed too, which changes no
+    signal. The partitions are made again when the execution plan changes.
+    With one process, or without the shared memory module of Python 3.8,
+    every gate is executed by this process.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    processes: number of processes that execute gates, this one included,
+               or None for one per core.
+
+    Public methods
+    --------------
+    execute_network(self): Executes all the devices in the network for one
+                           simulation cycle.
+
+    close(self): Stops the worker processes and frees the shared memory.
+    """
+
+    def __init__(self, network, processes=None):
+        """Initialise the engine without starting any process."""
+        self.network = network
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if shared_memory is None:
+            processes = 1
+        self.processes = max(processes, 1)
+        # Execution plan the partitions were made for
+        self.plan = None
+        # Gates executed by this process, and the number of nets read by a
+        # partition other than the one driving them
+        self.gates = []
+        self.boundary_nets = 0
+        self.workers = []
+        self.memory = None
+        self.barrier = None
+        # Net IDs held in the exchanged part of the shared memory, in
+        # order, and (position, net ID) pairs of the nets the workers drive
+        self.exchange_nets = []
+        self.owned_nets = []
+
+    def start(self, plan):
+        """Split the gates of plan into partitions and start the workers."""
+        self.close()
+        gate_devices = plan.gate_devices
+        d_type_drivers = plan.get_gate_drivers(
+            net_id for device_index, input_nets, Q_net, QBAR_net
+            in plan.d_type_devices for net_id in input_nets)
+        free_positions = [position for position, gate
+                          in enumerate(gate_devices)
+                          if gate[1] not in d_type_drivers]
+        parts = max(min(self.processes, len(free_positions)), 1)
+        part_of = [0] * len(gate_devices)
+        for position, part in zip(free_positions, partition_gates(
+                [gate_devices[position] for position in free_positions],
+                parts)):
+            part_of[position] = part
+        schedules = [[] for part in range(parts)]
+        for gate, part in zip(gate_devices, part_of):
+            schedules[part].append(gate)
+
+        driver_parts = {output_net: part for (input_nets, output_net, x, y),
+                        part in zip(gate_devices, part_of)}
+        boundary_nets = set()
+        for (input_nets, output_net, x, y), part in zip(gate_devices,
+                                                        part_of):
+            boundary_nets.update(
+                net_id for net_id in input_nets
+                if driver_parts.get(net_id, part) != part)
+        self.boundary_nets = len(boundary_nets)
+        self.gates = schedules[0]
+        self.plan = plan
+        if parts == 1:
+            return
+
+        # Each worker's nets are numbered from 0, those it drives first,
+        # and held one after another in the shared memory
+        self.exchange_nets = []
+        self.owned_nets = []
+        worker_args = []
+        for index in range(1, parts):
+            gates = schedules[index]
+            owned = [output_net for input_nets, output_net, x, y in gates
+                     if output_net is not None]
+            read = set(net_id for input_nets, output_net, x, y in gates
+                       for net_id in input_nets if net_id is not None)
+            nets = owned + sorted(read.difference(owned))
+            # local_ids dictionary stores {net ID: worker's net number}
+            local_ids = {net_id: number for number, net_id
+                         in enumerate(nets)}
+            local_ids[None] = None
+            worker_gates = [(tuple(local_ids[net_id]
+                                   for net_id in input_nets),
+                             local_ids[output_net], x, y)
+                            for input_nets, output_net, x, y in gates]
+            start = 1 + parts + len(self.exchange_nets)
+            self.owned_nets.extend(
+                (len(self.exchange_nets) + number, net_id)
+                for number, net_id in enumerate(owned))
+            self.exchange_nets.extend(nets)
+            worker_args.append((index, start, len(nets), len(owned),
+                                worker_gates))
+
+        exchange_count = len(self.exchange_nets)
+        self.memory = shared_memory.SharedMemory(
+            create=True, size=1 + parts + exchange_count)
+        self.command = self.memory.buf[0:1]
+        self.statuses = self.memory.buf[1:1 + parts]
+        self.exchange = self.memory.buf[
+            1 + parts:1 + parts + exchange_count].cast("b")
+        context = multiprocessing.get_context()
+        self.barrier = context.Barrier(parts)
+        for index, start, net_count, owned_count, gates in worker_args:
+            worker = context.Process(
+                target=run_worker, daemon=True,
+                args=(self.memory.name, parts, index, start, net_count,
+                      owned_count, gates, self.barrier))
+            worker.start()
+            self.workers.append(worker)
+
+    def close(self):
+        """Stop the worker processes and free the shared memory."""
+        if self.workers:
+            self.command[0] = STOP
+            self.barrier.wait()
+            for worker in self.workers:
+                worker.join()
+            self.workers = []
+        if self.memory is not None:
+            for view in [self.command, self.statuses, self.exchange]:
+                view.release()
+            self.memory.close()
+            self.memory.unlink()
+            self.memory = None
+        self.plan = None
+
+    def execute_gates(self, gate_devices):
+        """Execute every gate of the plan for one pass.
+
+        gate_devices is the schedule of Network.get_gate_schedule, which
+        only leaves out gates that would not change. Return True if
+        successful.
+        """
+        network = self.network
+        signals = network.devices.net_table.signals
+        if not self.workers:
+            status = execute_partition(signals, self.gates)
+        else:
+            self.exchange[:] = array("b", map(signals.__getitem__,
+                                              self.exchange_nets))
+            self.command[0] = RUN
+            self.barrier.wait()
+            status = execute_partition(signals, self.gates)
+            self.barrier.wait()
+            exchange = self.exchange
+            for position, net_id in self.owned_nets:
+                signals[net_id] = exchange[position]
+            status = max([status] + list(self.statuses[1:]))
+        if status == CHANGED:
+            network.steady_state = False
+        return status != FAILED
+
+    def execute_network(self):
+        """Execute all the devices in the network for one simulation cycle.
+
+        Return True if successful and the network does not oscillate.
+        """
+        plan = self.network.get_execution_plan()
+        if plan is not self.plan:
+            self.start(plan)
+        return self.network.execute_network(self.execute_gates)
@@ -69,6 +69,7 @@ class Scanner:
         self.names = names
         self.current_line = 1
         self.current_col = 0
+        self.characters_read = 0  # for reporting progress
 
         # <--- Create Symbol Types --->
         self.symbol_type_list = [
@@ -215,6 +216,7 @@ class Scanner:
         self.current_character = self.file.read(1)
         self.current_col += 1
         if self.current_character != "":
+            self.characters_read += 1
             if ord(self.current_character) == 10:  # newline
                 self.current_line += 1
                 self.current_col = 0
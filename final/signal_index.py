@@ -0,0 +1,111 @@
+"""Search long lists of signal names as the user types.
+
+Used in the Logic Simulator project by the signal picker dialogs, which may
+have to offer hundreds of thousands of inputs, outputs or switches.
+
+Classes
+-------
+SignalIndex - indexes a list of names for prefix and substring search.
+"""
+import bisect
+
+
+class SignalIndex:
+    """Index a list of names for prefix and substring search.
+
+    Names are referred to by their position in the original list. Searches
+    ignore case and return prefix matches first, in alphabetical order,
+    followed by the other names containing the search text, in their
+    original order. The names are sorted once when the index is built, so
+    prefix matches are found by bisection. When the search text extends the
+    previous search, only the previous matches are filtered again.
+
+    Parameters
+    ----------
+    names_list: list of name strings.
+
+    Public methods
+    --------------
+    get_name(self, position): Returns the name at position.
+
+    get_position(self, name): Returns the position of name, or None if it is
+                              not in the index.
+
+    get_positions(self, names_list): Returns the positions of the names
+                                     that are in the index.
+
+    search(self, text): Returns the positions of the names matching text.
+    """
+
+    def __init__(self, names_list):
+        """Build the sorted index and the name lookup dictionary."""
+        self.names_list = list(names_list)
+        self.lower_names = [name.lower() for name in self.names_list]
+        # Positions sorted by lower case name, for prefix bisection
+        self.sorted_positions = sorted(range(len(self.names_list)),
+                                       key=self.lower_names.__getitem__)
+        self.sorted_names = [self.lower_names[position]
+                             for position in self.sorted_positions]
+        self.positions = {}
+        for position, name in enumerate(self.names_list):
+            self.positions.setdefault(name, position)
+
+        # The last search, reused when the user types more characters
+        self.last_text = ""
+        self.last_matches = list(range(len(self.names_list)))
+
+    def __len__(self):
+        """Return the number of names in the index."""
+        return len(self.names_list)
+
+    def get_name(self, position):
+        """Return the name at position."""
+        return self.names_list[position]
+
+    def get_position(self, name):
+        """Return the position of name, or None if it is not present."""
+        return self.positions.get(name)
+
+    def get_positions(self, names_list):
+        """Return the positions of the names in names_list that are present."""
+        positions = []
+        for name in names_list:
+            position = self.positions.get(name)
+            if position is not None:
+                positions.append(position)
+        return positions
+
+    def search(self, text):
+        """Return the positions of the names that contain text.
+
+        Names starting with text come first, sorted alphabetically. An empty
+        text matches every name, in the original order.
+        """
+        text = text.lower()
+        if not text:
+            matches = list(range(len(self.names_list)))
+        elif self.last_text and text.startswith(self.last_text):
+            # Every match must also have matched the shorter text
+            prefix_matches = []
+            other_matches = []
+            for position in self.last_matches:
+                name = self.lower_names[position]
+                if name.startswith(text):
+                    prefix_matches.append(position)
+                elif text in name:
+                    other_matches.append(position)
+            other_matches.sort()
+            matches = prefix_matches + other_matches
+        else:
+            start = bisect.bisect_left(self.sorted_names, text)
+            # No name starting with text sorts after this
+            end = bisect.bisect_left(self.sorted_names, text + "\U0010ffff",
+                                     start)
+            matches = self.sorted_positions[start:end]
+            matches += [position
+                        for position, name in enumerate(self.lower_names)
+                        if text in name and not name.startswith(text)]
+
+        self.last_text = text
+        self.last_matches = matches
+        return matches
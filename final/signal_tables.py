@@ -0,0 +1,72 @@
+"""Precomputed tables for the five-state signal algebra.
+
+Used in the Logic Simulator project by every simulation engine, so that
+signal transitions and gate outputs are found by indexing small tables
+rather than by testing the signal against lists of levels on every call.
+
+Signal levels are the small integers used by the devices.Devices() class:
+LOW, HIGH, RISING, FALLING and BLANK are 0 to 4. Tables are tuples indexed
+by these levels, and contain None where the result is undefined.
+
+Functions
+---------
+make_gate_table - returns the fold table for an AND-like gate.
+"""
+
+[LOW, HIGH, RISING, FALLING, BLANK] = range(5)
+SIGNALS = range(5)
+
+# INVERT[signal] is the inverse of a HIGH or LOW signal
+INVERT = (HIGH, LOW, None, None, None)
+
+# SETTLED[signal] is the level a signal settles to: RISING settles HIGH and
+# FALLING settles LOW. Clocks move towards this level.
+SETTLED = (LOW, HIGH, HIGH, LOW, None)
+
+# UPDATE[signal][target] is the signal after one step towards target.
+# A LOW or FALLING signal steps to RISING if the target is HIGH, and a HIGH
+# or RISING signal steps to FALLING if the target is LOW.
+UPDATE = (
+    (LOW, RISING, RISING, RISING, RISING),  # from LOW
+    (FALLING, HIGH, HIGH, HIGH, HIGH),  # from HIGH
+    (FALLING, HIGH, HIGH, HIGH, HIGH),  # from RISING
+    (LOW, RISING, RISING, RISING, RISING),  # from FALLING
+    (None, None, None, None, None),  # BLANK cannot be updated
+)
+
+# SAMPLE[data] is the value a D-type stores on a rising clock edge. The data
+# input is read at its level before the edge, so a FALLING input is HIGH.
+SAMPLE = (LOW, HIGH, LOW, HIGH, None)
+
+
+def make_gate_table(x, y):
+    """Return the fold table for a gate whose output is y if all inputs are x.
+
+    table[output][signal] is the gate output after one more input signal,
+    given its output for the inputs before. The fold starts from y and the
+    output becomes the inverse of y as soon as an input is not x.
+    """
+    not_y = INVERT[y]
+    table = []
+    for output in SIGNALS:
+        table.append(tuple(
+            y if output == y and signal == x else not_y
+            for signal in SIGNALS))
+    return tuple(table)
+
+
+# XOR[first][second] is HIGH if the two inputs differ, and LOW if not
+XOR = tuple(tuple(LOW if first == second else HIGH for second in SIGNALS)
+            for first in SIGNALS)
+
+# GATE_FOLDS[(x, y)] is (initial output, fold table, final output) for the
+# (x, y) rules used by Network.execute_gate. Once the fold reaches the final
+# output, the remaining inputs cannot change it. XOR starts from its first
+# input and has no final output.
+GATE_FOLDS = {
+    (HIGH, HIGH): (HIGH, make_gate_table(HIGH, HIGH), LOW),  # AND
+    (LOW, LOW): (LOW, make_gate_table(LOW, LOW), HIGH),  # OR
+    (HIGH, LOW): (LOW, make_gate_table(HIGH, LOW), HIGH),  # NAND and NOT
+    (LOW, HIGH): (HIGH, make_gate_table(LOW, HIGH), LOW),  # NOR
+    (None, None): (None, XOR, None),  # XOR
+}
@@ -0,0 +1,180 @@
+"""Run the logic network for many simulation cycles.
+
+Used in the Logic Simulator project to run long simulations outside the user
+interface thread, so that the interface can show progress and cancel the run.
+
+Classes
+-------
+Simulator - runs the network for a number of cycles and records monitors.
+SimulationWorker - runs a Simulator in a background thread.
+"""
+import threading
+import time
+
+
+class Simulator:
+    """Run the network for a number of cycles and record the monitors.
+
+    The simulator executes the network one cycle at a time and records the
+    monitored signals after every successful cycle. Once the network has
+    settled, the cycles before the next clock edge cannot change any
+    signal, so they are not executed: the clocks are advanced and the
+    monitors record the unchanged signals for all of them at once. A run can
+    be cancelled from another thread, and progress is reported at most once
+    every progress_interval seconds.
+
+    If detect_period is True, a digest of the network state is stored after
+    every step. When a state recurs, the network has entered a periodic
+    regime, so the monitors are filled in by repeating the last period and
+    only the cycles left over after a whole number of periods are run.
+
+    The cycles are executed by engine, which defaults to the network
+    itself. Any object with an execute_network method that executes the
+    network, such as partitioned_engine.PartitionedEngine, can be used.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    progress_interval: minimum time in seconds between progress reports.
+    detect_period: if True, stop simulating once the state repeats and
+                   repeat the recorded period instead.
+    engine: object that executes the network one cycle at a time, or None
+            to execute it with the network.
+
+    Public methods
+    --------------
+    run(self, cycles, progress_callback=None): Runs the network for the
+                          specified number of cycles and returns the number
+                          of cycles completed.
+
+    cancel(self): Requests that the current run stops after the cycle in
+                  progress.
+
+    is_cancelled(self): Returns True if the run has been cancelled.
+    """
+
+    # Most states stored while looking for a period
+    max_states = 1000000
+
+    def __init__(self, network, monitors, progress_interval=0.2,
+                 detect_period=False, engine=None):
+        """Initialise the run state."""
+        self.network = network
+        self.engine = network if engine is None else engine
+        self.monitors = monitors
+        self.progress_interval = progress_interval
+        self.detect_period = detect_period
+        # Period found during the last run, or None
+        self.period = None
+
+        # Set if the network failed to settle during the last run
+        self.oscillating = False
+        self.cancel_event = threading.Event()
+
+    def run(self, cycles, progress_callback=None):
+        """Run the network for the specified number of simulation cycles.
+
+        progress_callback(cycles_completed) is called from the running thread
+        whenever progress_interval seconds have passed. Return the number of
+        cycles completed, which is less than cycles if the run was cancelled
+        or the network oscillated.
+        """
+        self.oscillating = False
+        self.period = None
+        completed = 0
+        last_report = time.monotonic()
+        # states dictionary stores {state digest: cycles completed}
+        states = None
+        if self.detect_period:
+            states = {self.network.get_state_digest(): 0}
+        while completed < cycles:
+            if self.cancel_event.is_set():
+                break
+            if not self.engine.execute_network():
+                self.oscillating = True
+                break
+            self.monitors.record_signals()
+            completed += 1
+
+            # Skip the following cycles if nothing can change in them
+            quiet = self.network.quiet_cycles(cycles - completed)
+            if quiet > 0:
+                self.network.skip_cycles(quiet)
+                self.monitors.record_signals(quiet)
+                completed += quiet
+
+            if states is not None:
+                state = self.network.get_state_digest()
+                if state in states:
+                    # The state has recurred, so repeat the cycles between.
+                    # The state after whole periods is the current state.
+                    self.period = completed - states[state]
+                    repeats = (cycles - completed) // self.period
+                    self.monitors.repeat_signals(self.period,
+                                                 repeats * self.period)
+                    completed += repeats * self.period
+                    states = None
+                elif len(states) < self.max_states:
+                    states[state] = completed
+
+            if progress_callback is not None:
+                now = time.monotonic()
+                if now - last_report >= self.progress_interval:
+                    last_report = now
+                    progress_callback(completed)
+        return completed
+
+    def cancel(self):
+        """Request that the current run stops."""
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        """Return True if the run has been cancelled."""
+        return self.cancel_event.is_set()
+
+
+class SimulationWorker(threading.Thread):
+    """Run a Simulator in a background thread.
+
+    The callbacks are called from the worker thread. Graphical interfaces
+    should wrap them (for example with wx.CallAfter) before touching any
+    widgets.
+
+    Parameters
+    ----------
+    simulator: instance of the Simulator class.
+    cycles: number of cycles to run.
+    progress_callback: called as progress_callback(cycles_completed).
+    finish_callback: called as finish_callback(cycles_completed,
+                     oscillating, cancelled) once the run has ended.
+
+    Public methods
+    --------------
+    run(self): Runs the simulation. Called by start().
+
+    cancel(self): Requests that the simulation stops.
+    """
+
+    def __init__(self, simulator, cycles, progress_callback=None,
+                 finish_callback=None):
+        """Initialise the worker thread."""
+        super().__init__(daemon=True)
+        self.simulator = simulator
+        self.cycles = cycles
+        self.progress_callback = progress_callback
+        self.finish_callback = finish_callback
+        self.cycles_completed = 0
+
+    def run(self):
+        """Run the simulation and report the result."""
+        self.cycles_completed = self.simulator.run(self.cycles,
+                                                   self.progress_callback)
+        if self.finish_callback is not None:
+            self.finish_callback(self.cycles_completed,
+                                 self.simulator.oscillating,
+                                 self.simulator.is_cancelled())
+
+    def cancel(self):
+        """Request that the simulation stops."""
+        self.simulator.cancel()
@@ -0,0 +1,60 @@
+"""Find the logic gates that duplicate other gates.
+
+Used in the Logic Simulator project to merge gates of the same kind that
+read the same nets, so that only one of them is executed.
+
+Functions
+---------
+find_duplicate_gates - returns the gates that duplicate another gate.
+"""
+from analysis import get_gate_depths
+
+
+def find_duplicate_gates(devices, network):
+    """Return {duplicate gate ID: representative gate ID}.
+
+    Gates are hashed by their kind and the sorted net IDs of their inputs,
+    as every gate kind is commutative. Gates are visited in order of their
+    combinational depth, so every gate is visited after the gates driving
+    it, unless they are in a loop together. The first gate visited with a
+    key represents it, and later gates with the same key and the same
+    output level are its duplicates. The inputs of a gate read the net of
+    the representative of any duplicate driving them, so that gates reading
+    merged duplicates are found to be duplicates too. Gates with an
+    unconnected input and gates already merged are left alone.
+    """
+    net_devices = devices.net_table.net_devices
+    signals = devices.net_table.signals
+    depths = get_gate_depths(devices, network)
+    gates = [device for device in devices.devices_list
+             if device.device_id in depths]
+    # Sorting is stable, so gates of equal depth stay in the order made
+    gates.sort(key=lambda device: depths[device.device_id])
+
+    # aliases dictionary stores {duplicate net ID: representative net ID}
+    aliases = {}
+    # representatives dictionary stores {(device kind, input net IDs):
+    # device ID}
+    representatives = {}
+    duplicates = {}
+    for device in gates:
+        device_id = device.device_id
+        output_net = device.outputs.get_net(None)
+        if net_devices[output_net] != device_id:  # already merged
+            continue
+        input_nets = []
+        for connected_output in device.inputs.values():
+            if connected_output is None:
+                break
+            net_id = devices.get_net(*connected_output)
+            input_nets.append(aliases.get(net_id, net_id))
+        else:
+            key = (device.device_kind, tuple(sorted(input_nets)))
+            representative_id = representatives.setdefault(key, device_id)
+            if representative_id == device_id:
+                continue
+            representative_net = devices.get_net(representative_id, None)
+            if signals[representative_net] == signals[output_net]:
+                duplicates[device_id] = representative_id
+                aliases[output_net] = representative_net
+    return duplicates
@@ -0,0 +1,296 @@
+"""Run a logic network for many configurations of its switches.
+
+Used in the Logic Simulator project to run the same netlist for every
+combination of a few switches, or for a list of configurations, without
+parsing the definition file again for each one.
+
+Classes
+-------
+SweepResult - stores the result of running one configuration.
+ParameterSweep - runs the network for many configurations in a pool of
+                 worker processes.
+
+Functions
+---------
+run_worker_configuration - runs one configuration in a worker process.
+"""
+import itertools
+import multiprocessing
+import os
+import random
+from array import array
+
+from simulator import Simulator
+
+# Sweep run by the worker processes, which they inherit when forked
+worker_sweep = None
+
+
+def run_worker_configuration(item):
+    """Run one (position, configuration) pair in a worker process."""
+    (position, configuration) = item
+    return worker_sweep.run_configuration(position, configuration)
+
+
+class SweepResult:
+    """Store the result of running the network for one configuration.
+
+    Parameters
+    ----------
+    position: position of the configuration in the sweep.
+    configuration: list of (switch ID, level) pairs.
+    cycles_completed: number of cycles run before the end or an
+                      oscillation.
+    oscillating: True if the network oscillated.
+    statistics: list of (final level, cycles HIGH, changes) tuples, one for
+                each monitor in order, where the final level is None if no
+                cycle was recorded.
+    traces: dictionary of {signal name: list of levels} for the monitors
+            whose traces were asked for.
+
+    Public methods
+    --------------
+    No public methods.
+    """
+
+    def __init__(self, position, configuration, cycles_completed,
+                 oscillating, statistics, traces):
+        """Store the result."""
+        self.position = position
+        self.configuration = configuration
+        self.cycles_completed = cycles_completed
+        self.oscillating = oscillating
+        self.statistics = statistics
+        self.traces = traces
+
+
+class ParameterSweep:
+    """Run the network for many configurations of its switches.
+
+    The network is built once, in this process, and the worker processes
+    are forked from it, so each holds its own copy of the built network
+    and execution plan. Each configuration is run from the signals, D-type
+    memory and switch states the network had when the sweep was made: the
+    switches of the configuration are set, the clocks and D-types are
+    started from a random state seeded by the configuration's position,
+    and the monitors are recorded for the given number of cycles. The
+    result of a configuration is therefore the same whichever worker runs
+    it. The results are returned as soon as each configuration is done.
+
+    Where processes cannot be forked, or only one process is asked for,
+    the configurations are run in this process instead.
+
+    Parameters
+    ----------
+    names: instance of the names.Names() class.
+    devices: instance of the devices.Devices() class.
+    network: instance of the network.Network() class.
+    monitors: instance of the monitors.Monitors() class.
+    cycles: number of cycles to run for each configuration.
+    processes: number of worker processes, or None for one per core.
+    trace_names: names of the monitored signals whose traces are returned.
+    seed: seed of the random start-up of the clocks and D-types.
+
+    Public methods
+    --------------
+    get_switch_ids(self, switch_names): Returns the device IDs of the named
+                                        switches.
+
+    get_combinations(self, switch_ids): Returns every configuration of the
+                                        given switches.
+
+    read_configurations(self, path): Returns the configurations listed in a
+                                     file.
+
+    get_configuration_string(self, configuration): Returns a configuration
+                                                   as switch=level pairs.
+
+    run(self, configurations): Runs every configuration and yields each
+                               result as soon as it is done.
+
+    run_configuration(self, position, configuration): Runs one
+                               configuration and returns its result.
+
+    get_summary(self, results): Returns the lines of a table of the
+                                results.
+    """
+
+    def __init__(self, names, devices, network, monitors, cycles,
+                 processes=None, trace_names=(), seed=0):
+        """Store the state the configurations start from."""
+        self.names = names
+        self.devices = devices
+        self.network = network
+        self.monitors = monitors
+        self.cycles = cycles
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if "fork" not in multiprocessing.get_all_start_methods():
+            processes = 1
+        self.processes = processes
+        self.trace_names = set(trace_names)
+        self.seed = seed
+
+        net_table = devices.net_table
+        self.start_signals = array("b", net_table.signals)
+        self.start_memory = array("b", net_table.memory)
+        self.start_switches = [
+            (switch_id, devices.get_device(switch_id).switch_state)
+            for switch_id in devices.find_devices(devices.SWITCH)]
+
+    def get_switch_ids(self, switch_names):
+        """Return the device IDs of the named switches.
+
+        Return None if a name is not the name of a switch.
+        """
+        switch_ids = []
+        for switch_name in switch_names:
+            device = self.devices.get_device(self.names.query(switch_name))
+            if device is None or device.device_kind != self.devices.SWITCH:
+                return None
+            switch_ids.append(device.device_id)
+        return switch_ids
+
+    def get_combinations(self, switch_ids):
+        """Return every configuration of the given switches.
+
+        The first switch changes slowest, as in counting in binary.
+        """
+        levels = [self.devices.LOW, self.devices.HIGH]
+        return [list(zip(switch_ids, combination)) for combination
+                in itertools.product(levels, repeat=len(switch_ids))]
+
+    def read_configurations(self, path):
+        """Return the configurations listed in the file at path.
+
+        Each line holds one configuration as switch=level pairs separated
+        by spaces, such as "sw1=1 sw2=0", where the level is 0 or 1. Empty
+        lines and lines starting with # are skipped. Return None if a line
+        is not a configuration of known switches.
+        """
+        levels = {"0": self.devices.LOW, "1": self.devices.HIGH}
+        configurations = []
+        with open(path) as configuration_file:
+            for line in configuration_file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                configuration = []
+                for pair in line.split():
+                    [switch_name, separator, level] = pair.partition("=")
+                    switch_ids = self.get_switch_ids([switch_name])
+                    if switch_ids is None or level not in levels:
+                        return None
+                    configuration.append((switch_ids[0], levels[level]))
+                configurations.append(configuration)
+        return configurations
+
+    def get_configuration_string(self, configuration):
+        """Return the configuration as switch=level pairs, as in a file."""
+        return " ".join("".join([self.names.get_name_string(switch_id), "=",
+                                 str(level)])
+                        for switch_id, level in configuration)
+
+    def run_configuration(self, position, configuration):
+        """Run one configuration and return its SweepResult."""
+        devices = self.devices
+        monitors = self.monitors
+        net_table = devices.net_table
+        net_table.signals[:] = self.start_signals
+        net_table.memory[:] = self.start_memory
+        # Gates folded as constants by the last configuration hold their
+        # start levels again, so the constants are found afresh
+        self.network.switch_constants = None
+        self.network.settled = False
+        for switch_id, level in itertools.chain(self.start_switches,
+                                                configuration):
+            devices.set_switch(switch_id, level)
+        random.seed(self.seed + position)
+        devices.cold_startup()
+        monitors.reset_monitors()
+
+        simulator = Simulator(self.network, monitors, detect_period=True)
+        cycles_completed = simulator.run(self.cycles)
+        statistics = []
+        traces = {}
+        for (device_id, output_id), levels \
+                in monitors.monitors_dictionary.items():
+            final_level = levels[-1] if levels else None
+            changes = sum(1 for previous, level in zip(levels, levels[1:])
+                          if previous != level)
+            statistics.append((final_level, levels.count(devices.HIGH),
+                               changes))
+            signal_name = devices.get_signal_name(device_id, output_id)
+            if signal_name in self.trace_names:
+                traces[signal_name] = list(levels)
+        return SweepResult(position, configuration, cycles_completed,
+                           simulator.oscillating, statistics, traces)
+
+    def run(self, configurations):
+        """Run every configuration and yield each SweepResult when done.
+
+        The results come in the order the configurations finish, and their
+        position attribute gives the order they were listed in.
+        """
+        items = list(enumerate(configurations))
+        if self.processes <= 1 or len(items) <= 1:
+            for position, configuration in items:
+                yield self.run_configuration(position, configuration)
+            return
+
+        global worker_sweep
+        worker_sweep = self
+        try:
+            context = multiprocessing.get_context("fork")
+            with context.Pool(min(self.processes, len(items))) as pool:
+                for result in pool.imap_unordered(run_worker_configuration,
+                                                  items):
+                    yield result
+        finally:
+            worker_sweep = None
+
+    def get_summary(self, results):
+        """Return the lines of a table of the results, in sweep order.
+
+        The table has a column for each switch set by any configuration,
+        the number of cycles completed and the final level of each monitor.
+        A configuration that oscillated is marked after its cycles.
+        """
+        devices = self.devices
+        results = sorted(results, key=lambda result: result.position)
+        switch_ids = []
+        for result in results:
+            for switch_id, level in result.configuration:
+                if switch_id not in switch_ids:
+                    switch_ids.append(switch_id)
+        headings = [self.names.get_name_string(switch_id)
+                    for switch_id in switch_ids]
+        headings.append("Cycles")
+        headings.extend(devices.get_signal_name(device_id, output_id)
+                        for device_id, output_id
+                        in self.monitors.monitors_dictionary)
+
+        rows = []
+        for result in results:
+            # Switches left out of a configuration keep their first state
+            levels = dict(self.start_switches)
+            levels.update(result.configuration)
+            row = [str(levels[switch_id]) for switch_id in switch_ids]
+            cycles = str(result.cycles_completed)
+            if result.oscillating:
+                cycles = "".join([cycles, " (oscillating)"])
+            row.append(cycles)
+            row.extend("-" if final_level is None else str(final_level)
+                       for final_level, high_cycles, changes
+                       in result.statistics)
+            rows.append(row)
+
+        widths = [max([len(heading)] + [len(row[column]) for row in rows])
+                  for column, heading in enumerate(headings)]
+        lines = []
+        for row in [headings] + rows:
+            lines.append(" | ".join(cell.ljust(width) for cell, width
+                                    in zip(row, widths)).rstrip())
+            if row is headings:
+                lines.append("-+-".join("-" * width for width in widths))
+        return lines
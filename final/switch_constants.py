@@ -0,0 +1,178 @@
+"""Find the logic gates whose outputs are fixed by the switches.
+
+Used in the Logic Simulator project so that gates which only depend on the
+switches are left out of every simulation cycle while the switches stay
+put.
+
+Classes
+-------
+SwitchConstants - finds the constant gates and keeps the gates to execute.
+"""
+from signal_tables import INVERT, GATE_FOLDS
+
+
+class SwitchConstants:
+    """Find the constant gates and keep the list of gates to execute.
+
+    The switch states are treated as constants and propagated through the
+    gates: a gate is constant if an input is constant and not x, as an AND
+    gate with a LOW input is LOW, or if all its inputs are constant. Gates
+    in a loop are constant if the constants force them, as in a latch held
+    by its switches.
+
+    A constant gate is only folded, that is left out of the gates to
+    execute, once the network has settled with its output at the constant
+    level. Executing it again could not change its output, so folding it
+    changes no signal. When a switch changes, only the gates it drives,
+    directly or through other gates, are unfolded and their constants found
+    again. They are executed as usual until the network settles, and are
+    then folded with their new constants.
+
+    Parameters
+    ----------
+    switch_devices: list of (switch device, output net ID) pairs.
+    gate_devices: list of (input net IDs, output net ID, x, y) tuples, see
+                  Network.execute_gate.
+
+    Public methods
+    --------------
+    update_switches(self, device_ids): Unfolds the gates driven by the given
+                                       switches and finds their constants.
+
+    fold(self, signals): Leaves out the constant gates whose outputs are at
+                         their constant level.
+    """
+
+    def __init__(self, switch_devices, gate_devices):
+        """Find the constant gates of a network that has not settled."""
+        self.gate_devices = gate_devices
+        # switch_nets dictionary stores {device_id: (device, net ID)}
+        self.switch_nets = {device.device_id: (device, net_id)
+                            for device, net_id in switch_devices}
+        # readers dictionary stores {net ID: [gate position, ...]}
+        self.readers = {}
+        for position, (input_nets, output_net, x, y) \
+                in enumerate(gate_devices):
+            for net_id in set(input_nets) - {None}:
+                self.readers.setdefault(net_id, []).append(position)
+
+        # levels dictionary stores {net ID: constant level}
+        self.levels = {}
+        # constants dictionary stores {gate position: constant level}
+        self.constants = {}
+        # Positions of the folded gates, and of the constant gates waiting
+        # for the network to settle before they are folded
+        self.folded = set()
+        self.pending = set()
+        # Gates to execute, in the order of gate_devices
+        self.schedule = gate_devices
+
+        for device, net_id in switch_devices:
+            self.levels[net_id] = device.switch_state
+        self.propagate(range(len(gate_devices)))
+
+    def evaluate(self, position):
+        """Return the constant output of a gate, or None if not constant."""
+        (input_nets, output_net, x, y) = self.gate_devices[position]
+        if None in input_nets or output_net is None:  # unconnected
+            return None
+        levels = self.levels
+        if x is None:  # XOR is only constant if all its inputs are
+            (output, table, final) = GATE_FOLDS[(x, y)]
+            for net_id in input_nets:
+                if net_id not in levels:
+                    return None
+                if output is None:
+                    output = levels[net_id]
+                else:
+                    output = table[output][levels[net_id]]
+            return output
+        all_x = True
+        for net_id in input_nets:
+            level = levels.get(net_id)
+            if level is None:
+                all_x = False
+            elif level != x:
+                return INVERT[y]
+        if all_x:
+            return y
+        return None
+
+    def propagate(self, positions):
+        """Find the constants of the given gates, whose outputs are unknown.
+
+        Each gate is evaluated again when one of its inputs becomes
+        constant, so every net is settled at most once.
+        """
+        gate_devices = self.gate_devices
+        queue = list(positions)
+        waiting = set(queue)
+        while queue:
+            position = queue.pop()
+            waiting.discard(position)
+            level = self.evaluate(position)
+            if level is None:
+                continue
+            output_net = gate_devices[position][1]
+            if output_net in self.levels:  # already found
+                continue
+            self.levels[output_net] = level
+            self.constants[position] = level
+            self.pending.add(position)
+            for reader in self.readers.get(output_net, []):
+                if reader not in waiting \
+                        and gate_devices[reader][1] not in self.levels:
+                    queue.append(reader)
+                    waiting.add(reader)
+
+    def update_switches(self, device_ids):
+        """Unfold the gates driven by the switches and find their constants.
+
+        Switches that are not in the network are ignored.
+        """
+        gate_devices = self.gate_devices
+        # Find the gates driven by the switches, through any other gates
+        cone = set()
+        stack = []
+        for device_id in device_ids:
+            if device_id not in self.switch_nets:
+                continue
+            (device, net_id) = self.switch_nets[device_id]
+            self.levels[net_id] = device.switch_state
+            stack.append(net_id)
+        while stack:
+            for reader in self.readers.get(stack.pop(), []):
+                if reader not in cone:
+                    cone.add(reader)
+                    stack.append(gate_devices[reader][1])
+        if not cone:
+            return
+
+        for position in cone:
+            self.levels.pop(gate_devices[position][1], None)
+            self.constants.pop(position, None)
+            self.pending.discard(position)
+        if not cone.isdisjoint(self.folded):
+            self.folded.difference_update(cone)
+            self.schedule = [gate for position, gate
+                             in enumerate(gate_devices)
+                             if position not in self.folded]
+        self.propagate(cone)
+
+    def fold(self, signals):
+        """Leave out the constant gates whose outputs are at their level.
+
+        This must only be called after the network has settled.
+        """
+        if not self.pending:
+            return
+        gate_devices = self.gate_devices
+        folded = [position for position in self.pending
+                  if signals[gate_devices[position][1]]
+                  == self.constants[position]]
+        if not folded:
+            return
+        self.pending.difference_update(folded)
+        self.folded.update(folded)
+        self.schedule = [gate for position, gate in enumerate(gate_devices)
+                         if position not in self.folded]
@@ -0,0 +1,130 @@
+"""Test the analysis module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from analysis import NetlistAnalysis, get_gate_depths
+
+
+@pytest.fixture
+def network_with_chain():
+    """Return a Network class instance with a chain of gates.
+
+    Sw1 drives And1, And1 drives Nand1 and Xor1, and Nand1 drives Xor1. The
+    second input of Nand1 is left unconnected.
+    """
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+
+    [SW1, AND1, NAND1, XOR1, I1, I2] = new_names.lookup(
+        ["Sw1", "And1", "Nand1", "Xor1", "I1", "I2"])
+    new_devices.make_device(SW1, new_devices.SWITCH, 0)
+    new_devices.make_device(AND1, new_devices.AND, 2)
+    new_devices.make_device(NAND1, new_devices.NAND, 2)
+    new_devices.make_device(XOR1, new_devices.XOR)
+
+    new_network.make_connection(SW1, None, AND1, I1)
+    new_network.make_connection(SW1, None, AND1, I2)
+    new_network.make_connection(AND1, None, NAND1, I1)
+    new_network.make_connection(AND1, None, XOR1, I1)
+    new_network.make_connection(NAND1, None, XOR1, I2)
+    return new_network
+
+
+def test_gate_depths(network_with_chain):
+    """Test if every gate is one deeper than its deepest driver."""
+    network = network_with_chain
+    devices = network.devices
+    [AND1, NAND1, XOR1] = devices.names.lookup(["And1", "Nand1", "Xor1"])
+
+    assert get_gate_depths(devices, network) == {AND1: 1, NAND1: 2, XOR1: 3}
+
+
+def test_gate_depths_loop():
+    """Test if the gates of a loop share the depth of the whole loop."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    [SW1, NOR1, NOR2, AND1, I1, I2] = names.lookup(
+        ["Sw1", "Nor1", "Nor2", "And1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(NOR1, devices.NOR, 2)
+    devices.make_device(NOR2, devices.NOR, 2)
+    devices.make_device(AND1, devices.AND, 1)
+    network.make_connection(SW1, None, NOR1, I1)
+    network.make_connection(SW1, None, NOR2, I1)
+    network.make_connection(NOR1, None, NOR2, I2)
+    network.make_connection(NOR2, None, NOR1, I2)
+    network.make_connection(NOR2, None, AND1, I1)
+
+    assert get_gate_depths(devices, network) == {NOR1: 2, NOR2: 2, AND1: 3}
+    analysis = NetlistAnalysis(devices, network)
+    assert sorted(map(sorted, analysis.combinational_loops)) == [
+        sorted([NOR1, NOR2])]
+    assert analysis.feedback_loops == analysis.combinational_loops
+
+
+def test_netlist_analysis(network_with_chain):
+    """Test if the counts, fanout and unconnected inputs are correct."""
+    network = network_with_chain
+    analysis = NetlistAnalysis(network.devices, network)
+
+    assert analysis.device_counts["SWITCH"] == 1
+    assert analysis.device_counts["AND"] == 1
+    assert analysis.device_counts["CLOCK"] == 0
+    assert analysis.sequential_count == 0
+    assert analysis.logic_depth == 3
+    # Sw1 and And1 have two loads, Nand1 one and Xor1 none
+    assert analysis.fanout_histogram == {0: 1, 1: 1, 2: 2}
+    assert analysis.unconnected_inputs == ["Nand1.I2"]
+    assert analysis.feedback_loops == []
+
+    report = analysis.get_report()
+    assert report[0] == "Devices: 4"
+    assert "Maximum combinational depth: 3" in report
+    assert "  Nand1.I2" in report
+
+
+def test_feedback_through_dtype():
+    """Test if a loop through a D-type is not a combinational loop."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    [DTYPE1, NOT1, CLK1, SW1, I1] = names.lookup(
+        ["Dtype1", "Not1", "Clk1", "Sw1", "I1"])
+    devices.make_device(DTYPE1, devices.D_TYPE)
+    devices.make_device(NOT1, devices.NAND, 1)
+    devices.make_device(CLK1, devices.CLOCK, 1)
+    devices.make_device(SW1, devices.SWITCH, 0)
+    network.make_connection(DTYPE1, devices.Q_ID, NOT1, I1)
+    network.make_connection(NOT1, None, DTYPE1, devices.DATA_ID)
+    network.make_connection(CLK1, None, DTYPE1, devices.CLK_ID)
+    network.make_connection(SW1, None, DTYPE1, devices.SET_ID)
+    network.make_connection(SW1, None, DTYPE1, devices.CLEAR_ID)
+
+    analysis = NetlistAnalysis(devices, network)
+    assert analysis.sequential_count == 1
+    assert analysis.logic_depth == 1
+    assert len(analysis.feedback_loops) == 1
+    assert analysis.combinational_loops == []
+
+
+def test_iteration_limit_from_depth(network_with_chain):
+    """Test if the settle budget of the network follows its depth."""
+    network = network_with_chain
+    devices = network.devices
+    names = devices.names
+    # A shallow network keeps the fixed budget of 20 passes
+    assert network.get_execution_plan().iteration_limit == 20
+
+    # A chain of ten NOT gates after Xor1 makes the network 13 gates deep
+    driver_id = names.query("Xor1")
+    [I1] = names.lookup(["I1"])
+    for number in range(10):
+        [gate_id] = names.lookup(["".join(["Not", str(number)])])
+        devices.make_device(gate_id, devices.NOT)
+        network.make_connection(driver_id, None, gate_id, I1)
+        driver_id = gate_id
+    assert network.get_execution_plan().iteration_limit == 2 * 13 + 6
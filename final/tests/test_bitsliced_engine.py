@@ -0,0 +1,103 @@
+"""Test the bitsliced_engine module."""
+import random
+from array import array
+
+from names import Names
+from devices import Devices
+from network import Network
+from bitsliced_engine import (BitslicedEngine, pack_planes, unpack_planes,
+                              get_level_groups)
+from signal_tables import LOW, HIGH, RISING, FALLING
+
+
+def test_pack_planes():
+    """Test if packing and unpacking the planes keeps every level."""
+    signals = array("b", [LOW, HIGH, RISING, FALLING, HIGH, LOW])
+    planes = pack_planes(signals)
+    assert planes == (0b010010, 0b100001, 0b010110)
+
+    unpacked = array("b", [LOW] * 6)
+    unpack_planes(planes, unpacked)
+    assert unpacked == signals
+
+
+def test_level_groups():
+    """Test if gates are grouped by rule with a mask for each distance."""
+    # Two AND gates and a NOT gate
+    gates = [((0, 1), 4, HIGH, HIGH), ((1, 2), 5, HIGH, HIGH),
+             ((3,), 6, HIGH, LOW)]
+    (groups, shifts) = get_level_groups(gates)
+    assert groups == [(HIGH, HIGH, 0b110000, [[(4, 0b110000)],
+                                              [(3, 0b110000)]]),
+                      (HIGH, LOW, 0b1000000, [[(3, 0b1000000)]])]
+    assert shifts == 3
+
+    # Unconnected gates are executed one at a time
+    assert get_level_groups([((0, None), 4, HIGH, HIGH)]) == (None, 0)
+
+
+def build_datapath_network():
+    """Return a Network instance with two rows of gates and a latch.
+
+    Each gate of the first row reads two neighbouring switches, and each
+    gate of the second row reads two neighbouring gates of the first. Two
+    NOR gates of a latch read the last row and a clock.
+    """
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    [CLK1, NOR1, NOR2, I1, I2, I3] = new_names.lookup(
+        ["Clk1", "Nor1", "Nor2", "I1", "I2", "I3"])
+    row = new_names.lookup(["Sw1", "Sw2", "Sw3", "Sw4"])
+    for switch_id in row:
+        new_devices.make_device(switch_id, new_devices.SWITCH, 0)
+    new_devices.make_device(CLK1, new_devices.CLOCK, 1)
+    for device_kind in [new_devices.XOR, new_devices.NAND]:
+        next_row = []
+        for bit in range(4):
+            [gate_id] = new_names.lookup(["".join([str(device_kind), "_",
+                                                   str(bit)])])
+            if device_kind == new_devices.XOR:
+                new_devices.make_device(gate_id, device_kind)
+            else:
+                new_devices.make_device(gate_id, device_kind, 2)
+            new_network.make_connection(row[bit], None, gate_id, I1)
+            new_network.make_connection(row[(bit + 1) % 4], None, gate_id,
+                                        I2)
+            next_row.append(gate_id)
+        row = next_row
+    new_devices.make_device(NOR1, new_devices.NOR, 3)
+    new_devices.make_device(NOR2, new_devices.NOR, 2)
+    new_network.make_connection(row[0], None, NOR1, I1)
+    new_network.make_connection(CLK1, None, NOR1, I2)
+    new_network.make_connection(NOR2, None, NOR1, I3)
+    new_network.make_connection(row[1], None, NOR2, I1)
+    new_network.make_connection(NOR1, None, NOR2, I2)
+    return new_network
+
+
+def test_engine_matches_network():
+    """Test if the engine gives the same signals as the network alone."""
+    traces = []
+    for bitsliced in [False, True]:
+        network = build_datapath_network()
+        devices = network.devices
+        random.seed(0)
+        devices.cold_startup()
+        engine = None
+        execute_network = network.execute_network
+        if bitsliced:
+            engine = BitslicedEngine(network)
+            # Evaluate every level on the bitplanes
+            engine.gates_per_shift = 0
+            execute_network = engine.execute_network
+        generator = random.Random(0)
+        trace = []
+        for cycle in range(20):
+            devices.set_switch(devices.devices_list[cycle % 4].device_id,
+                               generator.choice([devices.LOW, devices.HIGH]))
+            assert execute_network()
+            trace.append(bytes(devices.net_table.signals))
+        traces.append(trace)
+    assert all(groups is not None for gates, groups in engine.levels)
+    assert traces[0] == traces[1]
@@ -0,0 +1,184 @@
+"""Test the block_memo module."""
+import random
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from block_memo import BlockMemo, find_blocks
+from signal_tables import LOW, HIGH
+
+# Gate tuples as in the execution plan
+AND = (HIGH, HIGH)
+NOR = (LOW, HIGH)
+XOR = (None, None)
+NOT = (HIGH, LOW)
+
+
+def make_gate(input_nets, output_net, rule):
+    """Return a gate tuple for the given rule."""
+    return (tuple(input_nets), output_net) + rule
+
+
+def test_find_blocks():
+    """Test if blocks are the connected gates, with their boundary nets."""
+    gates = [make_gate([0, 1], 4, AND), make_gate([4, 2], 5, XOR),
+             make_gate([5], 6, NOT), make_gate([3], 7, NOT),
+             make_gate([7, 3], 8, AND)]
+    blocks = find_blocks(gates, set())
+    assert sorted(blocks) == [((0, 1, 2), (6,), gates[:3]),
+                              ((3,), (8,), gates[3:])]
+
+    # Kept nets are outputs even if only read inside the block
+    blocks = find_blocks(gates, {4})
+    assert (4, 6) in [output_nets for input_nets, output_nets, block_gates
+                      in blocks]
+
+    # Declared blocks only hold the gates driving their nets
+    blocks = find_blocks(gates, set(), [{4, 5}, {8}])
+    assert blocks == [((0, 1, 2), (5,), gates[:2])]
+
+
+def test_loops_not_in_blocks():
+    """Test if gates in a combinational loop are left out of blocks."""
+    gates = [make_gate([0, 2], 1, NOR), make_gate([3, 1], 2, NOR),
+             make_gate([2], 4, NOT), make_gate([4], 5, NOT)]
+    assert find_blocks(gates, set()) == [((2,), (5,), gates[2:])]
+
+
+def test_block_cache():
+    """Test if the cache counts hits and drops the least recent inputs."""
+    gates = [make_gate([0, 1], 2, AND), make_gate([2], 3, NOT)]
+    memo = BlockMemo((0, 1), (3,), gates, 2)
+    assert memo.get_outputs([HIGH, HIGH, LOW, LOW]) == bytes([LOW])
+    assert memo.get_outputs([HIGH, LOW, LOW, LOW]) == bytes([HIGH])
+    assert memo.get_outputs([HIGH, HIGH, LOW, LOW]) == bytes([LOW])
+    assert (memo.hits, memo.misses) == (1, 2)
+
+    # HIGH, LOW was used least recently, so it is dropped
+    memo.get_outputs([LOW, LOW, LOW, LOW])
+    assert list(memo.cache) == [bytes([HIGH, HIGH]), bytes([LOW, LOW])]
+    assert memo.get_outputs([HIGH, LOW, LOW, LOW]) == bytes([HIGH])
+    assert (memo.hits, memo.misses) == (1, 4)
+
+
+@pytest.fixture
+def memo_monitors():
+    """Return a Monitors instance for a block of gates read by a D-type."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    new_monitors = Monitors(new_names, new_devices, new_network)
+    [SW1, SW2, AND1, NOT1, XOR1, DTYPE1, CLK1, I1, I2] = \
+        new_names.lookup(["Sw1", "Sw2", "And1", "Not1", "Xor1", "Dtype1",
+                          "Clk1", "I1", "I2"])
+    new_devices.make_device(SW1, new_devices.SWITCH, 1)
+    new_devices.make_device(SW2, new_devices.SWITCH, 0)
+    new_devices.make_device(AND1, new_devices.AND, 2)
+    new_devices.make_device(NOT1, new_devices.NOT)
+    new_devices.make_device(XOR1, new_devices.XOR)
+    new_devices.make_device(DTYPE1, new_devices.D_TYPE)
+    new_devices.make_device(CLK1, new_devices.CLOCK, 1)
+    new_network.make_connection(SW1, None, AND1, I1)
+    new_network.make_connection(SW2, None, AND1, I2)
+    new_network.make_connection(AND1, None, NOT1, I1)
+    new_network.make_connection(NOT1, None, XOR1, I1)
+    new_network.make_connection(DTYPE1, new_devices.Q_ID, XOR1, I2)
+    new_network.make_connection(XOR1, None, DTYPE1, new_devices.DATA_ID)
+    new_network.make_connection(CLK1, None, DTYPE1, new_devices.CLK_ID)
+    new_network.make_connection(SW2, None, DTYPE1, new_devices.SET_ID)
+    new_network.make_connection(SW2, None, DTYPE1, new_devices.CLEAR_ID)
+    new_monitors.make_monitor(DTYPE1, new_devices.Q_ID)
+    return new_monitors
+
+
+def test_network_memo_blocks(memo_monitors):
+    """Test if a remembered block gives the same signals as its gates."""
+    monitors = memo_monitors
+    network = monitors.network
+    devices = monitors.devices
+    [SW2, DTYPE1, NOT1] = devices.names.lookup(["Sw2", "Dtype1", "Not1"])
+    network.fold_constants = False
+    traces = []
+    for memo_size in [None, 4]:
+        network.memoise_blocks(memo_size)
+        random.seed(0)
+        devices.cold_startup()
+        devices.set_switch(SW2, devices.LOW)
+        trace = []
+        for cycle in range(12):
+            if cycle == 6:
+                devices.set_switch(SW2, devices.HIGH)
+            assert network.execute_network()
+            trace.append(network.get_output_signal(DTYPE1, devices.Q_ID))
+        traces.append(trace)
+    assert traces[0] == traces[1]
+    plan = network.get_execution_plan()
+    assert len(plan.memo_blocks) == 1
+    assert plan.gate_devices == []
+    (hits, misses) = network.get_memo_counts()
+    assert misses < hits
+
+    # Monitoring Not1 makes it an output of the block
+    monitors.memoise_blocks(4)
+    monitors.make_monitor(NOT1, None)
+    assert network.execute_network()
+    assert network.get_execution_plan().memo_blocks[0].output_nets == (
+        devices.get_net(NOT1, None), devices.get_net(
+            devices.names.query("Xor1"), None))
+
+    network.memoise_blocks(None)
+    assert network.get_execution_plan().memo_blocks == []
+
+
+def test_clock_gates_not_in_blocks():
+    """Test if a D-type clocked through gates sees the same edges.
+
+    Dtype2 toggles on every rising edge of a clock, and Dtype1 stores Q of
+    Dtype2 on the edges of the clock delayed by four NOT gates. A block
+    would settle the delay in one pass, so that Dtype1 stored Q of Dtype2
+    before it toggled.
+    """
+    traces = []
+    for memo_size in [None, 4]:
+        new_names = Names()
+        new_devices = Devices(new_names)
+        new_network = Network(new_names, new_devices)
+        [SW1, CLK1, DTYPE1, DTYPE2, I1] = new_names.lookup(
+            ["Sw1", "Clk1", "Dtype1", "Dtype2", "I1"])
+        new_devices.make_device(SW1, new_devices.SWITCH, 0)
+        new_devices.make_device(CLK1, new_devices.CLOCK, 2)
+        new_devices.make_device(DTYPE1, new_devices.D_TYPE)
+        new_devices.make_device(DTYPE2, new_devices.D_TYPE)
+        clock_id = CLK1
+        for number in range(4):
+            [gate_id] = new_names.lookup(["".join(["Not", str(number)])])
+            new_devices.make_device(gate_id, new_devices.NOT)
+            new_network.make_connection(clock_id, None, gate_id, I1)
+            clock_id = gate_id
+        new_network.make_connection(clock_id, None, DTYPE1,
+                                    new_devices.CLK_ID)
+        new_network.make_connection(DTYPE2, new_devices.Q_ID, DTYPE1,
+                                    new_devices.DATA_ID)
+        new_network.make_connection(CLK1, None, DTYPE2, new_devices.CLK_ID)
+        new_network.make_connection(DTYPE2, new_devices.QBAR_ID, DTYPE2,
+                                    new_devices.DATA_ID)
+        for device_id in [DTYPE1, DTYPE2]:
+            new_network.make_connection(SW1, None, device_id,
+                                        new_devices.SET_ID)
+            new_network.make_connection(SW1, None, device_id,
+                                        new_devices.CLEAR_ID)
+        new_network.memoise_blocks(memo_size)
+        random.seed(0)
+        new_devices.cold_startup()
+        trace = []
+        for cycle in range(12):
+            assert new_network.execute_network()
+            trace.append(new_network.get_output_signal(DTYPE1,
+                                                       new_devices.Q_ID))
+        traces.append(trace)
+    assert traces[0] == traces[1]
+    assert HIGH in traces[0]
+    assert new_network.get_execution_plan().memo_blocks == []
@@ -0,0 +1,73 @@
+"""Test the clock_calendar module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from clock_calendar import ClockCalendar
+
+
+@pytest.fixture
+def clocked_network():
+    """Return a Network instance with three clocks of different periods."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    clock_ids = new_names.lookup(["Clk1", "Clk2", "Clk3"])
+    for clock_id, half_period in zip(clock_ids, [1, 3, 7]):
+        new_devices.make_device(clock_id, new_devices.CLOCK, half_period)
+    return new_network
+
+
+def test_pop_due(clocked_network):
+    """Test if the calendar returns the clocks in the order of their edges."""
+    devices = clocked_network.devices
+    net_table = devices.net_table
+    plan = clocked_network.get_execution_plan()
+    [clock1, clock2, clock3] = [device for device, net_id
+                                in plan.clock_devices]
+    clock1.clock_counter = 0
+    clock2.clock_counter = 2
+    clock3.clock_counter = 9  # past its half period, so it never changes
+
+    calendar = ClockCalendar(net_table, plan.clock_devices)
+    assert calendar.is_current()
+    assert calendar.next_edge() == 1
+
+    due_cycles = []
+    for cycle in range(6):
+        due = calendar.pop_due()
+        due_cycles.append([device.device_id for device, net_id in due])
+        net_table.cycle += 1
+    assert due_cycles == [[], [clock1.device_id, clock2.device_id],
+                          [clock1.device_id], [clock1.device_id],
+                          [clock1.device_id, clock2.device_id],
+                          [clock1.device_id]]
+
+    clock1.clock_counter = 0
+    assert not calendar.is_current()
+
+
+def test_update_clocks_matches_counters(clocked_network):
+    """Test if the clocks change exactly when their counters run out."""
+    devices = clocked_network.devices
+    clocks = [device for device, net_id
+              in clocked_network.get_execution_plan().clock_devices]
+
+    # Follow the counters as update_clocks did before the calendar
+    counters = [clock.clock_counter for clock in clocks]
+    for cycle in range(40):
+        expected = []
+        for position, clock in enumerate(clocks):
+            if counters[position] == clock.clock_half_period:
+                counters[position] = 0
+                expected.append(clock.device_id)
+            counters[position] += 1
+
+        due = clocked_network.update_clocks()
+        assert [device.device_id for device, net_id in due] == expected
+        assert [clock.clock_counter for clock in clocks] == counters
+        for device, net_id in due:
+            assert devices.net_table.signals[net_id] in [devices.RISING,
+                                                         devices.FALLING]
+            clocked_network.execute_clock_net(net_id)
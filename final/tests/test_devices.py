@@ -160,3 +160,26 @@ def test_set_switch(new_devices):
     # Set switch Sw1 to LOW
     new_devices.set_switch(SW1_ID, new_devices.LOW)
     assert switch_object.switch_state == new_devices.LOW
+
+
+def test_devices_share_port_layout(new_devices):
+    """Test if devices with the same ports share one port layout."""
+    names = new_devices.names
+    [AND1_ID, AND2_ID, OR1_ID] = names.lookup(["And1", "And2", "Or1"])
+    new_devices.make_device(AND1_ID, new_devices.AND, 2)
+    new_devices.make_device(AND2_ID, new_devices.AND, 2)
+    new_devices.make_device(OR1_ID, new_devices.OR, 3)
+    and1 = new_devices.get_device(AND1_ID)
+    and2 = new_devices.get_device(AND2_ID)
+    or1 = new_devices.get_device(OR1_ID)
+
+    assert and1.layout is and2.layout
+    assert or1.layout is not and1.layout
+    assert not hasattr(and1, "__dict__")
+
+    # Inputs still behave as a dictionary
+    [I1, I2] = names.lookup(["I1", "I2"])
+    assert list(and1.inputs) == [I1, I2]
+    and1.inputs[I1] = (OR1_ID, None)
+    assert and1.inputs[I1] == (OR1_ID, None)
+    assert and2.inputs[I1] is None
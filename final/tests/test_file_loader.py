@@ -0,0 +1,138 @@
+"""Test the file_loader module."""
+import logging
+import threading
+
+import pytest
+
+from file_loader import (load_definition_file, LoaderWorker,
+                         count_characters)
+
+
+@pytest.fixture
+def definition_file(tmp_path):
+    """Return the path of a small valid definition file."""
+    path = tmp_path / "circuit.txt"
+    path.write_text(
+        "DEVICES{\n"
+        "    SWITCH sw1(0);\n"
+        "    SWITCH sw2(1);\n"
+        "    AND and1(2);\n"
+        "}\n"
+        "CONNECT{\n"
+        "    sw1 => and1.I1;\n"
+        "    sw2 => and1.I2;\n"
+        "}\n"
+        "MONITOR{\n"
+        "    and1;\n"
+        "}\n"
+        "END\n"
+    )
+    return str(path)
+
+
+def run_loader(path, **kwargs):
+    """Run a LoaderWorker to completion and return its results."""
+    finished = threading.Event()
+    results = []
+
+    def on_finish(parser, success, cancelled):
+        results.append((parser, success, cancelled))
+        finished.set()
+
+    worker = LoaderWorker(path, logging.getLogger("scanner"),
+                          logging.getLogger("parser"),
+                          finish_callback=on_finish, **kwargs)
+    return worker, finished, results
+
+
+def test_load_definition_file(definition_file):
+    """Test if a valid file is parsed and reports progress per statement."""
+    progress = []
+    [parser, success] = load_definition_file(
+        definition_file, logging.getLogger("scanner"),
+        logging.getLogger("parser"),
+        lambda read, statements: progress.append((read, statements)))
+
+    assert success
+    [AND1_ID] = parser.names.lookup(["and1"])
+    assert parser.devices.get_device(AND1_ID) is not None
+    # Three devices, two connections and one monitor
+    assert [statements for read, statements in progress] == \
+        [1, 2, 3, 4, 5, 6]
+    reads = [read for read, statements in progress]
+    assert reads == sorted(reads)
+
+
+def test_load_definition_file_errors(tmp_path):
+    """Test if a file with errors is reported as not parsed."""
+    path = tmp_path / "broken.txt"
+    path.write_text(
+        "DEVICES{\n"
+        "    SWITCH sw1(0);\n"
+        "    AND and1(2);\n"
+        "}\n"
+        "CONNECT{\n"
+        "    sw1 => and1.I1;\n"
+        "    sw1 => and1.I1;\n"
+        "}\n"
+        "MONITOR{\n"
+        "    and1;\n"
+        "}\n"
+        "END\n"
+    )
+
+    [parser, success] = load_definition_file(
+        str(path), logging.getLogger("scanner"), logging.getLogger("parser"))
+    assert not success
+    assert parser.error_count == 1
+
+
+def test_loader_worker(definition_file):
+    """Test if the worker loads the file and reports progress."""
+    progress = []
+    worker, finished, results = run_loader(
+        definition_file,
+        progress_callback=lambda *args: progress.append(args),
+        progress_interval=0)
+    worker.start()
+    assert finished.wait(5)
+    worker.join()
+
+    [(parser, success, cancelled)] = results
+    assert success
+    assert not cancelled
+    assert parser is not None
+    assert len(progress) == 6
+    assert all(total == worker.total_characters
+               for read, total, statements in progress)
+
+
+def test_count_characters(tmp_path):
+    """Test if the total counts characters as the scanner reads them."""
+    path = tmp_path / "circuit.txt"
+    text = ("DEVICES{\r\n\u00a0\u00a0SWITCH sw1(0);\r\n}\r\n"
+            "MONITOR{\r\n\u00a0\u00a0sw1;\r\n}\r\nEND\r\n")
+    path.write_bytes(text.encode("utf-8"))
+    progress = []
+    [parser, success] = load_definition_file(
+        str(path), logging.getLogger("scanner"),
+        logging.getLogger("parser"),
+        lambda read, statements: progress.append(read))
+    assert success
+
+    # Each line ending and non-breaking space is one character
+    total_characters = count_characters(str(path))
+    assert total_characters == len(text) - text.count("\r")
+    assert total_characters < len(text.encode("utf-8"))
+    assert progress[-1] <= total_characters == parser.scanner.characters_read
+
+
+def test_loader_worker_cancel(definition_file):
+    """Test if a cancelled worker stops without returning a parser."""
+    worker, finished, results = run_loader(definition_file)
+    worker.cancel()
+    worker.start()
+    assert finished.wait(5)
+    worker.join()
+
+    assert results == [(None, False, True)]
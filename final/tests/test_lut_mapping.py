@@ -0,0 +1,196 @@
+"""Test the lut_mapping module."""
+import itertools
+import random
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from lut_mapping import map_lookup_tables, get_truth_table, evaluate_gates
+from signal_tables import LOW, HIGH, RISING
+
+# Gate tuples as in the execution plan, on nets 0 to 3 for the inputs
+AND = (HIGH, HIGH)
+NOR = (LOW, HIGH)
+XOR = (None, None)
+NOT = (HIGH, LOW)
+
+
+def make_gate(input_nets, output_net, rule):
+    """Return a gate tuple for the given rule."""
+    return (tuple(input_nets), output_net) + rule
+
+
+def test_truth_table():
+    """Test if the truth table matches the gates for every input."""
+    gates = [make_gate([0, 1], 4, AND), make_gate([2, 4], 5, XOR),
+             make_gate([5, 3, 0], 6, NOR), make_gate([6], 7, NOT)]
+    table = get_truth_table((0, 1, 2, 3), gates)
+    for levels in itertools.product([LOW, HIGH], repeat=4):
+        index = sum(level << bit for bit, level in enumerate(levels))
+        expected = evaluate_gates(gates, list(levels) + [LOW] * 4)
+        assert table >> index & 1 == expected
+
+
+def test_evaluate_gates_with_edges():
+    """Test if the gates are folded for RISING and FALLING inputs."""
+    gates = [make_gate([0, 1], 2, AND), make_gate([2], 3, NOT)]
+    # A RISING input is not HIGH, so the AND gate is LOW
+    assert evaluate_gates(gates, [HIGH, RISING, HIGH, HIGH]) == HIGH
+    assert evaluate_gates(gates, [HIGH, HIGH, LOW, LOW]) == LOW
+
+
+def test_map_lookup_tables():
+    """Test if cones stop at kept nets, shared nets and the input limit."""
+    gates = [make_gate([0, 1], 4, AND), make_gate([2, 3], 5, AND),
+             make_gate([4, 5], 6, XOR), make_gate([6], 7, NOT),
+             make_gate([4, 0], 8, NOR)]
+    # Net 4 is read twice, so its gate stays on its own
+    [gates_left, lookup_tables] = map_lookup_tables(gates, set(), 8)
+    assert gates_left == [gates[0], gates[4]]
+    assert [(inputs, output, len(cone_gates))
+            for inputs, output, table, cone_gates in lookup_tables] == [
+        ((4, 2, 3), 7, 3)]
+
+    # Net 6 is kept, so the NOT gate cannot absorb the XOR gate
+    [gates_left, lookup_tables] = map_lookup_tables(gates, {6}, 8)
+    assert gates_left == [gates[0], gates[3], gates[4]]
+    assert [output for inputs, output, table, cone_gates
+            in lookup_tables] == [6]
+
+    # Only one input is allowed, so no cone of two gates can be made
+    [gates_left, lookup_tables] = map_lookup_tables(gates, set(), 1)
+    assert gates_left == gates
+    assert lookup_tables == []
+
+
+def test_loops_not_mapped():
+    """Test if gates in a combinational loop are left as gates."""
+    gates = [make_gate([0, 2], 1, NOR), make_gate([3, 1], 2, NOR),
+             make_gate([2], 4, NOT), make_gate([4], 5, NOT)]
+    [gates_left, lookup_tables] = map_lookup_tables(gates, set(), 8)
+    assert gates_left == gates[:2]
+    assert [(inputs, output) for inputs, output, table, cone_gates
+            in lookup_tables] == [((2,), 5)]
+
+
+@pytest.fixture
+def mapped_monitors():
+    """Return a Monitors instance for a tree of gates read by a D-type."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    new_monitors = Monitors(new_names, new_devices, new_network)
+    [SW1, SW2, SW3, AND1, OR1, XOR1, DTYPE1, CLK1, I1, I2] = \
+        new_names.lookup(["Sw1", "Sw2", "Sw3", "And1", "Or1", "Xor1",
+                          "Dtype1", "Clk1", "I1", "I2"])
+    for switch_id in [SW1, SW2, SW3]:
+        new_devices.make_device(switch_id, new_devices.SWITCH, 1)
+    new_devices.make_device(AND1, new_devices.AND, 2)
+    new_devices.make_device(OR1, new_devices.OR, 2)
+    new_devices.make_device(XOR1, new_devices.XOR)
+    new_devices.make_device(DTYPE1, new_devices.D_TYPE)
+    new_devices.make_device(CLK1, new_devices.CLOCK, 1)
+    new_network.make_connection(SW1, None, AND1, I1)
+    new_network.make_connection(SW2, None, AND1, I2)
+    new_network.make_connection(AND1, None, OR1, I1)
+    new_network.make_connection(SW3, None, OR1, I2)
+    new_network.make_connection(OR1, None, XOR1, I1)
+    new_network.make_connection(SW1, None, XOR1, I2)
+    new_network.make_connection(XOR1, None, DTYPE1, new_devices.DATA_ID)
+    new_network.make_connection(CLK1, None, DTYPE1, new_devices.CLK_ID)
+    new_network.make_connection(SW3, None, DTYPE1, new_devices.SET_ID)
+    new_network.make_connection(SW3, None, DTYPE1, new_devices.CLEAR_ID)
+    new_monitors.make_monitor(XOR1, None)
+    return new_monitors
+
+
+def test_network_lookup_tables(mapped_monitors):
+    """Test if a mapped cone gives the same output as its gates."""
+    monitors = mapped_monitors
+    network = monitors.network
+    devices = monitors.devices
+    [SW1, SW3, AND1, XOR1] = devices.names.lookup(
+        ["Sw1", "Sw3", "And1", "Xor1"])
+    network.fold_constants = False
+    monitors.map_lookup_tables()
+    plan = network.get_execution_plan()
+    assert plan.gate_devices == []
+    assert len(plan.lookup_tables) == 1
+
+    for cycle in range(3):
+        assert network.execute_network()
+    # (1 AND 1) OR 1 is 1, XOR 1 is LOW
+    assert monitors.get_monitor_signal(XOR1, None) == devices.LOW
+    devices.set_switch(SW3, devices.LOW)
+    devices.set_switch(SW1, devices.LOW)
+    for cycle in range(3):
+        assert network.execute_network()
+    assert monitors.get_monitor_signal(XOR1, None) == devices.LOW
+
+    # Monitoring And1 keeps it out of the cone
+    monitors.make_monitor(AND1, None)
+    assert network.execute_network()
+    assert len(network.get_execution_plan().gate_devices) == 1
+    assert monitors.get_monitor_signal(AND1, None) == devices.LOW
+
+    network.map_lookup_tables(None)
+    assert network.get_execution_plan().lookup_tables == []
+
+
+def test_clock_gates_not_mapped():
+    """Test if a D-type clocked through gated gates sees the same edges.
+
+    Dtype2 toggles on every rising edge of a clock, and Dtype1 stores Q of
+    Dtype2 on the edges of the clock gated by a switch and delayed by two
+    NOT gates. A lookup table would settle the gates in one pass, so that
+    Dtype1 stored Q of Dtype2 before it toggled.
+    """
+    traces = []
+    for lut_inputs in [None, 4]:
+        new_names = Names()
+        new_devices = Devices(new_names)
+        new_network = Network(new_names, new_devices)
+        [SW1, SW2, CLK1, AND1, DTYPE1, DTYPE2, I1, I2] = new_names.lookup(
+            ["Sw1", "Sw2", "Clk1", "And1", "Dtype1", "Dtype2", "I1", "I2"])
+        new_devices.make_device(SW1, new_devices.SWITCH, 0)
+        new_devices.make_device(SW2, new_devices.SWITCH, 1)
+        new_devices.make_device(CLK1, new_devices.CLOCK, 2)
+        new_devices.make_device(AND1, new_devices.AND, 2)
+        new_devices.make_device(DTYPE1, new_devices.D_TYPE)
+        new_devices.make_device(DTYPE2, new_devices.D_TYPE)
+        new_network.make_connection(CLK1, None, AND1, I1)
+        new_network.make_connection(SW2, None, AND1, I2)
+        clock_id = AND1
+        for number in range(2):
+            [gate_id] = new_names.lookup(["".join(["Not", str(number)])])
+            new_devices.make_device(gate_id, new_devices.NOT)
+            new_network.make_connection(clock_id, None, gate_id, I1)
+            clock_id = gate_id
+        new_network.make_connection(clock_id, None, DTYPE1,
+                                    new_devices.CLK_ID)
+        new_network.make_connection(DTYPE2, new_devices.Q_ID, DTYPE1,
+                                    new_devices.DATA_ID)
+        new_network.make_connection(CLK1, None, DTYPE2, new_devices.CLK_ID)
+        new_network.make_connection(DTYPE2, new_devices.QBAR_ID, DTYPE2,
+                                    new_devices.DATA_ID)
+        for device_id in [DTYPE1, DTYPE2]:
+            new_network.make_connection(SW1, None, device_id,
+                                        new_devices.SET_ID)
+            new_network.make_connection(SW1, None, device_id,
+                                        new_devices.CLEAR_ID)
+        new_network.fold_constants = False
+        new_network.map_lookup_tables(lut_inputs)
+        random.seed(0)
+        new_devices.cold_startup()
+        trace = []
+        for cycle in range(12):
+            assert new_network.execute_network()
+            trace.append(new_network.get_output_signal(DTYPE1,
+                                                       new_devices.Q_ID))
+        traces.append(trace)
+    assert traces[0] == traces[1]
+    assert HIGH in traces[0]
+    assert new_network.get_execution_plan().lookup_tables == []
@@ -212,3 +212,24 @@ def test_display_signals(capsys, new_monitors):
     )
 
     assert "" in traces  # additional empty line at the end
+
+
+def test_prune_network(new_monitors):
+    """Test if pruning follows the monitors as they are made."""
+    names = new_monitors.names
+    devices = new_monitors.devices
+    network = new_monitors.network
+    [SW1_ID, SW2_ID, OR1_ID] = names.lookup(["Sw1", "Sw2", "Or1"])
+
+    new_monitors.remove_monitor(OR1_ID, None)
+    new_monitors.remove_monitor(SW2_ID, None)
+    new_monitors.prune_network()
+    assert network.cone == {SW1_ID}
+    assert network.execute_network()
+    assert network.get_execution_plan().gate_devices == []
+
+    # Monitoring Or1 brings it and its inputs into the network
+    new_monitors.make_monitor(OR1_ID, None)
+    assert network.cone == {SW1_ID, SW2_ID, OR1_ID}
+    assert network.execute_network()
+    assert network.get_output_signal(OR1_ID, None) == devices.LOW
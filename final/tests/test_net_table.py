@@ -0,0 +1,69 @@
+"""Test the net_table module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from net_table import NetTable
+
+
+@pytest.fixture
+def new_devices():
+    """Return a Devices instance with a switch and a D-type."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    [SW1_ID, DTYPE1_ID] = new_names.lookup(["Sw1", "Dtype1"])
+    new_devices.make_device(SW1_ID, new_devices.SWITCH, 1)
+    new_devices.make_device(DTYPE1_ID, new_devices.D_TYPE)
+    return new_devices
+
+
+def test_nets_allocated(new_devices):
+    """Test if every output gets a dense net ID in the shared table."""
+    names = new_devices.names
+    net_table = new_devices.net_table
+    [SW1_ID, DTYPE1_ID] = names.lookup(["Sw1", "Dtype1"])
+
+    assert new_devices.get_net(SW1_ID, None) == 0
+    assert new_devices.get_net(DTYPE1_ID, new_devices.Q_ID) == 1
+    assert new_devices.get_net(DTYPE1_ID, new_devices.QBAR_ID) == 2
+    assert new_devices.get_net(DTYPE1_ID, None) is None
+    assert new_devices.get_net_output(2) == (DTYPE1_ID, new_devices.QBAR_ID)
+    assert list(net_table.driver_kinds) == [
+        new_devices.SWITCH, new_devices.D_TYPE, new_devices.D_TYPE]
+
+
+def test_outputs_view(new_devices):
+    """Test if device outputs read and write the net table."""
+    names = new_devices.names
+    net_table = new_devices.net_table
+    [SW1_ID] = names.lookup(["Sw1"])
+    switch = new_devices.get_device(SW1_ID)
+
+    assert switch.outputs == {None: new_devices.LOW}
+    assert None in switch.outputs
+    assert len(switch.outputs) == 1
+
+    switch.outputs[None] = new_devices.FALLING
+    assert net_table.signals[0] == new_devices.FALLING
+    net_table.signals[0] = new_devices.LOW
+    assert switch.outputs[None] == new_devices.LOW
+
+    with pytest.raises(TypeError):
+        del switch.outputs[None]
+
+
+def test_dtype_memory(new_devices):
+    """Test if the D-type memory is stored in the net table."""
+    names = new_devices.names
+    net_table = new_devices.net_table
+    [SW1_ID, DTYPE1_ID] = names.lookup(["Sw1", "Dtype1"])
+    switch = new_devices.get_device(SW1_ID)
+    dtype = new_devices.get_device(DTYPE1_ID)
+
+    assert switch.dtype_memory is None
+    assert net_table.memory[switch.device_index] == NetTable.NO_MEMORY
+
+    dtype.dtype_memory = new_devices.HIGH
+    assert net_table.memory[dtype.device_index] == new_devices.HIGH
+    dtype.dtype_memory = None
+    assert dtype.dtype_memory is None
@@ -0,0 +1,118 @@
+"""Test the netlist_builder module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from netlist_builder import NetlistBuilder
+
+
+@pytest.fixture
+def new_builder():
+    """Return a NetlistBuilder instance for an empty network."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    return NetlistBuilder(new_names, new_devices, new_network)
+
+
+def test_build_netlist(new_builder):
+    """Test if build makes the devices and connections of a netlist."""
+    names = new_builder.names
+    devices = new_builder.devices
+    network = new_builder.network
+    device_specs = [("Sw1", "SWITCH", 1), ("Sw2", "SWITCH", 0),
+                    ("Clk", "CLOCK", 3), ("Nand1", "NAND", 2),
+                    ("Dtype1", "DTYPE", None)]
+    connection_specs = [("Sw1", None, "Nand1", "I1"),
+                        ("Nand1", "I2", "Sw2", None),
+                        ("Clk", None, "Dtype1", "CLK"),
+                        ("Sw1", None, "Dtype1", "SET"),
+                        ("Sw2", None, "Dtype1", "CLEAR"),
+                        ("Nand1", None, "Dtype1", "DATA")]
+
+    assert new_builder.build(device_specs, connection_specs)
+    assert new_builder.device_errors == []
+    assert new_builder.connection_errors == []
+
+    [SW1_ID, SW2_ID, CLK_ID, NAND1_ID, DTYPE1_ID, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "Clk", "Nand1", "Dtype1", "I1", "I2"])
+    assert devices.find_devices() == [SW1_ID, SW2_ID, CLK_ID, NAND1_ID,
+                                      DTYPE1_ID]
+    assert devices.get_device(SW1_ID).switch_state == devices.HIGH
+    clock = devices.get_device(CLK_ID)
+    assert clock.clock_half_period == 3
+    assert clock.clock_counter in range(3)
+    dtype = devices.get_device(DTYPE1_ID)
+    assert dtype.dtype_memory in [devices.LOW, devices.HIGH]
+    assert network.get_connected_output(NAND1_ID, I1) == (SW1_ID, None)
+    assert network.get_connected_output(NAND1_ID, I2) == (SW2_ID, None)
+    assert network.get_fanout(SW1_ID, None) == [
+        (NAND1_ID, I1), (DTYPE1_ID, devices.SET_ID)]
+    assert network.check_network()
+
+    # The network runs as if it had been built one device at a time
+    assert network.execute_network()
+    assert network.get_output_signal(NAND1_ID, None) == devices.HIGH
+
+
+def test_build_reports_all_errors(new_builder):
+    """Test if build reports every error and leaves the network unchanged."""
+    devices = new_builder.devices
+    network = new_builder.network
+    device_specs = [("Sw1", "SWITCH", 2),
+                    ("And1", "AND", 2),
+                    ("And1", "OR", 2),
+                    ("Xor1", "XOR", 2),
+                    ("Or1", "OR", None),
+                    ("Bad1", "BUFFER", None),
+                    ("Sw2", "SWITCH", 0),
+                    ("Not1", "NOT", None)]
+    connection_specs = [("Sw2", None, "And1", "I1"),
+                        ("Sw2", None, "And1", "I1"),
+                        ("Sw2", None, "Missing", "I1"),
+                        ("Sw2", None, "And1", "I3"),
+                        ("And1", "I2", "Not1", "I1"),
+                        ("And1", None, "Sw2", None),
+                        ("Sw2", None, "Not1", "I1")]
+
+    assert not new_builder.build(device_specs, connection_specs)
+    assert new_builder.device_errors == [
+        (0, devices.INVALID_QUALIFIER),
+        (1, new_builder.INPUT_UNCONNECTED),
+        (2, devices.DEVICE_PRESENT),
+        (3, devices.QUALIFIER_PRESENT),
+        (4, devices.NO_QUALIFIER),
+        (5, devices.BAD_DEVICE),
+    ]
+    assert new_builder.connection_errors == [
+        (1, network.INPUT_CONNECTED),
+        (2, network.DEVICE_ABSENT),
+        (3, network.PORT_ABSENT),
+        (4, network.INPUT_TO_INPUT),
+        (5, network.OUTPUT_TO_OUTPUT),
+    ]
+    assert devices.devices_list == []
+    assert network.fanout == {}
+
+
+def test_build_connects_existing_devices(new_builder):
+    """Test if build checks connections to devices already in the network."""
+    names = new_builder.names
+    devices = new_builder.devices
+    network = new_builder.network
+    [SW1_ID, OR1_ID, I1] = names.lookup(["Sw1", "Or1", "I1"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(OR1_ID, devices.OR, 2)
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+
+    assert not new_builder.build([("Sw1", "SWITCH", 1)],
+                                 [("Sw1", None, "Or1", "I1")])
+    assert new_builder.device_errors == [(0, devices.DEVICE_PRESENT)]
+    assert new_builder.connection_errors == [(0, network.INPUT_CONNECTED)]
+
+    version = network.version
+    assert new_builder.build([("Sw2", "SWITCH", 1)],
+                             [("Sw2", None, "Or1", "I2")])
+    assert network.check_network()
+    assert network.version > version
@@ -0,0 +1,31 @@
+"""Test the netlist_graph module."""
+from netlist_graph import find_strongly_connected, find_loops
+
+
+def test_find_strongly_connected():
+    """Test if the components are found and ordered after their successors."""
+    edges = {1: [2], 2: [3, 4], 3: [1], 4: [5], 5: [4, 6], 6: []}
+    components = find_strongly_connected([1, 2, 3, 4, 5, 6],
+                                         edges.__getitem__)
+
+    assert sorted(sorted(component) for component in components) == [
+        [1, 2, 3], [4, 5], [6]]
+    # Every component comes after the components it has an edge to
+    assert [sorted(component) for component in components] == [
+        [6], [4, 5], [1, 2, 3]]
+
+
+def test_find_strongly_connected_long_chain():
+    """Test if a long chain does not exhaust the stack."""
+    length = 100000
+    components = find_strongly_connected(
+        range(length), lambda node: [node + 1] if node + 1 < length else [])
+    assert len(components) == length
+
+
+def test_find_loops():
+    """Test if only components with a loop are returned."""
+    edges = {1: [1], 2: [3], 3: [], 4: [5], 5: [4, 9]}
+    loops = find_loops([1, 2, 3, 4, 5], edges.__getitem__)
+
+    assert sorted(sorted(loop) for loop in loops) == [[1], [4, 5]]
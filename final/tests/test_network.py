@@ -179,6 +179,68 @@ def test_make_connection_gives_error(
     assert left_expression == right_expression
 
 
+def test_get_fanout(network_with_devices):
+    """Test if the fanout index follows connections as they are changed."""
+    network = network_with_devices
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, SW2_ID, OR1_ID, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "Or1", "I1", "I2"]
+    )
+
+    assert network.get_fanout(SW1_ID, None) == []
+
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+    network.make_connection(OR1_ID, I2, SW1_ID, None)
+    assert network.get_fanout(SW1_ID, None) == [(OR1_ID, I1), (OR1_ID, I2)]
+    assert network.get_fanout(SW2_ID, None) == []
+
+    network.remove_connection(OR1_ID, I1, SW1_ID, None)
+    assert network.get_fanout(SW1_ID, None) == [(OR1_ID, I2)]
+    network.remove_connection(SW1_ID, None, OR1_ID, I2)
+    assert network.get_fanout(SW1_ID, None) == []
+    assert devices.get_device(OR1_ID).inputs == {I1: None, I2: None}
+
+
+@pytest.mark.parametrize(
+    "function_args, error",
+    [
+        # I1 is not a valid device id
+        ("(I1, I1, OR1_ID, I2)", "network.DEVICE_ABSENT"),
+        ("(OR1_ID, I1, OR1_ID, I2)", "network.PORT_ABSENT"),
+        # Or1.I1 is driven by Sw1, not Sw2
+        ("(OR1_ID, I1, SW2_ID, None)", "network.NOT_CONNECTED"),
+        # Or1.I2 is unconnected
+        ("(OR1_ID, I2, SW1_ID, None)", "network.NOT_CONNECTED"),
+        # Input first
+        ("(OR1_ID, I1, SW1_ID, None)", "network.NO_ERROR"),
+        # Output first
+        ("(SW1_ID, None, OR1_ID, I1)", "network.NO_ERROR"),
+    ],
+)
+def test_remove_connection_gives_error(
+    network_with_devices, function_args, error
+):
+    """Test if the remove_connection function returns the correct errors."""
+    network = network_with_devices
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, SW2_ID, OR1_ID, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "Or1", "I1", "I2"]
+    )
+
+    # Connect Or1.I1 to Sw1
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+
+    # left_expression is of the form: network.remove_connection(...)
+    left_expression = eval("".join(["network.remove_connection",
+                                    function_args]))
+    right_expression = eval(error)
+    assert left_expression == right_expression
+
+
 def test_execute_xor(new_network):
     """Test if execute_network returns the correct output for XOR gates."""
     network = new_network
@@ -385,3 +447,200 @@ def test_oscillating_network(new_network):
     network.make_connection(NOR1, None, NOR1, I1)
 
     assert not network.execute_network()
+    assert network.oscillating_loops == [[NOR1]]
+    assert network.get_oscillating_loop_names() == [["Nor1"]]
+
+
+def test_oscillating_loop_is_reported(new_network):
+    """Test if only the devices in the oscillating loop are reported."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [SW1, NOT1, NOT2, NOT3, AND1, I1, I2] = names.lookup(
+        ["Sw1", "Not1", "Not2", "Not3", "And1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    for device_id in [NOT1, NOT2, NOT3]:
+        devices.make_device(device_id, devices.NOT)
+    devices.make_device(AND1, devices.AND, 2)
+    # A ring of three inverters, with an AND gate watching it
+    network.make_connection(NOT1, None, NOT2, I1)
+    network.make_connection(NOT2, None, NOT3, I1)
+    network.make_connection(NOT3, None, NOT1, I1)
+    network.make_connection(SW1, None, AND1, I1)
+    network.make_connection(NOT3, None, AND1, I2)
+
+    network.iteration_limit = 50
+    assert not network.execute_network()
+    assert network.oscillating_loops == [[NOT1, NOT2, NOT3]]
+
+    # The loop is only reported for the cycle that failed to settle
+    network.remove_connection(NOT3, None, NOT1, I1)
+    network.make_connection(SW1, None, NOT1, I1)
+    assert network.execute_network()
+    assert network.oscillating_loops == []
+
+
+@pytest.mark.parametrize("stages", [6, 8, 12])
+def test_ripple_counter_settles(new_network, stages):
+    """Test if a ripple counter counts without being reported oscillating.
+
+    Each D-type toggles, and its QBAR clocks the next one, so a change can
+    ripple through every stage in one cycle with no gates in between. The
+    D-types are made last stage first, so that each pass moves the change
+    on by one stage only.
+    """
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [SW1, CLK1] = names.lookup(["Sw1", "Clk1"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(CLK1, devices.CLOCK, 1)
+    d_type_ids = names.lookup(["".join(["Dtype", str(stage)])
+                               for stage in range(stages)])
+    for device_id in reversed(d_type_ids):
+        devices.make_device(device_id, devices.D_TYPE)
+    clock_id = CLK1
+    clock_port = None
+    for device_id in d_type_ids:
+        network.make_connection(clock_id, clock_port, device_id,
+                                devices.CLK_ID)
+        network.make_connection(device_id, devices.QBAR_ID, device_id,
+                                devices.DATA_ID)
+        network.make_connection(SW1, None, device_id, devices.SET_ID)
+        network.make_connection(SW1, None, device_id, devices.CLEAR_ID)
+        [clock_id, clock_port] = [device_id, devices.QBAR_ID]
+    # Every stage starts HIGH, so the first rising edge ripples through all
+    # of them
+    devices.cold_startup()
+    for device_id in d_type_ids:
+        devices.get_device(device_id).dtype_memory = devices.HIGH
+
+    counts = []
+    for cycle in range(8):
+        assert network.execute_network()
+        assert network.oscillating_loops == []
+        counts.append(sum(network.get_output_signal(
+            device_id, devices.Q_ID) << stage
+            for stage, device_id in enumerate(d_type_ids)))
+    # The counter steps on every rising edge of the clock
+    assert counts[::2] == [2 ** stages - 1, 0, 1, 2] \
+        or counts[1::2] == [2 ** stages - 1, 0, 1, 2]
+
+
+def test_execute_not_gate(new_network):
+    """Test if NOT gates invert their input."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, NOT1_ID, I1] = names.lookup(["Sw1", "Not1", "I1"])
+    devices.make_device(SW1_ID, devices.SWITCH, 0)
+    devices.make_device(NOT1_ID, devices.NOT)
+    network.make_connection(SW1_ID, None, NOT1_ID, I1)
+
+    assert network.execute_network()
+    assert network.get_output_signal(NOT1_ID, None) == devices.HIGH
+
+    devices.set_switch(SW1_ID, devices.HIGH)
+    assert network.execute_network()
+    assert network.get_output_signal(NOT1_ID, None) == devices.LOW
+
+
+def test_execution_plan_reused(network_with_devices):
+    """Test if the execution plan is only rebuilt when the netlist changes."""
+    network = network_with_devices
+    devices = network.devices
+    names = devices.names
+
+    [SW1_ID, SW2_ID, OR1_ID, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "Or1", "I1", "I2"]
+    )
+    network.make_connection(SW1_ID, None, OR1_ID, I1)
+    network.make_connection(SW2_ID, None, OR1_ID, I2)
+
+    plan = network.get_execution_plan()
+    assert network.execute_network()
+    devices.set_switch(SW1_ID, devices.HIGH)
+    assert network.execute_network()
+    # Changing a switch state does not change the plan
+    assert network.get_execution_plan() is plan
+    assert network.get_output_signal(OR1_ID, None) == devices.HIGH
+
+    # Removing a connection, making one or adding a device rebuilds it
+    network.remove_connection(OR1_ID, I1, SW1_ID, None)
+    new_plan = network.get_execution_plan()
+    assert new_plan is not plan
+    assert new_plan.get_input_signals(OR1_ID) == \
+        [(I1, None), (I2, devices.LOW)]
+    network.make_connection(SW2_ID, None, OR1_ID, I1)
+    assert network.get_execution_plan() is not new_plan
+    new_plan = network.get_execution_plan()
+    [SW3_ID] = names.lookup(["Sw3"])
+    devices.make_device(SW3_ID, devices.SWITCH, 0)
+    assert network.get_execution_plan() is not new_plan
+
+
+def test_cone_of_influence(new_network):
+    """Test if only the devices the cone depends on are executed."""
+    network = new_network
+    devices = network.devices
+    names = devices.names
+    [SW1, SW2, AND1, OR1, DTYPE1, CLK1, I1, I2] = names.lookup(
+        ["Sw1", "Sw2", "And1", "Or1", "Dtype1", "Clk1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 1)
+    devices.make_device(SW2, devices.SWITCH, 1)
+    devices.make_device(AND1, devices.AND, 2)
+    devices.make_device(OR1, devices.OR, 1)
+    devices.make_device(DTYPE1, devices.D_TYPE)
+    devices.make_device(CLK1, devices.CLOCK, 1)
+    # And1 reads Sw1 and Dtype1, which samples Sw1. Or1 reads Sw2.
+    network.make_connection(SW1, None, AND1, I1)
+    network.make_connection(DTYPE1, devices.Q_ID, AND1, I2)
+    network.make_connection(SW1, None, DTYPE1, devices.DATA_ID)
+    network.make_connection(CLK1, None, DTYPE1, devices.CLK_ID)
+    network.make_connection(SW2, None, DTYPE1, devices.SET_ID)
+    network.make_connection(SW2, None, DTYPE1, devices.CLEAR_ID)
+
+    network.set_cone([AND1])
+    assert network.cone == {SW1, SW2, AND1, DTYPE1, CLK1}
+    plan = network.get_execution_plan()
+    assert len(plan.gate_devices) == 1
+    assert len(plan.d_type_devices) == 1
+
+    # Or1 is not in the cone, so it is never executed
+    network.make_connection(SW2, None, OR1, I1)
+    assert network.cone == {SW1, SW2, AND1, DTYPE1, CLK1}
+    assert network.execute_network()
+    assert len(network.get_execution_plan().gate_devices) == 1
+
+    # Adding Or1 replans the network with it
+    assert network.add_to_cone(OR1)
+    assert not network.add_to_cone(OR1)
+    assert network.execute_network()
+    assert len(network.get_execution_plan().gate_devices) == 2
+    assert network.get_output_signal(OR1, None) == devices.HIGH
+
+    network.set_cone(None)
+    assert network.cone is None
+    assert len(network.get_execution_plan().switch_devices) == 2
+
+
+def test_connection_into_cone(new_network):
+    """Test if a connection made into the cone adds its driver."""
+    network = new_network
+    devices = network.devices
+    [SW1, SW2, OR1, I1, I2] = devices.names.lookup(
+        ["Sw1", "Sw2", "Or1", "I1", "I2"])
+    devices.make_device(SW1, devices.SWITCH, 0)
+    devices.make_device(SW2, devices.SWITCH, 1)
+    devices.make_device(OR1, devices.OR, 2)
+    network.make_connection(SW1, None, OR1, I1)
+    network.set_cone([OR1])
+    assert network.cone == {SW1, OR1}
+
+    network.make_connection(OR1, I2, SW2, None)
+    assert network.cone == {SW1, SW2, OR1}
+    assert network.execute_network()
+    assert network.get_output_signal(OR1, None) == devices.HIGH
@@ -0,0 +1,150 @@
+"""Test the partitioned_engine module."""
+import random
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from simulator import Simulator
+from partitioned_engine import (PartitionedEngine, partition_gates,
+                                get_pass_levels)
+from signal_tables import LOW, HIGH
+
+# Gate tuples as in the execution plan
+AND = (HIGH, HIGH)
+NOR = (LOW, HIGH)
+NOT = (HIGH, LOW)
+
+
+def make_gate(input_nets, output_net, rule):
+    """Return a gate tuple for the given rule."""
+    return (tuple(input_nets), output_net) + rule
+
+
+def test_partition_gates():
+    """Test if connected gates share a partition of balanced size."""
+    gates = [make_gate([0], 4, NOT), make_gate([1], 5, NOT),
+             make_gate([4, 2], 6, AND), make_gate([5, 3], 7, AND),
+             make_gate([6], 8, NOT), make_gate([7], 9, NOT)]
+    part_of = partition_gates(gates, 2)
+    assert part_of[0] == part_of[2] == part_of[4]
+    assert part_of[1] == part_of[3] == part_of[5]
+    assert part_of[0] != part_of[1]
+
+    # Each partition holds at most its share of the gates
+    part_of = partition_gates(gates, 4)
+    assert max(part_of.count(part) for part in range(4)) == 2
+
+
+def test_pass_levels():
+    """Test if gates wait for the gates before them that they touch."""
+    # Gate 1 reads gate 2, which comes after it, and gate 3 reads gate 2
+    gates = [make_gate([0], 4, NOT), make_gate([6], 5, NOT),
+             make_gate([4], 6, NOT), make_gate([6, 4], 7, AND)]
+    assert get_pass_levels(gates) == [0, 0, 1, 2]
+
+    # A latch of two NOR gates reading each other
+    gates = [make_gate([0, 2], 1, NOR), make_gate([3, 1], 2, NOR)]
+    assert get_pass_levels(gates) == [0, 1]
+
+
+def build_latch_network():
+    """Return a Network instance with a latch, a D-type and a clock.
+
+    The latch is gated by the clock into Nand1 and Not1, which no D-type
+    reads, and the D-type toggles when Sw1 and the clock are HIGH.
+    """
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    [SW1, SW2, NOR1, NOR2, NAND1, NOT1, AND1, XOR1, DTYPE1, CLK1, I1,
+     I2] = new_names.lookup(["Sw1", "Sw2", "Nor1", "Nor2", "Nand1", "Not1",
+                             "And1", "Xor1", "Dtype1", "Clk1", "I1", "I2"])
+    new_devices.make_device(SW1, new_devices.SWITCH, 1)
+    new_devices.make_device(SW2, new_devices.SWITCH, 0)
+    new_devices.make_device(NOR1, new_devices.NOR, 2)
+    new_devices.make_device(NOR2, new_devices.NOR, 2)
+    new_devices.make_device(NAND1, new_devices.NAND, 2)
+    new_devices.make_device(NOT1, new_devices.NOT)
+    new_devices.make_device(AND1, new_devices.AND, 2)
+    new_devices.make_device(XOR1, new_devices.XOR)
+    new_devices.make_device(DTYPE1, new_devices.D_TYPE)
+    new_devices.make_device(CLK1, new_devices.CLOCK, 2)
+    new_network.make_connection(SW1, None, NOR1, I1)
+    new_network.make_connection(NOR2, None, NOR1, I2)
+    new_network.make_connection(SW2, None, NOR2, I1)
+    new_network.make_connection(NOR1, None, NOR2, I2)
+    new_network.make_connection(NOR1, None, NAND1, I1)
+    new_network.make_connection(CLK1, None, NAND1, I2)
+    new_network.make_connection(NAND1, None, NOT1, I1)
+    new_network.make_connection(SW1, None, AND1, I1)
+    new_network.make_connection(CLK1, None, AND1, I2)
+    new_network.make_connection(AND1, None, XOR1, I1)
+    new_network.make_connection(DTYPE1, new_devices.Q_ID, XOR1, I2)
+    new_network.make_connection(XOR1, None, DTYPE1, new_devices.DATA_ID)
+    new_network.make_connection(CLK1, None, DTYPE1, new_devices.CLK_ID)
+    new_network.make_connection(SW2, None, DTYPE1, new_devices.SET_ID)
+    new_network.make_connection(SW2, None, DTYPE1, new_devices.CLEAR_ID)
+    return new_network
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_engine_matches_network(processes):
+    """Test if the engine gives the same signals as the network alone."""
+    traces = []
+    for engine_processes in [None, processes]:
+        network = build_latch_network()
+        devices = network.devices
+        [SW1, SW2] = devices.names.lookup(["Sw1", "Sw2"])
+        random.seed(0)
+        devices.cold_startup()
+        engine = None
+        execute_network = network.execute_network
+        if engine_processes is not None:
+            engine = PartitionedEngine(network, engine_processes)
+            execute_network = engine.execute_network
+        trace = []
+        for cycle in range(16):
+            if cycle == 5:
+                devices.set_switch(SW1, devices.LOW)
+            if cycle == 10:
+                devices.set_switch(SW2, devices.HIGH)
+            assert execute_network()
+            trace.append((bytes(devices.net_table.signals),
+                          bytes(devices.net_table.memory)))
+        traces.append(trace)
+    assert len(engine.workers) == processes - 1
+    # The gates the D-type reads are executed by this process
+    gate_nets = [devices.get_device(device_id).output_nets[0]
+                 for device_id in devices.names.lookup(["And1", "Xor1"])]
+    assert set(gate_nets).issubset(output_net for input_nets, output_net,
+                                   x, y in engine.gates)
+    engine.close()
+    assert engine.workers == []
+    assert traces[0] == traces[1]
+
+
+def test_simulator_engine():
+    """Test if the simulator runs its cycles with the given engine."""
+    network = build_latch_network()
+    devices = network.devices
+    monitors = Monitors(network.names, devices, network)
+    [AND1] = devices.names.lookup(["And1"])
+    monitors.make_monitor(AND1, None)
+    engine = PartitionedEngine(network, 2)
+    simulator = Simulator(network, monitors, engine=engine)
+    try:
+        assert simulator.run(8) == 8
+    finally:
+        engine.close()
+    assert engine.plan is None
+    assert len(monitors.monitors_dictionary[(AND1, None)]) == 8
+
+    # Adding a device makes the partitions again
+    [SW3] = devices.names.lookup(["Sw3"])
+    devices.make_device(SW3, devices.SWITCH, 0)
+    assert engine.execute_network()
+    assert engine.plan is network.get_execution_plan()
+    engine.close()
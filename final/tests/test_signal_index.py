@@ -0,0 +1,43 @@
+"""Test the signal_index module."""
+import pytest
+
+from signal_index import SignalIndex
+
+
+@pytest.fixture
+def new_index():
+    """Return a SignalIndex instance for some signal names."""
+    return SignalIndex(["and2", "sw1", "And1.Q", "dtype.QBAR", "sw10",
+                        "nand1"])
+
+
+def test_get_name_and_position(new_index):
+    """Test if names and positions are looked up in both directions."""
+    assert len(new_index) == 6
+    assert new_index.get_name(2) == "And1.Q"
+    assert new_index.get_position("sw10") == 4
+    assert new_index.get_position("missing") is None
+    assert new_index.get_positions(["nand1", "missing", "sw1"]) == [5, 1]
+
+
+def test_search_empty(new_index):
+    """Test if an empty search matches every name in order."""
+    assert new_index.search("") == [0, 1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("text, expected_positions", [
+    ("sw", [1, 4]),
+    ("AND", [2, 0, 5]),
+    ("q", [2, 3]),
+    ("xyz", []),
+])
+def test_search(new_index, text, expected_positions):
+    """Test if prefix matches come first, then substring matches."""
+    assert new_index.search(text) == expected_positions
+
+
+def test_search_incremental(new_index):
+    """Test if typing more characters gives the same results as a search."""
+    for text in ["a", "an", "and", "and1", "and"]:
+        assert new_index.search(text) == SignalIndex(
+            new_index.names_list).search(text)
@@ -0,0 +1,64 @@
+"""Test the signal_tables module."""
+import itertools
+
+import pytest
+
+from signal_tables import LOW, HIGH, RISING, FALLING, BLANK, SIGNALS, \
+    INVERT, SETTLED, UPDATE, SAMPLE, XOR, GATE_FOLDS
+
+
+def test_levels_match_devices():
+    """Test if the table levels are the levels used by Devices."""
+    from names import Names
+    from devices import Devices
+
+    devices = Devices(Names())
+    assert [LOW, HIGH, RISING, FALLING, BLANK] == [
+        devices.LOW, devices.HIGH, devices.RISING, devices.FALLING,
+        devices.BLANK]
+
+
+@pytest.mark.parametrize("signal, target, expected", [
+    (LOW, LOW, LOW),
+    (LOW, HIGH, RISING),
+    (FALLING, LOW, LOW),
+    (FALLING, HIGH, RISING),
+    (HIGH, LOW, FALLING),
+    (HIGH, HIGH, HIGH),
+    (RISING, LOW, FALLING),
+    (RISING, HIGH, HIGH),
+    (BLANK, HIGH, None),
+])
+def test_update(signal, target, expected):
+    """Test if signals step towards their target."""
+    assert UPDATE[signal][target] == expected
+
+
+def test_invert_and_settled():
+    """Test if the inverse and settled levels are correct."""
+    assert INVERT == (HIGH, LOW, None, None, None)
+    assert [SETTLED[signal] for signal in [RISING, FALLING]] == [HIGH, LOW]
+    assert [SAMPLE[signal] for signal in [FALLING, RISING]] == [HIGH, LOW]
+
+
+@pytest.mark.parametrize("x, y", [
+    (HIGH, HIGH), (LOW, LOW), (HIGH, LOW), (LOW, HIGH)])
+def test_gate_folds(x, y):
+    """Test if folding gives y only when every input is x."""
+    (output, table, final_output) = GATE_FOLDS[(x, y)]
+    assert output == y
+    assert final_output == INVERT[y]
+    for inputs in itertools.product(SIGNALS, repeat=3):
+        output = y
+        for signal in inputs:
+            output = table[output][signal]
+        expected = y if all(signal == x for signal in inputs) \
+            else INVERT[y]
+        assert output == expected
+
+
+def test_xor():
+    """Test if XOR is HIGH only when its inputs differ."""
+    assert GATE_FOLDS[(None, None)] == (None, XOR, None)
+    for first, second in itertools.product(SIGNALS, repeat=2):
+        assert XOR[first][second] == (LOW if first == second else HIGH)
@@ -0,0 +1,188 @@
+"""Test the simulator module."""
+import threading
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from simulator import Simulator, SimulationWorker
+
+
+@pytest.fixture
+def new_simulator():
+    """Return a Simulator instance for a monitored OR gate and two switches."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    new_monitors = Monitors(new_names, new_devices, new_network)
+
+    [SW1_ID, SW2_ID, OR1_ID, I1, I2] = new_names.lookup(
+        ["Sw1", "Sw2", "Or1", "I1", "I2"]
+    )
+    new_devices.make_device(SW1_ID, new_devices.SWITCH, 1)
+    new_devices.make_device(SW2_ID, new_devices.SWITCH, 0)
+    new_devices.make_device(OR1_ID, new_devices.OR, 2)
+    new_network.make_connection(SW1_ID, None, OR1_ID, I1)
+    new_network.make_connection(SW2_ID, None, OR1_ID, I2)
+    new_monitors.make_monitor(OR1_ID, None)
+
+    return Simulator(new_network, new_monitors)
+
+
+def test_run(new_simulator):
+    """Test if run executes and records the requested number of cycles."""
+    simulator = new_simulator
+    names = simulator.network.names
+    devices = simulator.network.devices
+    [OR1_ID] = names.lookup(["Or1"])
+
+    assert simulator.run(5) == 5
+    assert not simulator.oscillating
+    assert simulator.monitors.monitors_dictionary[(OR1_ID, None)] == \
+        [devices.HIGH] * 5
+
+
+def test_run_reports_progress(new_simulator):
+    """Test if run reports the cycles completed to the progress callback."""
+    simulator = new_simulator
+    simulator.progress_interval = 0
+    progress = []
+
+    # The network settles in the first cycle, so the quiet second and third
+    # cycles are completed with it
+    simulator.run(3, progress.append)
+    assert progress == [3]
+
+    simulator.run(3, progress.append)
+    assert progress == [3, 3]
+
+
+def test_cancel(new_simulator):
+    """Test if a cancelled simulator stops running."""
+    simulator = new_simulator
+
+    simulator.cancel()
+    assert simulator.is_cancelled()
+    assert simulator.run(10) == 0
+
+
+def test_run_oscillating_network():
+    """Test if run stops at the first cycle the network fails to settle."""
+    names = Names()
+    devices = Devices(names)
+    network = Network(names, devices)
+    monitors = Monitors(names, devices, network)
+
+    [NOR1, I1] = names.lookup(["Nor1", "I1"])
+    devices.make_device(NOR1, devices.NOR, 1)
+    network.make_connection(NOR1, None, NOR1, I1)
+
+    simulator = Simulator(network, monitors)
+    assert simulator.run(10) == 0
+    assert simulator.oscillating
+
+
+def test_simulation_worker(new_simulator):
+    """Test if the worker runs the simulation and reports when finished."""
+    finished = threading.Event()
+    results = []
+
+    def on_finish(cycles_completed, oscillating, cancelled):
+        results.append((cycles_completed, oscillating, cancelled))
+        finished.set()
+
+    worker = SimulationWorker(new_simulator, 20, finish_callback=on_finish)
+    worker.start()
+    assert finished.wait(5)
+    worker.join()
+
+    assert results == [(20, False, False)]
+    assert worker.cycles_completed == 20
+
+
+def test_run_skips_quiet_cycles():
+    """Test if skipping quiet cycles records the same traces as executing."""
+    traces = []
+    for skip in [False, True]:
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        monitors = Monitors(names, devices, network)
+        [CLK, DTYPE, SW1] = names.lookup(["Clk", "Dtype", "Sw1"])
+        devices.make_device(CLK, devices.CLOCK, 7)
+        devices.make_device(DTYPE, devices.D_TYPE)
+        devices.make_device(SW1, devices.SWITCH, 0)
+        network.make_connection(CLK, None, DTYPE, devices.CLK_ID)
+        network.make_connection(DTYPE, devices.QBAR_ID, DTYPE,
+                                devices.DATA_ID)
+        network.make_connection(SW1, None, DTYPE, devices.SET_ID)
+        network.make_connection(SW1, None, DTYPE, devices.CLEAR_ID)
+        # Start the clock and D-type from the same state in both runs
+        devices.get_device(CLK).clock_counter = 3
+        devices.get_device(CLK).outputs[None] = devices.LOW
+        devices.get_device(DTYPE).dtype_memory = devices.LOW
+        monitors.make_monitor(CLK, None)
+        monitors.make_monitor(DTYPE, devices.Q_ID)
+
+        if skip:
+            executed = []
+            execute_network = network.execute_network
+
+            def counting_execute_network():
+                executed.append(1)
+                return execute_network()
+
+            network.execute_network = counting_execute_network
+            assert Simulator(network, monitors).run(50) == 50
+            # Only the first cycle and the clock edges are executed
+            assert len(executed) == 8
+        else:
+            for cycle in range(50):
+                assert network.execute_network()
+                monitors.record_signals()
+        traces.append(dict(monitors.monitors_dictionary))
+
+    assert traces[0] == traces[1]
+
+
+def test_run_detects_period():
+    """Test if a periodic network is repeated instead of simulated."""
+    results = []
+    for detect_period in [False, True]:
+        names = Names()
+        devices = Devices(names)
+        network = Network(names, devices)
+        monitors = Monitors(names, devices, network)
+        [CLK, DTYPE, SW1] = names.lookup(["Clk", "Dtype", "Sw1"])
+        devices.make_device(CLK, devices.CLOCK, 3)
+        devices.make_device(DTYPE, devices.D_TYPE)
+        devices.make_device(SW1, devices.SWITCH, 0)
+        network.make_connection(CLK, None, DTYPE, devices.CLK_ID)
+        network.make_connection(DTYPE, devices.QBAR_ID, DTYPE,
+                                devices.DATA_ID)
+        network.make_connection(SW1, None, DTYPE, devices.SET_ID)
+        network.make_connection(SW1, None, DTYPE, devices.CLEAR_ID)
+        devices.get_device(CLK).clock_counter = 1
+        devices.get_device(CLK).outputs[None] = devices.LOW
+        devices.get_device(DTYPE).dtype_memory = devices.LOW
+        monitors.make_monitor(CLK, None)
+        monitors.make_monitor(DTYPE, devices.Q_ID)
+
+        simulator = Simulator(network, monitors, detect_period=detect_period)
+        assert simulator.run(1001) == 1001
+        period = simulator.period
+        # The network continues from the same state
+        assert simulator.run(7) == 7
+        results.append((period, dict(monitors.monitors_dictionary),
+                        network.get_state_digest()))
+
+    [(period, traces, state), (detected_period, detected_traces,
+                               detected_state)] = results
+    assert period is None
+    # The clock has a period of 6 cycles, and the D-type toggles on every
+    # rising edge
+    assert detected_period == 12
+    assert detected_traces == traces
+    assert detected_state == state
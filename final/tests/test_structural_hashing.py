@@ -0,0 +1,129 @@
+"""Test the structural_hashing module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from structural_hashing import find_duplicate_gates
+
+
+@pytest.fixture
+def duplicated_network():
+    """Return a Network instance with duplicate gates.
+
+    And1 and And2 read Sw1 and Sw2 in a different order, Or1 and Or2 read
+    And1 and And2, and Nand1 reads the same switches as And1.
+    """
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    [SW1, SW2, AND1, AND2, OR1, OR2, NAND1, I1, I2] = new_names.lookup(
+        ["Sw1", "Sw2", "And1", "And2", "Or1", "Or2", "Nand1", "I1", "I2"])
+    new_devices.make_device(SW1, new_devices.SWITCH, 1)
+    new_devices.make_device(SW2, new_devices.SWITCH, 1)
+    for device_id in [AND1, AND2]:
+        new_devices.make_device(device_id, new_devices.AND, 2)
+    for device_id in [OR1, OR2]:
+        new_devices.make_device(device_id, new_devices.OR, 1)
+    new_devices.make_device(NAND1, new_devices.NAND, 2)
+
+    new_network.make_connection(SW1, None, AND1, I1)
+    new_network.make_connection(SW2, None, AND1, I2)
+    new_network.make_connection(SW2, None, AND2, I1)
+    new_network.make_connection(SW1, None, AND2, I2)
+    new_network.make_connection(AND1, None, OR1, I1)
+    new_network.make_connection(AND2, None, OR2, I1)
+    new_network.make_connection(SW1, None, NAND1, I1)
+    new_network.make_connection(SW2, None, NAND1, I2)
+    return new_network
+
+
+def test_find_duplicate_gates(duplicated_network):
+    """Test if gates reading merged duplicates are duplicates too."""
+    network = duplicated_network
+    [AND1, AND2, OR1, OR2] = network.names.lookup(
+        ["And1", "And2", "Or1", "Or2"])
+
+    assert find_duplicate_gates(network.devices, network) == {AND2: AND1,
+                                                              OR2: OR1}
+
+
+def test_merge_duplicate_gates(duplicated_network):
+    """Test if merged gates are not executed but keep their signals."""
+    network = duplicated_network
+    devices = network.devices
+    names = network.names
+    monitors = Monitors(names, devices, network)
+    [AND2, OR1, OR2] = names.lookup(["And2", "Or1", "Or2"])
+    monitors.make_monitor(OR2, None)
+
+    assert network.merge_duplicate_gates() == 2
+    assert len(network.get_execution_plan().gate_devices) == 3
+    assert network.execute_network()
+    assert network.execute_network()
+    assert devices.get_signal_name(OR2, None) == "Or2"
+    assert monitors.get_monitor_signal(OR2, None) == devices.HIGH
+    assert network.get_output_signal(AND2, None) == devices.HIGH
+    # Already merged gates are not merged again
+    assert network.merge_duplicate_gates() == 0
+
+    # Pruning to a merged gate keeps the gate that drives it
+    monitors.prune_network()
+    assert OR1 in network.cone
+
+
+def test_merge_after_pruning(duplicated_network):
+    """Test if merging into a gate outside the cone brings it into it."""
+    network = duplicated_network
+    devices = network.devices
+    names = network.names
+    monitors = Monitors(names, devices, network)
+    [SW1, AND1, OR1, OR2] = names.lookup(["Sw1", "And1", "Or1", "Or2"])
+    monitors.make_monitor(OR2, None)
+    monitors.prune_network()
+    assert OR1 not in network.cone
+
+    assert network.merge_duplicate_gates() == 2
+    assert OR1 in network.cone and AND1 in network.cone
+    assert network.execute_network()
+    devices.set_switch(SW1, devices.LOW)
+    for cycle in range(3):
+        assert network.execute_network()
+    assert monitors.get_monitor_signal(OR2, None) == devices.LOW
+
+
+def test_connection_unmerges_gates(duplicated_network):
+    """Test if changing a connection gives the merged gates their nets."""
+    network = duplicated_network
+    devices = network.devices
+    [SW2, AND2, I1] = network.names.lookup(["Sw2", "And2", "I1"])
+    network.merge_duplicate_gates()
+    assert network.execute_network()
+    assert network.execute_network()
+
+    assert network.remove_connection(AND2, I1, SW2, None) \
+        == network.NO_ERROR
+    assert network.merged_nets == {}
+    assert len(network.get_execution_plan().gate_devices) == 5
+    assert network.get_output_signal(AND2, None) == devices.HIGH
+
+
+def test_rejected_connection_keeps_merge(duplicated_network):
+    """Test if a connection that is not made leaves the gates merged."""
+    network = duplicated_network
+    [SW1, SW2, AND2, OR1, I1] = network.names.lookup(
+        ["Sw1", "Sw2", "And2", "Or1", "I1"])
+    network.merge_duplicate_gates()
+    merged_nets = dict(network.merged_nets)
+    version = network.version
+
+    # An input already connected, an absent device and a missing connection
+    assert network.make_connection(SW1, None, AND2, I1) \
+        == network.INPUT_CONNECTED
+    assert network.make_connection(SW1, None, network.names.query("Sw3"),
+                                   I1) == network.DEVICE_ABSENT
+    assert network.remove_connection(OR1, I1, SW2, None) \
+        == network.NOT_CONNECTED
+    assert network.merged_nets == merged_nets != {}
+    assert network.version == version
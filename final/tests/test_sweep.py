@@ -0,0 +1,172 @@
+"""Test the sweep module."""
+import random
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from simulator import Simulator
+from sweep import ParameterSweep
+
+
+def build_sweep(processes=1, trace_names=()):
+    """Return a ParameterSweep instance of a latch, a D-type and a clock.
+
+    Two switches set and reset a latch of NOR gates, whose output is ANDed
+    with a clock into a D-type clocked by the same clock.
+    """
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    new_monitors = Monitors(new_names, new_devices, new_network)
+    [SW1, SW2, NOR1, NOR2, AND1, DTYPE1, CLK1, I1, I2] = new_names.lookup(
+        ["Sw1", "Sw2", "Nor1", "Nor2", "And1", "Dtype1", "Clk1", "I1",
+         "I2"])
+    new_devices.make_device(SW1, new_devices.SWITCH, 0)
+    new_devices.make_device(SW2, new_devices.SWITCH, 1)
+    new_devices.make_device(NOR1, new_devices.NOR, 2)
+    new_devices.make_device(NOR2, new_devices.NOR, 2)
+    new_devices.make_device(AND1, new_devices.AND, 2)
+    new_devices.make_device(DTYPE1, new_devices.D_TYPE)
+    new_devices.make_device(CLK1, new_devices.CLOCK, 2)
+    new_network.make_connection(SW1, None, NOR1, I1)
+    new_network.make_connection(NOR2, None, NOR1, I2)
+    new_network.make_connection(SW2, None, NOR2, I1)
+    new_network.make_connection(NOR1, None, NOR2, I2)
+    new_network.make_connection(NOR1, None, AND1, I1)
+    new_network.make_connection(CLK1, None, AND1, I2)
+    new_network.make_connection(AND1, None, DTYPE1, new_devices.DATA_ID)
+    new_network.make_connection(CLK1, None, DTYPE1, new_devices.CLK_ID)
+    new_network.make_connection(SW1, None, DTYPE1, new_devices.SET_ID)
+    new_network.make_connection(SW1, None, DTYPE1, new_devices.CLEAR_ID)
+    new_monitors.make_monitor(NOR1, None)
+    new_monitors.make_monitor(AND1, None)
+    return ParameterSweep(new_names, new_devices, new_network, new_monitors,
+                          12, processes, trace_names)
+
+
+def test_get_combinations():
+    """Test if every combination of the switches is listed in order."""
+    sweep = build_sweep()
+    switch_ids = sweep.get_switch_ids(["Sw1", "Sw2"])
+    [SW1, SW2] = switch_ids
+    assert sweep.get_combinations(switch_ids) == [
+        [(SW1, 0), (SW2, 0)], [(SW1, 0), (SW2, 1)], [(SW1, 1), (SW2, 0)],
+        [(SW1, 1), (SW2, 1)]]
+
+    # Only switches can be swept
+    assert sweep.get_switch_ids(["Sw1", "Nor1"]) is None
+    assert sweep.get_switch_ids(["Sw3"]) is None
+
+
+def test_read_configurations(tmp_path):
+    """Test if configurations are read from a file, one per line."""
+    sweep = build_sweep()
+    [SW1, SW2] = sweep.get_switch_ids(["Sw1", "Sw2"])
+    path = tmp_path / "configurations.txt"
+    path.write_text("# Set, then reset\nSw1=1 Sw2=0\n\nSw2=1\n")
+    assert sweep.read_configurations(str(path)) == [[(SW1, 1), (SW2, 0)],
+                                                    [(SW2, 1)]]
+    assert sweep.get_configuration_string([(SW1, 1), (SW2, 0)]) == \
+        "Sw1=1 Sw2=0"
+
+    path.write_text("Sw1=2\n")
+    assert sweep.read_configurations(str(path)) is None
+    path.write_text("And1=1\n")
+    assert sweep.read_configurations(str(path)) is None
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_run(processes):
+    """Test if each configuration gives the result it gives on its own."""
+    sweep = build_sweep(processes, ["Nor1"])
+    switch_ids = sweep.get_switch_ids(["Sw1", "Sw2"])
+    configurations = sweep.get_combinations(switch_ids)
+    results = sorted(sweep.run(configurations),
+                     key=lambda result: result.position)
+    assert [result.position for result in results] == [0, 1, 2, 3]
+
+    # The same configurations run in this process, in the reverse order
+    reference = build_sweep(1, ["Nor1"])
+    for position in reversed(range(4)):
+        expected = reference.run_configuration(position,
+                                               configurations[position])
+        result = results[position]
+        assert result.configuration == configurations[position]
+        assert result.cycles_completed == expected.cycles_completed == 12
+        assert result.statistics == expected.statistics
+        assert result.traces == expected.traces
+        assert list(result.traces) == ["Nor1"]
+
+    # Sw1=1 Sw2=0 sets the latch, so Nor1 ends LOW
+    [nor_statistics, and_statistics] = results[2].statistics
+    assert nor_statistics == (0, 0, 0)
+    assert and_statistics[0] == 0
+
+
+def test_get_summary():
+    """Test if the summary has a row for each configuration in order."""
+    sweep = build_sweep()
+    [SW1] = sweep.get_switch_ids(["Sw1"])
+    results = list(sweep.run([[(SW1, 1)], [(SW1, 0)]]))
+    lines = sweep.get_summary(reversed(results))
+    assert lines[0] == "Sw1 | Cycles | Nor1 | And1"
+    assert lines[1] == "----+--------+------+-----"
+    assert lines[2].startswith("1   | 12     | 0")
+    assert lines[3].startswith("0   | 12     |")
+    assert len(lines) == 4
+
+
+def build_folded_monitors():
+    """Return a Monitors instance of gates that switches fix as constants.
+
+    Or1 reads only Sw1, And1 reads Sw2 and Or1, and a clock keeps the state
+    from repeating until the constant gates have been folded.
+    """
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    new_monitors = Monitors(new_names, new_devices, new_network)
+    [SW1, SW2, OR1, AND1, CLK1, I1, I2] = new_names.lookup(
+        ["Sw1", "Sw2", "Or1", "And1", "Clk1", "I1", "I2"])
+    new_devices.make_device(SW1, new_devices.SWITCH, 1)
+    new_devices.make_device(SW2, new_devices.SWITCH, 0)
+    new_devices.make_device(OR1, new_devices.OR, 1)
+    new_devices.make_device(AND1, new_devices.AND, 2)
+    new_devices.make_device(CLK1, new_devices.CLOCK, 3)
+    new_network.make_connection(SW1, None, OR1, I1)
+    new_network.make_connection(SW2, None, AND1, I1)
+    new_network.make_connection(OR1, None, AND1, I2)
+    new_monitors.make_monitor(OR1, None)
+    new_monitors.make_monitor(AND1, None)
+    return new_monitors
+
+
+def test_folded_gates_restored():
+    """Test if a configuration gives the same rows whatever ran before."""
+    monitors = build_folded_monitors()
+    sweep = ParameterSweep(monitors.names, monitors.devices,
+                           monitors.network, monitors, 10, 1, ["Or1", "And1"])
+    [SW1, SW2] = sweep.get_switch_ids(["Sw1", "Sw2"])
+    configuration = [(SW1, 1), (SW2, 1)]
+    results = list(sweep.run([configuration, [(SW1, 1), (SW2, 0)],
+                              configuration]))
+    [first, second, third] = sweep.get_summary(results)[2:]
+    assert first == third == "1   | 1   | 10     | 1   | 1"
+    assert second == "1   | 0   | 10     | 1   | 0"
+    assert results[0].traces == results[2].traces
+
+    # The same configuration simulated on its own
+    monitors = build_folded_monitors()
+    devices = monitors.devices
+    for switch_id, level in configuration:
+        devices.set_switch(switch_id, level)
+    random.seed(2)
+    devices.cold_startup()
+    simulator = Simulator(monitors.network, monitors, detect_period=True)
+    assert simulator.run(10) == 10
+    for name, levels in results[2].traces.items():
+        assert monitors.monitors_dictionary[
+            tuple(devices.get_signal_ids(name))] == levels
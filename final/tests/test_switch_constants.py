@@ -0,0 +1,130 @@
+"""Test the switch_constants module."""
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+
+
+def build_switched_network():
+    """Return a Network instance with gates fed by switches and a D-type.
+
+    And1 reads Sw1 and the Q output of Dtype1, Not1 reads Sw2, Xor1 reads
+    Sw1 and Not1, and Nor1 and Nor2 form a latch set by Sw1 and Sw2.
+    """
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    [SW1, SW2, AND1, NOT1, XOR1, NOR1, NOR2, DTYPE1, CLK1, I1, I2] = \
+        new_names.lookup(["Sw1", "Sw2", "And1", "Not1", "Xor1", "Nor1",
+                          "Nor2", "Dtype1", "Clk1", "I1", "I2"])
+    new_devices.make_device(SW1, new_devices.SWITCH, 0)
+    new_devices.make_device(SW2, new_devices.SWITCH, 0)
+    new_devices.make_device(AND1, new_devices.AND, 2)
+    new_devices.make_device(NOT1, new_devices.NOT)
+    new_devices.make_device(XOR1, new_devices.XOR)
+    new_devices.make_device(NOR1, new_devices.NOR, 2)
+    new_devices.make_device(NOR2, new_devices.NOR, 2)
+    new_devices.make_device(DTYPE1, new_devices.D_TYPE)
+    new_devices.make_device(CLK1, new_devices.CLOCK, 1)
+
+    new_network.make_connection(SW1, None, AND1, I1)
+    new_network.make_connection(DTYPE1, new_devices.Q_ID, AND1, I2)
+    new_network.make_connection(SW2, None, NOT1, I1)
+    new_network.make_connection(SW1, None, XOR1, I1)
+    new_network.make_connection(NOT1, None, XOR1, I2)
+    new_network.make_connection(SW1, None, NOR1, I1)
+    new_network.make_connection(NOR2, None, NOR1, I2)
+    new_network.make_connection(SW2, None, NOR2, I1)
+    new_network.make_connection(NOR1, None, NOR2, I2)
+    new_network.make_connection(CLK1, None, DTYPE1, new_devices.CLK_ID)
+    new_network.make_connection(NOT1, None, DTYPE1, new_devices.DATA_ID)
+    new_network.make_connection(SW1, None, DTYPE1, new_devices.SET_ID)
+    new_network.make_connection(SW1, None, DTYPE1, new_devices.CLEAR_ID)
+    new_devices.get_device(DTYPE1).dtype_memory = new_devices.LOW
+    new_devices.get_device(CLK1).clock_counter = 0
+    new_devices.get_device(CLK1).outputs[None] = new_devices.LOW
+    return new_network
+
+
+@pytest.fixture
+def switched_network():
+    """Return a Network instance with gates fed by switches and a D-type."""
+    return build_switched_network()
+
+
+def get_constants(network):
+    """Return {device name: constant level} for the constant gates."""
+    devices = network.devices
+    plan = network.get_execution_plan()
+    constants = network.switch_constants
+    return {devices.get_signal_name(*devices.get_net_output(
+        plan.gate_devices[position][1])): level
+        for position, level in constants.constants.items()}
+
+
+def test_constants_found(switched_network):
+    """Test if the switch states are propagated through the gates."""
+    network = switched_network
+    devices = network.devices
+    network.execute_network()
+
+    # And1 is LOW as Sw1 is LOW, whatever the D-type holds. Nor1 and Nor2
+    # are only fixed by Sw1 and Sw2 if one of them is HIGH.
+    assert get_constants(network) == {"And1": devices.LOW,
+                                      "Not1": devices.HIGH,
+                                      "Xor1": devices.HIGH}
+    assert network.switch_constants.folded == set()
+
+    # Once the network has settled, the constant gates are left out
+    assert network.execute_network()
+    assert len(network.get_gate_schedule()) == 2
+
+
+def test_set_switch_unfolds_cone(switched_network):
+    """Test if setting a switch only unfolds the gates it drives."""
+    network = switched_network
+    devices = network.devices
+    [SW1, SW2] = devices.names.lookup(["Sw1", "Sw2"])
+    for cycle in range(3):
+        assert network.execute_network()
+    assert len(network.get_gate_schedule()) == 2
+
+    devices.set_switch(SW2, devices.HIGH)
+    # Not1 and Xor1 change, and the latch is now fixed
+    assert len(network.get_gate_schedule()) == 4
+    assert get_constants(network) == {"And1": devices.LOW,
+                                      "Not1": devices.LOW,
+                                      "Xor1": devices.LOW,
+                                      "Nor1": devices.HIGH,
+                                      "Nor2": devices.LOW}
+    for cycle in range(3):
+        assert network.execute_network()
+    assert network.get_gate_schedule() == []
+
+    devices.set_switch(SW1, devices.HIGH)
+    assert len(network.get_gate_schedule()) == 4
+    assert get_constants(network) == {"Not1": devices.LOW,
+                                      "Xor1": devices.HIGH,
+                                      "Nor1": devices.LOW,
+                                      "Nor2": devices.LOW}
+
+
+def test_folding_keeps_signals():
+    """Test if folding the constant gates changes no signal."""
+    traces = []
+    for fold_constants in [False, True]:
+        network = build_switched_network()
+        network.fold_constants = fold_constants
+        devices = network.devices
+        [SW1, SW2] = devices.names.lookup(["Sw1", "Sw2"])
+        switch_settings = {4: (SW2, devices.HIGH), 9: (SW1, devices.HIGH),
+                           13: (SW2, devices.LOW), 17: (SW1, devices.LOW)}
+        trace = []
+        for cycle in range(24):
+            if cycle in switch_settings:
+                devices.set_switch(*switch_settings[cycle])
+            trace.append((network.execute_network(),
+                          bytes(devices.net_table.signals)))
+        traces.append(trace)
+    assert traces[0] == traces[1]
@@ -0,0 +1,106 @@
+"""Test the threaded_engine module."""
+import random
+import sys
+
+import pytest
+
+import threaded_engine
+from names import Names
+from devices import Devices
+from network import Network
+from threaded_engine import ThreadedEngine, evaluate_level, gil_enabled
+from signal_tables import LOW, HIGH, RISING, BLANK
+
+
+def test_gil_enabled(monkeypatch):
+    """Test if the interpreter is asked whether it has a GIL."""
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False,
+                        raising=False)
+    assert not gil_enabled()
+    monkeypatch.delattr(sys, "_is_gil_enabled")
+    assert gil_enabled()
+
+
+def test_evaluate_level():
+    """Test if the changes are returned without changing the signals."""
+    # AND, NOT and NOR gates
+    gates = [((0, 1), 3, HIGH, HIGH), ((0,), 4, HIGH, LOW),
+             ((0, 2), 5, LOW, HIGH)]
+    signals = [HIGH, HIGH, LOW, LOW, LOW, LOW]
+    assert evaluate_level(signals, gates) == ([(3, RISING)], False)
+    assert signals == [HIGH, HIGH, LOW, LOW, LOW, LOW]
+
+    # A BLANK output cannot be updated
+    signals[4] = BLANK
+    assert evaluate_level(signals, gates)[1]
+
+
+def build_wide_network():
+    """Return a Network instance with a wide level of gates.
+
+    Sixteen XOR gates read every pair of bits of a four-bit ripple counter
+    of D-types, and two of them set and reset a latch of NAND gates.
+    """
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    [CLK1, SW1, NAND1, NAND2, I1, I2] = new_names.lookup(
+        ["Clk1", "Sw1", "Nand1", "Nand2", "I1", "I2"])
+    new_devices.make_device(CLK1, new_devices.CLOCK, 1)
+    new_devices.make_device(SW1, new_devices.SWITCH, 0)
+    clock = (CLK1, None)
+    bits = []
+    for bit in range(4):
+        [dtype_id] = new_names.lookup(["".join(["Dtype", str(bit)])])
+        new_devices.make_device(dtype_id, new_devices.D_TYPE)
+        new_network.make_connection(clock[0], clock[1], dtype_id,
+                                    new_devices.CLK_ID)
+        new_network.make_connection(dtype_id, new_devices.QBAR_ID,
+                                    dtype_id, new_devices.DATA_ID)
+        new_network.make_connection(SW1, None, dtype_id,
+                                    new_devices.SET_ID)
+        new_network.make_connection(SW1, None, dtype_id,
+                                    new_devices.CLEAR_ID)
+        clock = (dtype_id, new_devices.QBAR_ID)
+        bits.append(dtype_id)
+    gate_ids = []
+    for number in range(16):
+        [gate_id] = new_names.lookup(["".join(["Xor", str(number)])])
+        new_devices.make_device(gate_id, new_devices.XOR)
+        new_network.make_connection(bits[number % 4], new_devices.Q_ID,
+                                    gate_id, I1)
+        new_network.make_connection(bits[number // 4], new_devices.Q_ID,
+                                    gate_id, I2)
+        gate_ids.append(gate_id)
+    new_devices.make_device(NAND1, new_devices.NAND, 2)
+    new_devices.make_device(NAND2, new_devices.NAND, 2)
+    new_network.make_connection(gate_ids[1], None, NAND1, I1)
+    new_network.make_connection(NAND2, None, NAND1, I2)
+    new_network.make_connection(gate_ids[6], None, NAND2, I1)
+    new_network.make_connection(NAND1, None, NAND2, I2)
+    return new_network
+
+
+@pytest.mark.parametrize("gil", [True, False])
+def test_engine_matches_network(monkeypatch, gil):
+    """Test if the engine gives the same signals as the network alone."""
+    monkeypatch.setattr(threaded_engine, "gil_enabled", lambda: gil)
+    traces = []
+    for threads in [None, 4]:
+        network = build_wide_network()
+        devices = network.devices
+        random.seed(0)
+        devices.cold_startup()
+        engine = None
+        execute_network = network.execute_network
+        if threads is not None:
+            engine = ThreadedEngine(network, threads, min_level_size=4)
+            execute_network = engine.execute_network
+        trace = []
+        for cycle in range(20):
+            assert execute_network()
+            trace.append(bytes(devices.net_table.signals))
+        traces.append(trace)
+    assert (engine.executor is None) == gil
+    engine.close()
+    assert traces[0] == traces[1]
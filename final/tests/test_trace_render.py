@@ -0,0 +1,127 @@
+"""Test the trace_render module."""
+import struct
+import zlib
+
+import pytest
+
+from names import Names
+from devices import Devices
+from network import Network
+from monitors import Monitors
+from trace_render import TraceRenderer
+
+
+@pytest.fixture
+def new_renderer():
+    """Return a TraceRenderer instance with two monitored switches."""
+    new_names = Names()
+    new_devices = Devices(new_names)
+    new_network = Network(new_names, new_devices)
+    new_monitors = Monitors(new_names, new_devices, new_network)
+
+    [SW1_ID, SW2_ID] = new_names.lookup(["Sw1", "Sw2"])
+    new_devices.make_device(SW1_ID, new_devices.SWITCH, 1)
+    new_devices.make_device(SW2_ID, new_devices.SWITCH, 0)
+    new_monitors.make_monitor(SW1_ID, None)
+    new_monitors.make_monitor(SW2_ID, None)
+
+    for _ in range(4):
+        new_network.execute_network()
+        new_monitors.record_signals()
+
+    return TraceRenderer(new_devices, new_monitors)
+
+
+def read_png(path):
+    """Return the width, height and palette indices of a PNG file."""
+    with open(path, "rb") as image_file:
+        data = image_file.read()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position = 8
+    chunks = {}
+    while position < len(data):
+        [length] = struct.unpack(">I", data[position:position + 4])
+        chunk_type = data[position + 4:position + 8]
+        chunks[chunk_type] = data[position + 8:position + 8 + length]
+        position += 12 + length
+    width, height = struct.unpack(">II", chunks[b"IHDR"][:8])
+    raw = zlib.decompress(chunks[b"IDAT"])
+    rows = [raw[y * (width + 1) + 1:(y + 1) * (width + 1)]
+            for y in range(height)]
+    return width, height, rows
+
+
+def test_get_segments_exact(new_renderer):
+    """Test if short traces are split into one segment per run."""
+    devices = new_renderer.devices
+    LOW = devices.LOW
+    HIGH = devices.HIGH
+
+    assert new_renderer.get_segments([LOW, LOW, HIGH, HIGH], 8) == [
+        (0, 4, (LOW,)),
+        (4, 8, (HIGH,)),
+    ]
+    assert new_renderer.get_segments([], 8) == []
+
+
+def test_get_segments_summarised(new_renderer):
+    """Test if long traces are summarised per pixel column."""
+    devices = new_renderer.devices
+    LOW = devices.LOW
+    HIGH = devices.HIGH
+
+    signal_list = [LOW] * 8 + [HIGH, LOW] * 4 + [HIGH] * 8
+    assert new_renderer.get_segments(signal_list, 3) == [
+        (0, 1, (LOW,)),
+        (1, 2, (LOW, HIGH)),
+        (2, 3, (HIGH,)),
+    ]
+
+
+def test_render_png(new_renderer, tmp_path):
+    """Test if render_png draws each trace at its level."""
+    path = str(tmp_path / "traces.png")
+    assert new_renderer.render(path, 20, 80)
+
+    width, height, rows = read_png(path)
+    assert (width, height) == (20, 80)
+    row_height = height // 2
+    margin = new_renderer.trace_margin // 2
+    # Sw1 is HIGH, so its trace is at the top of the first row
+    assert set(rows[margin]) == {new_renderer.BLACK}
+    # Sw2 is LOW, so its trace is at the bottom of the second row
+    assert set(rows[2 * row_height - 1 - margin]) == {new_renderer.BLUE}
+
+
+def test_render_png_too_short(new_renderer, tmp_path):
+    """Test if an image too short for every trace is made taller."""
+    path = str(tmp_path / "traces.png")
+    assert new_renderer.get_min_height() == 6
+    assert new_renderer.render(path, 20, 4)
+
+    width, height, rows = read_png(path)
+    assert (width, height) == (20, 6)
+    # Each trace keeps its row, with Sw2 at the bottom of the second
+    assert new_renderer.BLUE in rows[5]
+    assert new_renderer.BLUE not in rows[2]
+
+
+def test_render_svg(new_renderer, tmp_path):
+    """Test if render_svg writes a labelled path for every trace."""
+    path = str(tmp_path / "traces.svg")
+    assert new_renderer.render(path, 200)
+
+    with open(path) as image_file:
+        svg = image_file.read()
+    assert svg.startswith("<svg")
+    assert ">Sw1</text>" in svg
+    assert ">Sw2</text>" in svg
+    assert svg.count("<path") == 2
+
+
+def test_render_unknown_extension(new_renderer, tmp_path):
+    """Test if render rejects unknown image formats."""
+    assert not new_renderer.render(str(tmp_path / "traces.bmp"), 20)
+    assert not new_renderer.is_image_path("traces.jpg")
+    assert new_renderer.is_image_path("traces.PNG")
+    assert new_renderer.is_image_path("traces.svg")
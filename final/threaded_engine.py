@@ -0,0 +1,170 @@
+"""Execute the levels of the gates of a logic network in several threads.
+
+Used in the Logic Simulator project on free-threaded Python builds, where
+threads run on several cores at once, to spread each large level of gates
+over the cores.
+
+Classes
+-------
+ThreadedEngine - executes a network with each level of gates split between
+                 threads.
+
+Functions
+---------
+gil_enabled - returns True if the interpreter has a global interpreter lock.
+evaluate_level - returns the changes a list of gates makes to the signals.
+"""
+import concurrent.futures
+import os
+import sys
+
+from partitioned_engine import get_pass_levels
+from signal_tables import UPDATE, GATE_FOLDS
+
+
+def gil_enabled():
+    """Return True if the interpreter has a global interpreter lock.
+
+    Only free-threaded builds of Python 3.13 or later can run without it.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is None or is_gil_enabled()
+
+
+def evaluate_level(signals, gates):
+    """Return the changes the gates make to the signals, without making them.
+
+    gates is a list of (input net IDs, output net ID, x, y) tuples, see
+    Network.execute_gate, none of which reads the output of another. Return
+    (changes, failed), where changes is a list of (net ID, updated signal)
+    pairs for the outputs that change, and failed is True if a gate is
+    unconnected or its output cannot be updated.
+    """
+    changes = []
+    failed = False
+    for input_nets, output_net, x, y in gates:
+        if None in input_nets or output_net is None:  # unconnected
+            failed = True
+            continue
+        (output_signal, table, final_signal) = GATE_FOLDS[(x, y)]
+        for net_id in input_nets:
+            if output_signal is None:
+                output_signal = signals[net_id]
+            else:
+                output_signal = table[output_signal][signals[net_id]]
+                if output_signal == final_signal:
+                    break
+        signal = signals[output_net]
+        updated_signal = UPDATE[signal][output_signal]
+        if updated_signal is None:  # if the update is unsuccessful
+            failed = True
+        elif updated_signal != signal:
+            changes.append((output_net, updated_signal))
+    return (changes, failed)
+
+
+class ThreadedEngine:
+    """Execute a network with each level of its gates split between threads.
+
+    The gates of each pass are put on levels, see
+    partitioned_engine.get_pass_levels, and the levels are executed in
+    turn. Each level is executed in two phases: the new outputs of all its
+    gates are evaluated from the signals, and then written to them. As no
+    gate of a level reads another gate of the same level, the signals match
+    the network executed on its own. A level of at least min_level_size
+    gates is evaluated in threads chunks, each in its own thread. Smaller
+    levels, and every level when the interpreter has a global interpreter
+    lock, are evaluated by the calling thread, as threads would only slow
+    them down.
+
+    Switches, D-types, clocks, lookup tables and remembered blocks are
+    executed as in Network.execute_network. The gates fixed by the
+    switches are executed too, which changes no signal.
+
+    Parameters
+    ----------
+    network: instance of the network.Network() class.
+    threads: number of threads evaluating each large level, or None for
+             one per core.
+    min_level_size: fewest gates in a level split between threads.
+
+    Public methods
+    --------------
+    execute_network(self): Executes all the devices in the network for one
+                           simulation cycle.
+
+    close(self): Stops the threads.
+    """
+
+    def __init__(self, network, threads=None, min_level_size=256):
+        """Initialise the engine, with threads only if they can help."""
+        self.network = network
+        if threads is None:
+            threads = os.cpu_count() or 1
+        if gil_enabled():
+            threads = 1
+        self.threads = max(threads, 1)
+        self.min_level_size = min_level_size
+        self.executor = None
+        if self.threads > 1:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                self.threads)
+        # Execution plan the levels were found for, and the levels as
+        # lists of gates
+        self.plan = None
+        self.levels = []
+
+    def close(self):
+        """Stop the threads."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+            self.threads = 1
+
+    def get_levels(self, plan):
+        """Put the gates of plan on their levels."""
+        gate_devices = plan.gate_devices
+        pass_levels = get_pass_levels(gate_devices)
+        self.levels = [[] for level in range(max(pass_levels, default=-1)
+                                             + 1)]
+        for gate, level in zip(gate_devices, pass_levels):
+            self.levels[level].append(gate)
+        self.plan = plan
+
+    def execute_gates(self, gate_devices):
+        """Execute every gate of the plan for one pass, level by level.
+
+        gate_devices is the schedule of Network.get_gate_schedule, which
+        only leaves out gates that would not change. Return True if
+        successful.
+        """
+        network = self.network
+        signals = network.devices.net_table.signals
+        executor = self.executor
+        for gates in self.levels:
+            if executor is None or len(gates) < self.min_level_size:
+                results = [evaluate_level(signals, gates)]
+            else:
+                chunk = -(-len(gates) // self.threads)
+                results = list(executor.map(
+                    evaluate_level, [signals] * self.threads,
+                    [gates[start:start + chunk]
+                     for start in range(0, len(gates), chunk)]))
+            for changes, failed in results:
+                if failed:
+                    return False
+                if changes:
+                    network.steady_state = False
+                for net_id, signal in changes:
+                    signals[net_id] = signal
+        return True
+
+    def execute_network(self):
+        """Execute all the devices in the network for one simulation cycle.
+
+        Return True if successful and the network does not oscillate.
+        """
+        plan = self.network.get_execution_plan()
+        if plan is not self.plan:
+            self.get_levels(plan)
+        return self.network.execute_network(self.execute_gates)
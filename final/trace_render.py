@@ -0,0 +1,273 @@
+"""Render monitored signal traces to image files without a display.
+
+Used in the Logic Simulator project to export signal traces from batch jobs,
+for example on machines with no display or no wxPython installed.
+
+Classes
+-------
+TraceRenderer - renders monitored signal traces to PNG or SVG files.
+"""
+import itertools
+import struct
+import zlib
+
+
+class TraceRenderer:
+    """Render monitored signal traces to PNG or SVG files.
+
+    Each trace is first summarised to the resolution of the image: when there
+    are more cycles than pixel columns, every column records the set of
+    signal levels seen in the cycles it covers, so long traces cost one pass
+    over the samples and drawing cost depends only on the image size.
+    Columns where the signal toggles are drawn as a filled band.
+
+    Parameters
+    ----------
+    devices: instance of the devices.Devices() class.
+    monitors: instance of the monitors.Monitors() class.
+
+    Public methods
+    --------------
+    get_segments(self, signal_list, width): Returns the trace summarised as
+                               (x_start, x_end, levels) segments.
+
+    render_png(self, path, width, height=None): Writes the traces to a PNG
+                                                file.
+
+    render_svg(self, path, width, height=None): Writes the traces to an SVG
+                                                file.
+
+    render(self, path, width, height=None): Writes the traces to a PNG or
+                               SVG file depending on the file extension.
+
+    is_image_path(self, path): Returns True if the path ends in an
+                               extension that can be rendered.
+
+    get_min_height(self): Returns the smallest image height that fits every
+                          trace.
+    """
+
+    def __init__(self, devices, monitors):
+        """Initialise the image layout and colours."""
+        self.devices = devices
+        self.monitors = monitors
+
+        # Layout in pixels
+        self.row_height = 40
+        self.min_row_height = 3  # room for the HIGH and LOW levels
+        self.trace_margin = 8  # gap between rows of traces
+        self.label_width = 120  # space for signal names in SVG images
+
+        # Palette indices for PNG images
+        [self.WHITE, self.GREY, self.BLACK, self.BLUE, self.RED] = range(5)
+        self.palette = [(255, 255, 255), (200, 210, 210), (0, 0, 0),
+                        (0, 0, 255), (255, 0, 0)]
+        # Traces cycle through black, blue and red like the canvas
+        self.trace_colours = [self.BLACK, self.BLUE, self.RED]
+        self.svg_colours = ["black", "blue", "red"]
+
+    def get_segments(self, signal_list, width):
+        """Return signal_list summarised across width pixels.
+
+        Each segment is (x_start, x_end, levels), where levels is a sorted
+        tuple of the signal levels seen between x_start and x_end.
+        Neighbouring segments always have different levels.
+        """
+        cycles = len(signal_list)
+        segments = []
+        if cycles == 0 or width <= 0:
+            return segments
+
+        if cycles <= width:
+            # At least one pixel per cycle, so draw every run exactly
+            scale = width / cycles
+            x = 0
+            for level, group in itertools.groupby(signal_list):
+                run_length = sum(1 for _ in group)
+                segments.append((x * scale, (x + run_length) * scale,
+                                 (level,)))
+                x += run_length
+            return segments
+
+        # Several cycles per pixel column
+        for column in range(width):
+            start = column * cycles // width
+            end = (column + 1) * cycles // width
+            levels = tuple(sorted(set(signal_list[start:end])))
+            if segments and segments[-1][2] == levels:
+                segments[-1] = (segments[-1][0], column + 1, levels)
+            else:
+                segments.append((column, column + 1, levels))
+        return segments
+
+    def get_traces(self):
+        """Return a list of (signal name, signal list) for every monitor."""
+        traces = []
+        for (device_id, output_id), signal_list in \
+                self.monitors.monitors_dictionary.items():
+            name = self.devices.get_signal_name(device_id, output_id)
+            traces.append((name, signal_list))
+        return traces
+
+    def get_min_height(self):
+        """Return the smallest image height that fits every trace."""
+        return self.min_row_height * len(self.monitors.monitors_dictionary)
+
+    def get_row_height(self, height, rows):
+        """Return the height of one row of traces."""
+        if height is None or rows == 0:
+            return self.row_height
+        return max(height // rows, self.min_row_height)
+
+    def render_png(self, path, width, height=None):
+        """Write the monitored traces to a PNG file at path.
+
+        width and height are in pixels. If height is None, every trace gets
+        row_height pixels, and a height below get_min_height is raised to
+        it. PNG images have no text, so the traces appear in the order of
+        the monitors.
+        """
+        traces = self.get_traces()
+        row_height = self.get_row_height(height, len(traces))
+        if height is None or height < row_height * len(traces):
+            height = max(row_height * len(traces), 1)
+        pixels = bytearray(width * height)  # all WHITE
+
+        for row, (name, signal_list) in enumerate(traces):
+            colour = self.trace_colours[row % 3]
+            top = row * row_height
+            margin = min(self.trace_margin, row_height // 3)
+            y_high = top + margin // 2
+            y_low = top + row_height - 1 - margin // 2
+            # Grey line separating this row from the previous one
+            if row > 0:
+                pixels[top * width:(top + 1) * width] = \
+                    bytes([self.GREY]) * width
+
+            previous_levels = None
+            for x_start, x_end, levels in self.get_segments(signal_list,
+                                                            width):
+                x0 = min(int(round(x_start)), width - 1)
+                x1 = max(min(int(round(x_end)), width), x0 + 1)
+                is_high = self.devices.HIGH in levels
+                is_low = self.devices.LOW in levels
+                if is_high and is_low:
+                    # The signal toggles within these columns
+                    for y in range(y_high, y_low + 1):
+                        pixels[y * width + x0:y * width + x1] = \
+                            bytes([colour]) * (x1 - x0)
+                elif is_high or is_low:
+                    y = y_high if is_high else y_low
+                    pixels[y * width + x0:y * width + x1] = \
+                        bytes([colour]) * (x1 - x0)
+                    # Draw the edge from the previous level
+                    if previous_levels is not None \
+                            and previous_levels != levels:
+                        for y in range(y_high, y_low + 1):
+                            pixels[y * width + x0] = colour
+                previous_levels = levels
+
+        self.write_png(path, width, height, pixels)
+
+    def write_png(self, path, width, height, pixels):
+        """Write palette image data to a PNG file."""
+        def chunk(chunk_type, data):
+            return b"".join((
+                struct.pack(">I", len(data)), chunk_type, data,
+                struct.pack(">I", zlib.crc32(chunk_type + data)),
+            ))
+
+        # Every row starts with filter type 0 (no filtering)
+        raw = b"".join(b"\x00" + bytes(pixels[y * width:(y + 1) * width])
+                       for y in range(height))
+        header = struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)
+        palette = b"".join(bytes(colour) for colour in self.palette)
+        with open(path, "wb") as image_file:
+            image_file.write(b"\x89PNG\r\n\x1a\n")
+            image_file.write(chunk(b"IHDR", header))
+            image_file.write(chunk(b"PLTE", palette))
+            image_file.write(chunk(b"IDAT", zlib.compress(raw, 6)))
+            image_file.write(chunk(b"IEND", b""))
+
+    def render_svg(self, path, width, height=None):
+        """Write the monitored traces to an SVG file at path.
+
+        width and height are in pixels, including label_width pixels on the
+        left for the signal names. A height below get_min_height is raised
+        to it.
+        """
+        traces = self.get_traces()
+        row_height = self.get_row_height(height, len(traces))
+        if height is None or height < row_height * len(traces):
+            height = max(row_height * len(traces), 1)
+        trace_width = max(width - self.label_width, 1)
+
+        lines = [
+            '<svg xmlns="http://www.w3.org/2000/svg" width="{0}" '
+            'height="{1}" viewBox="0 0 {0} {1}">'.format(width, height),
+            '<rect width="100%" height="100%" fill="white"/>',
+        ]
+        for row, (name, signal_list) in enumerate(traces):
+            colour = self.svg_colours[row % 3]
+            top = row * row_height
+            margin = min(self.trace_margin, row_height // 3)
+            y_high = top + margin / 2
+            y_low = top + row_height - margin / 2
+            lines.append(
+                '<text x="4" y="{0:g}" font-family="monospace" '
+                'font-size="12">{1}</text>'.format(
+                    (y_high + y_low) / 2 + 4, name))
+
+            path_data = []
+            bands = []
+            pen_down = False
+            for x_start, x_end, levels in self.get_segments(signal_list,
+                                                            trace_width):
+                x_start += self.label_width
+                x_end += self.label_width
+                is_high = self.devices.HIGH in levels
+                is_low = self.devices.LOW in levels
+                if is_high and is_low:
+                    bands.append((x_start, x_end))
+                    pen_down = False
+                elif is_high or is_low:
+                    y = y_high if is_high else y_low
+                    # Joining to the previous segment draws the edge
+                    command = "L" if pen_down else "M"
+                    path_data.append("{0}{1:g},{2:g}H{3:g}".format(
+                        command, x_start, y, x_end))
+                    pen_down = True
+                else:
+                    # Leave a gap where the signal was not recorded
+                    pen_down = False
+            if path_data:
+                lines.append(
+                    '<path d="{0}" fill="none" stroke="{1}"/>'.format(
+                        "".join(path_data), colour))
+            for x_start, x_end in bands:
+                lines.append(
+                    '<rect x="{0:g}" y="{1:g}" width="{2:g}" height="{3:g}" '
+                    'fill="{4}"/>'.format(x_start, y_high, x_end - x_start,
+                                          y_low - y_high, colour))
+        lines.append("</svg>")
+
+        with open(path, "w") as image_file:
+            image_file.write("\n".join(lines))
+            image_file.write("\n")
+
+    def render(self, path, width, height=None):
+        """Write the traces to a PNG or SVG file depending on its extension.
+
+        Return True if successful, or False if the extension is unknown.
+        """
+        if not self.is_image_path(path):
+            return False
+        if path.lower().endswith(".svg"):
+            self.render_svg(path, width, height)
+        else:
+            self.render_png(path, width, height)
+        return True
+
+    def is_image_path(self, path):
+        """Return True if the path ends in .png or .svg, in any case."""
+        return path.lower().endswith((".png", ".svg"))
@@ -7,6 +7,7 @@ Classes:
 --------
 UserInterface - reads and parses user commands.
 """
+from simulator import Simulator
 
 
 class UserInterface:
@@ -248,16 +249,18 @@ class UserInterface:
     def run_network(self, cycles):
         """Run the network for the specified number of simulation cycles.
 
-        Return True if successful.
+        If the network oscillates, the loops of devices that oscillate are
+        reported, and the signals recorded up to that cycle are still
+        displayed. Return the number of cycles completed.
         """
-        for _ in range(cycles):
-            if self.network.execute_network():
-                self.monitors.record_signals()
-            else:
-                print("Error! Network oscillating.")
-                return False
+        simulator = Simulator(self.network, self.monitors)
+        cycles_completed = simulator.run(cycles)
+        if simulator.oscillating:
+            print("Error! Network oscillating.")
+            for loop_names in self.network.get_oscillating_loop_names():
+                print("".join(["Oscillating loop: ", ", ".join(loop_names)]))
         self.monitors.display_signals()
-        return True
+        return cycles_completed
 
     def run_command(self):
         """Run the simulation from scratch."""
@@ -268,8 +271,7 @@ class UserInterface:
             self.monitors.reset_monitors()
             print("".join(["Running for ", str(cycles), " cycles"]))
             self.devices.cold_startup()
-            if self.run_network(cycles):
-                self.cycles_completed += cycles
+            self.cycles_completed += self.run_network(cycles)
 
     def continue_command(self):
         """Continue a previously run simulation."""
@@ -277,13 +279,14 @@ class UserInterface:
         if cycles is not None:  # if the number of cycles provided is valid
             if self.cycles_completed == 0:
                 print("Error! Nothing to continue. Run first.")
-            elif self.run_network(cycles):
-                self.cycles_completed += cycles
+            else:
+                cycles_run = self.run_network(cycles)
+                self.cycles_completed += cycles_run
                 print(
                     " ".join(
                         [
                             "Continuing for",
-                            str(cycles),
+                            str(cycles_run),
                             "cycles.",
                             "Total:",
                             str(self.cycles_completed),